@@ -16,13 +16,37 @@ block_cipher = None
 hiddenimports = [
     'core',
     'core.achievement_manager',
+    'core.asset_naming',
+    'core.async_downloader',
+    'core.cache_manifest',
+    'core.compression',
+    'core.connectivity',
     'core.download_manager',
     'core.game_manager',
+    'core.game_pack',
+    'core.html_rewriter',
+    'core.http_client',
+    'core.page_parser',
+    'core.recommendation_engine',
+    'core.search_index',
+    'core.session_log',
     'core.settings_manager',
+    'core.similarity_index',
+    'core.startup_profiler',
+    'core.stats_exporter',
+    'core.task_runner',
+    'core.update_service',
+    'core.url_filter',
     'gui',
     'gui.main_window',
     'gui.tabs',
     'gui.tabs.games_tab',
+    'gui.web',
+    'gui.web.lifecycle',
+    'gui.web.pack_scheme',
+    'gui.web.preloader',
+    'gui.web.profile',
+    'gui.web.request_interceptor',
     'gui.widgets',
     'gui.widgets.fullscreen_game_window',
     'models',
@@ -30,7 +54,11 @@ hiddenimports = [
     'models.daily_challenge',
     'models.game_item',
     'utils',
+    'utils.cache_check_worker',
+    'utils.connectivity_watcher',
     'utils.daily_challenge_generator',
+    'utils.screenshot_capture',
+    'utils.stats_export_worker',
     'utils.update_checker',
 ]
 
@@ -67,7 +95,6 @@ a = Analysis(
     runtime_hooks=[],
     excludes=[
         'matplotlib',
-        'numpy',
         'pandas',
         'scipy',
         'PIL',
@@ -1,8 +1,43 @@
 """Core package for game launcher"""
-from .game_manager import GameManager
-from .settings_manager import SettingsManager
-from .achievement_manager import AchievementManager
-from .download_manager import DownloadManager
+import importlib
 
-__all__ = ['GameManager', 'SettingsManager', 'AchievementManager', 'DownloadManager']
+# Exported name -> submodule. Submodules are imported on first use, so importing one
+# part of core (say core.settings_manager) does not pull in numpy and requests.
+_EXPORTS = {
+    'GameManager': 'game_manager',
+    'SettingsManager': 'settings_manager',
+    'AchievementManager': 'achievement_manager',
+    'DownloadManager': 'download_manager',
+    'SearchIndex': 'search_index',
+    'RecommendationEngine': 'recommendation_engine',
+    'SimilarityIndex': 'similarity_index',
+    'SessionLog': 'session_log',
+    'StatsExporter': 'stats_exporter',
+    'ConnectivityMonitor': 'connectivity',
+    'HttpClient': 'http_client',
+    'get_http_client': 'http_client',
+    'AsyncDownloader': 'async_downloader',
+    'PageParser': 'page_parser',
+    'GamePack': 'game_pack',
+    'PackWriter': 'game_pack',
+    'PackInUseError': 'game_pack',
+    'BlobCache': 'compression',
+    'TaskRunner': 'task_runner',
+    'get_task_runner': 'task_runner',
+    'UpdateService': 'update_service',
+    'FileDownload': 'update_service',
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
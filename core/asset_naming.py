@@ -0,0 +1,118 @@
+"""Local file names for downloaded assets, and the index of what is already on disk"""
+import hashlib
+import json
+import os
+import posixpath
+import re
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+EXTENSION_PATTERN = re.compile(r'\.[a-z0-9]{1,10}')
+# Used when a URL has no usable extension, e.g. /styles?v=2, so the MIME type can still be guessed
+DEFAULT_EXTENSIONS = {'css': '.css', 'js': '.js'}
+
+
+def normalize_url(url):
+    """Canonical form of a URL: lower-case scheme and host, no default port, no fragment"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    try:
+        host = (parts.hostname or '').lower()
+        if ':' in host:
+            host = f"[{host}]"
+        port = parts.port
+    except ValueError:
+        host, port = parts.netloc.lower(), None
+    netloc = host if port is None or port == DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def asset_name(url, file_type):
+    """Path of an asset relative to its game's folder, e.g. js/3f/9a0c...e1.js
+    
+    Named after a hash of the whole normalised URL, query included, so two
+    different files can never share a name; the first two hex digits shard the
+    folder so no directory grows huge.
+    """
+    digest = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()[:32]
+    extension = posixpath.splitext(urlsplit(url).path)[1].lower()
+    if not EXTENSION_PATTERN.fullmatch(extension):
+        extension = DEFAULT_EXTENSIONS.get(file_type, '')
+    return f"{file_type}/{digest[:2]}/{digest[2:]}{extension}"
+
+
+class AssetIndex:
+    """Which assets of each game are already downloaded, so nothing has to stat the disk
+    
+    Kept in cache_index.json as {game folder: {normalised url: file name}}.
+    Without a path the index lives only in memory.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.games = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+    
+    def load(self):
+        """Read the index from disk"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.games = data.get('games', {})
+        except Exception as e:
+            print(f"Error loading cache index: {e}")
+    
+    def save(self):
+        """Write the index to disk if it changed"""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            data = json.dumps({'version': self.VERSION, 'games': self.games})
+            self._dirty = False
+        try:
+            part_path = self.path.with_name(self.path.name + ".part")
+            part_path.write_text(data, encoding='utf-8')
+            os.replace(part_path, self.path)
+        except Exception as e:
+            print(f"Error saving cache index: {e}")
+    
+    def get(self, game_id, url):
+        """File name of an already downloaded asset, or None"""
+        with self._lock:
+            return self.games.get(game_id, {}).get(normalize_url(url))
+    
+    def add(self, game_id, url, name):
+        """Record that an asset has been downloaded"""
+        with self._lock:
+            self.games.setdefault(game_id, {})[normalize_url(url)] = name
+            self._dirty = True
+    
+    def discard(self, game_id, url):
+        """Forget one asset, e.g. before downloading it again"""
+        with self._lock:
+            if self.games.get(game_id, {}).pop(normalize_url(url), None) is not None:
+                self._dirty = True
+    
+    def forget(self, game_id=None):
+        """Forget every asset of one game, or of all games"""
+        with self._lock:
+            if game_id is None:
+                self.games = {}
+            else:
+                self.games.pop(game_id, None)
+            self._dirty = True
+    
+    def sources(self, game_id):
+        """{file name: url} of a game's downloaded assets"""
+        with self._lock:
+            return {name: url for url, name in self.games.get(game_id, {}).items()}
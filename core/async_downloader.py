@@ -0,0 +1,384 @@
+"""Asyncio engine for downloading whole game pages"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+from core.asset_naming import AssetIndex, asset_name
+from core.http_client import HttpClient, get_http_client
+from core.page_parser import PageParser
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (lets the httpx backend use HTTP/2)
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+
+def _connection_errors():
+    """Exception types that mean the host could not be reached at all"""
+    errors = [requests.ConnectionError, ConnectionError]
+    if aiohttp is not None:
+        errors.append(aiohttp.ClientConnectorError)
+    if httpx is not None:
+        errors.append(httpx.ConnectError)
+    return tuple(errors)
+
+
+CONNECTION_ERRORS = _connection_errors()
+
+
+class _AiohttpBackend:
+    """Streams responses with aiohttp"""
+    
+    def __init__(self, limit, timeout):
+        self.limit = limit
+        self.timeout = timeout
+    
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=0, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout),
+            headers={'User-Agent': HttpClient.USER_AGENT},
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+    
+    async def stream(self, url, chunk_size):
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+
+class _HttpxBackend:
+    """Streams responses with httpx, over HTTP/2 when h2 is installed"""
+    
+    def __init__(self, limit, timeout):
+        self.limit = limit
+        self.timeout = timeout
+    
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            http2=HAS_H2,
+            limits=httpx.Limits(max_connections=self.limit),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={'User-Agent': HttpClient.USER_AGENT},
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+    
+    async def stream(self, url, chunk_size):
+        async with self.client.stream('GET', url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+
+class _ThreadBackend:
+    """Fallback that runs the shared blocking client in worker threads"""
+    
+    MAX_THREADS = 32
+    
+    def __init__(self, limit, timeout):
+        self.timeout = timeout
+        self.session = get_http_client().session
+        self.executor = ThreadPoolExecutor(max_workers=min(limit, self.MAX_THREADS),
+                                           thread_name_prefix='download')
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.executor.shutdown(wait=False)
+    
+    async def stream(self, url, chunk_size):
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.executor, lambda: self.session.get(url, stream=True, timeout=self.timeout))
+        try:
+            response.raise_for_status()
+            while True:
+                chunk = await loop.run_in_executor(self.executor, response.raw.read, chunk_size, True)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            response.close()
+
+
+class _Crawl:
+    """State for one run of the event loop: the connection pool, limits and in-flight assets"""
+    
+    def __init__(self, engine, backend):
+        self.engine = engine
+        self.backend = backend
+        self.http = engine.http
+        self.parser = engine.parser
+        self.slots = asyncio.Semaphore(engine.max_concurrency)
+        self.page_slots = asyncio.Semaphore(engine.max_pages)
+        self.host_slots = {}
+        self.index = engine.index
+        self.assets = {}  # local path -> task, so a shared asset is fetched once
+    
+    def host_slot(self, url):
+        """Semaphore limiting requests to url's host"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin not in self.host_slots:
+            limit = HttpClient.HOST_POOL_SIZES.get(origin, self.engine.per_host)
+            self.host_slots[origin] = asyncio.Semaphore(limit)
+        return self.host_slots[origin]
+    
+    async def fetch_to(self, url, sink):
+        """Stream url into sink(chunk) within the concurrency and bandwidth limits"""
+        if self.engine.is_offline():
+            raise ConnectionError("You are offline")
+        
+        started = time.monotonic()
+        async with self.slots, self.host_slot(url):
+            try:
+                async for chunk in self.backend.stream(url, self.engine.CHUNK_SIZE):
+                    wait = self.http.bandwidth.reserve(len(chunk))
+                    if wait:
+                        await asyncio.sleep(wait)
+                    sink(chunk)
+                    self.http.record(url, len(chunk))
+            except Exception:
+                self.http.record(url, seconds=time.monotonic() - started, error=True, request=True)
+                raise
+        self.http.record(url, seconds=time.monotonic() - started, request=True)
+    
+    async def fetch(self, url):
+        """Download url into memory"""
+        body = bytearray()
+        await self.fetch_to(url, body.extend)
+        return bytes(body)
+    
+    async def fetch_to_file(self, url, path):
+        """Download url to path, never leaving a partial file under the final name"""
+        part_path = path.with_name(path.name + ".part")
+        try:
+            with open(part_path, 'wb') as f:
+                await self.fetch_to(url, f.write)
+            os.replace(part_path, path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+    
+    async def asset(self, url, game_dir, file_type, from_css=False):
+        """Download one asset; returns its local path, or None if it failed"""
+        path = self.engine.asset_path(url, game_dir, file_type)
+        task = self.assets.get(path)
+        if task is None:
+            task = asyncio.ensure_future(self._download_asset(url, path, file_type, game_dir))
+            self.assets[path] = task
+        elif from_css and file_type == 'css' and not task.done():
+            # Stylesheets that import each other would otherwise wait on each other forever
+            return path
+        return await task
+    
+    async def assets_for(self, refs, game_dir, from_css=False):
+        """Download {url: folder} references concurrently; returns {url: local path} for the ones that worked"""
+        paths = await asyncio.gather(*(self.asset(url, game_dir, folder, from_css)
+                                       for url, folder in refs.items()))
+        return {url: path for url, path in zip(refs, paths) if path is not None}
+    
+    async def refetch(self, url, path, game_dir):
+        """Download an asset again over whatever is at path; returns path, or None if it failed"""
+        path.unlink(missing_ok=True)
+        self.index.discard(game_dir.name, url)
+        file_type = path.relative_to(game_dir).parts[0]
+        task = asyncio.ensure_future(self._download_asset(url, path, file_type, game_dir))
+        self.assets[path] = task
+        return await task
+    
+    async def _download_asset(self, url, path, file_type, game_dir):
+        name = path.relative_to(game_dir).as_posix()
+        if self.index.get(game_dir.name, url) == name:
+            return path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if file_type != 'css':
+                await self.fetch_to_file(url, path)
+                self.index.add(game_dir.name, url, name)
+                return path
+            
+            css = (await self.fetch(url)).decode('utf-8', errors='replace')
+            refs = await self.parser.css_refs(css, url)
+            paths = await self.assets_for(refs, game_dir, from_css=True)
+            local = {ref: os.path.relpath(local_path, path.parent).replace(os.sep, '/')
+                     for ref, local_path in paths.items()}
+            css = await self.parser.rewrite_css(css, url, local)
+            
+            part_path = path.with_name(path.name + ".part")
+            part_path.write_text(css, encoding='utf-8')
+            os.replace(part_path, path)
+            self.index.add(game_dir.name, url, name)
+            return path
+        except Exception as e:
+            self.engine.note_error(e)
+            return None
+    
+    async def page(self, url, game_dir):
+        """Download a page and its assets into game_dir"""
+        async with self.page_slots:
+            try:
+                if not game_dir.is_dir():
+                    # Anything the index remembers for this folder is gone with it
+                    self.index.forget(game_dir.name)
+                game_dir.mkdir(parents=True, exist_ok=True)
+                # The page is streamed to disk and rewritten from there, so it is never held in memory
+                source_file = game_dir / "index.source.html"
+                await self.fetch_to_file(url, source_file)
+                self.engine.note_success()
+                refs = await self.parser.page_refs(source_file, url)
+                paths = await self.assets_for(refs, game_dir)
+                local = {ref: path.relative_to(game_dir).as_posix() for ref, path in paths.items()}
+                
+                html_file = game_dir / "index.html"
+                part_file = game_dir / "index.html.part"
+                try:
+                    await self.parser.rewrite_page(source_file, part_file, url, local)
+                    os.replace(part_file, html_file)
+                finally:
+                    source_file.unlink(missing_ok=True)
+                    part_file.unlink(missing_ok=True)
+                
+                result = {'css_files': [], 'js_files': [], 'img_files': []}
+                for ref, path in paths.items():
+                    key = self.engine.RESULT_KEYS.get(refs[ref])
+                    if key:
+                        result[key].append(path)
+                # Every file the game needs, including ones only its stylesheets reference
+                result['sources'] = self.index.sources(game_dir.name)
+                result.update({'success': True, 'html_file': html_file, 'base_dir': game_dir})
+                return result
+            except Exception as e:
+                self.engine.note_error(e)
+                return {
+                    'success': False,
+                    'error': str(e) or type(e).__name__
+                }
+
+
+class AsyncDownloader:
+    """Downloads pages and all their HTML, CSS, JS, image and font assets on one event loop
+    
+    Every request is a task gated by a global and a per-host semaphore, so hundreds
+    of assets can be in flight on a single thread. Uses aiohttp, then httpx, and
+    falls back to the shared blocking client in a thread pool.
+    """
+    
+    BACKENDS = {
+        'aiohttp': _AiohttpBackend,
+        'httpx': _HttpxBackend,
+        'threads': _ThreadBackend,
+    }
+    
+    RESULT_KEYS = {'css': 'css_files', 'js': 'js_files', 'images': 'img_files'}
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    # Bulk runs of at least this many pages parse in worker processes
+    PROCESS_MIN_PAGES = 4
+    
+    def __init__(self, max_concurrency=128, per_host=8, max_pages=16, timeout=10, connectivity=None, backend=None,
+                 index=None):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.connectivity = connectivity  # optional ConnectivityMonitor
+        self.backend = backend or self.available_backends()[0]
+        self.http = get_http_client()
+        self.parser = PageParser()
+        self.index = index or AssetIndex()  # which assets are already on disk
+    
+    @classmethod
+    def available_backends(cls):
+        """Get the backends that can be used with the installed libraries, best first"""
+        backends = []
+        if aiohttp is not None:
+            backends.append('aiohttp')
+        if httpx is not None:
+            backends.append('httpx')
+        backends.append('threads')
+        return backends
+    
+    @staticmethod
+    def asset_path(url, game_dir, file_type):
+        """Local path for an asset of a page; distinct URLs always get distinct paths"""
+        return Path(game_dir) / asset_name(url, file_type)
+    
+    def is_offline(self):
+        """Check whether requests are known to be doomed"""
+        return self.connectivity is not None and not self.connectivity.is_online()
+    
+    def note_success(self):
+        """Tell the connectivity monitor a request got through"""
+        if self.connectivity is not None:
+            self.connectivity.report_success()
+    
+    def note_error(self, error):
+        """Tell the connectivity monitor when a host could not be reached"""
+        if self.connectivity is not None and isinstance(error, CONNECTION_ERRORS):
+            self.connectivity.report_failure()
+    
+    async def download_many(self, pages):
+        """Download (url, game_dir) pairs over one connection pool; returns a result per page"""
+        # Parsing is CPU-bound, so big batches spread it over worker processes
+        if len(pages) >= self.PROCESS_MIN_PAGES:
+            self.parser.start_processes()
+        try:
+            async with self.BACKENDS[self.backend](self.max_concurrency, self.timeout) as backend:
+                crawl = _Crawl(self, backend)
+                return await asyncio.gather(*(crawl.page(url, Path(game_dir)) for url, game_dir in pages))
+        finally:
+            self.parser.stop_processes()
+            self.index.save()
+    
+    async def refetch_assets(self, assets, game_dir):
+        """Download {name relative to game_dir: url} files of a game again; returns the names that worked"""
+        game_dir = Path(game_dir)
+        try:
+            async with self.BACKENDS[self.backend](self.max_concurrency, self.timeout) as backend:
+                crawl = _Crawl(self, backend)
+                paths = await asyncio.gather(*(crawl.refetch(url, game_dir / name, game_dir)
+                                               for name, url in assets.items()))
+        finally:
+            self.index.save()
+        return [name for name, path in zip(assets, paths) if path is not None]
+    
+    def run(self, coroutine):
+        """Run a coroutine to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Called from inside a running loop, so give the crawl a loop of its own
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    def download_website(self, url, game_dir):
+        """Download one page and its assets, blocking until done"""
+        return self.run(self.download_many([(url, game_dir)]))[0]
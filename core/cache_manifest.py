@@ -0,0 +1,188 @@
+"""Manifests of downloaded games, for checking and repairing the offline cache"""
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from core.game_pack import PACK_EXTENSION, GamePack
+
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def default_workers():
+    """Threads to hash with; hashlib releases the GIL, so this scales past one core"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def hash_data(data):
+    """(size, sha256 hex digest) of bytes or a memoryview"""
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """(size, sha256 hex digest) of a file, read in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _hash_pack_entry(pack, name):
+    data = pack.read(name)
+    try:
+        return hash_data(data)
+    finally:
+        if isinstance(data, memoryview):
+            data.release()
+
+
+def build_manifest(game_dir, url, sources, max_workers=None):
+    """Hash every file of a downloaded game and write its manifest
+    
+    sources maps file names relative to game_dir to the URLs they came from,
+    which is what lets a repair fetch single files again.
+    """
+    game_dir = Path(game_dir)
+    names = sorted(path.relative_to(game_dir).as_posix() for path in game_dir.rglob('*')
+                   if path.is_file() and path.suffix != '.part' and path.name != MANIFEST_NAME)
+    with ThreadPoolExecutor(max_workers or default_workers()) as executor:
+        hashes = executor.map(hash_file, (game_dir / name for name in names))
+        files = {}
+        for name, (size, sha256) in zip(names, hashes):
+            files[name] = {'size': size, 'sha256': sha256, 'url': url if name == 'index.html' else sources.get(name)}
+    
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'url': url,
+        'created': datetime.now().isoformat(),
+        'files': files
+    }
+    part_path = game_dir / (MANIFEST_NAME + ".part")
+    part_path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    os.replace(part_path, game_dir / MANIFEST_NAME)
+    return manifest
+
+
+def update_manifest(game_dir, manifest, names):
+    """Hash the given files of a game again and write its manifest"""
+    game_dir = Path(game_dir)
+    for name in names:
+        size, sha256 = hash_file(game_dir / name)
+        manifest['files'][name].update(size=size, sha256=sha256)
+    part_path = game_dir / (MANIFEST_NAME + ".part")
+    part_path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    os.replace(part_path, game_dir / MANIFEST_NAME)
+    return manifest
+
+
+def load_manifest(path):
+    """Manifest of a game directory or pack, or None if it has none"""
+    path = Path(path)
+    try:
+        if path.suffix == PACK_EXTENSION:
+            with GamePack(path) as pack:
+                if MANIFEST_NAME not in pack:
+                    return None
+                return json.loads(bytes(pack.read(MANIFEST_NAME)))
+        manifest_file = path / MANIFEST_NAME
+        if not manifest_file.exists():
+            return None
+        return json.loads(manifest_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"Error reading manifest of {path.name}: {e}")
+        return None
+
+
+def _start_check(path, executor):
+    """Open a game and queue the hashing of its files"""
+    report = {
+        'path': str(path),
+        'url': None,
+        'status': 'ok',  # or 'damaged', 'unverified' (no manifest) or 'unreadable'
+        'files': 0,
+        'missing': [],
+        'corrupt': [],
+        'error': None
+    }
+    check = {'report': report, 'pack': None, 'futures': {}, 'expected': {}}
+    try:
+        if path.suffix == PACK_EXTENSION:
+            pack = check['pack'] = GamePack(path)
+            manifest = json.loads(bytes(pack.read(MANIFEST_NAME))) if MANIFEST_NAME in pack else None
+            report['url'] = pack.meta.get('url')
+            has_file = pack.__contains__
+            
+            def hash_entry(name):
+                return executor.submit(_hash_pack_entry, pack, name)
+        else:
+            manifest_file = path / MANIFEST_NAME
+            manifest = json.loads(manifest_file.read_text(encoding='utf-8')) if manifest_file.exists() else None
+            
+            def has_file(name):
+                return (path / name).is_file()
+            
+            def hash_entry(name):
+                return executor.submit(hash_file, path / name)
+    except (OSError, ValueError) as e:
+        report['status'] = 'unreadable'
+        report['error'] = str(e)
+        return check
+    
+    if manifest is None:
+        report['status'] = 'unverified'
+        if not has_file('index.html'):
+            report['missing'].append('index.html')
+        return check
+    
+    report['url'] = manifest.get('url') or report['url']
+    check['expected'] = manifest.get('files', {})
+    report['files'] = len(check['expected'])
+    for name in check['expected']:
+        if has_file(name):
+            check['futures'][name] = hash_entry(name)
+        else:
+            report['missing'].append(name)
+    return check
+
+
+def _finish_check(check):
+    """Compare a game's hashes with its manifest"""
+    report = check['report']
+    try:
+        for name, future in check['futures'].items():
+            expected = check['expected'][name]
+            try:
+                size, sha256 = future.result()
+            except Exception:
+                report['corrupt'].append(name)
+                continue
+            if size != expected.get('size') or sha256 != expected.get('sha256'):
+                report['corrupt'].append(name)
+    finally:
+        if check['pack'] is not None:
+            check['pack'].close()
+    if report['status'] == 'ok' and (report['missing'] or report['corrupt']):
+        report['status'] = 'damaged'
+    return report
+
+
+def verify_games(paths, max_workers=None):
+    """Check downloaded games (directories or packs) against their manifests
+    
+    All files of all games are hashed in one thread pool, so a large cache is
+    checked about as fast as the disk can be read. Returns one report per path.
+    """
+    with ThreadPoolExecutor(max_workers or default_workers()) as executor:
+        checks = [_start_check(Path(path), executor) for path in paths]
+        return [_finish_check(check) for check in checks]
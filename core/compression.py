@@ -0,0 +1,125 @@
+"""Compression codecs for cached game files"""
+import gzip
+import threading
+from collections import OrderedDict
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class Codec:
+    """A named compressor/decompressor pair"""
+    
+    def __init__(self, name, content_encoding, compress, decompress):
+        self.name = name
+        self.content_encoding = content_encoding  # HTTP Content-Encoding token
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _zstd_codec():
+    compressor = zstandard.ZstdCompressor(level=12)
+    decompressor = zstandard.ZstdDecompressor()
+    # The zstandard objects are not safe to share between threads
+    lock = threading.Lock()
+    
+    def compress(data):
+        with lock:
+            return compressor.compress(data)
+    
+    def decompress(data):
+        with lock:
+            return decompressor.decompress(data)
+    
+    return Codec('zstd', 'zstd', compress, decompress)
+
+
+def _available_codecs():
+    """Installed codecs, best ratio and speed first"""
+    codecs = OrderedDict()
+    if zstandard is not None:
+        codecs['zstd'] = _zstd_codec()
+    if brotli is not None:
+        codecs['brotli'] = Codec('brotli', 'br', lambda data: brotli.compress(data, quality=9), brotli.decompress)
+    codecs['gzip'] = Codec('gzip', 'gzip', lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+                           gzip.decompress)
+    return codecs
+
+
+CODECS = _available_codecs()
+
+
+def get_codec(name):
+    """Look a codec up by name; raises ValueError if it is not installed"""
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"{name} support is not installed")
+
+
+def best_codec():
+    """The preferred installed codec"""
+    return next(iter(CODECS.values()))
+
+
+def decompress(data, name):
+    """Decompress data written by the named codec"""
+    return get_codec(name).decompress(data)
+
+
+class BlobCache:
+    """Thread-safe LRU of decompressed files, bounded by total size"""
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._blobs = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Get a cached blob, or None"""
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(key)
+            self.hits += 1
+            return blob
+    
+    def put(self, key, blob):
+        """Cache a blob, evicting the least recently used ones to make room"""
+        if len(blob) > self.max_bytes // 4:
+            return  # one huge file would flush everything else
+        with self._lock:
+            old = self._blobs.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._blobs[key] = blob
+            self.size += len(blob)
+            while self.size > self.max_bytes:
+                _, evicted = self._blobs.popitem(last=False)
+                self.size -= len(evicted)
+    
+    def discard(self, prefix):
+        """Drop every blob whose key starts with prefix, e.g. all files of one pack"""
+        with self._lock:
+            for key in [key for key in self._blobs if key[:len(prefix)] == prefix]:
+                self.size -= len(self._blobs.pop(key))
+    
+    def resize(self, max_bytes):
+        """Change the size limit"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self.size > self.max_bytes and self._blobs:
+                _, evicted = self._blobs.popitem(last=False)
+                self.size -= len(evicted)
@@ -0,0 +1,95 @@
+"""Network connectivity tracking"""
+import socket
+import threading
+import time
+
+
+class ConnectivityMonitor:
+    """Knows whether the network is reachable, so callers can skip requests that would time out"""
+    
+    # Cheap TCP connects; the first one that succeeds proves we are online
+    PROBE_HOSTS = [("poki.com", 443), ("api.github.com", 443), ("1.1.1.1", 53)]
+    
+    def __init__(self, probe_hosts=None, probe_timeout=2.0, min_backoff=5, max_backoff=300, online_interval=120):
+        self.probe_hosts = probe_hosts or self.PROBE_HOSTS
+        self.probe_timeout = probe_timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.online_interval = online_interval
+        
+        self._online = True  # assume online until something says otherwise
+        self._backoff = min_backoff
+        self._next_probe = 0.0
+        self._lock = threading.Lock()
+        self._listeners = []
+    
+    def is_online(self):
+        """Last known state; never blocks"""
+        return self._online
+    
+    def subscribe(self, callback):
+        """Call callback(online) whenever the state changes"""
+        self._listeners.append(callback)
+    
+    def unsubscribe(self, callback):
+        """Stop calling callback"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def set_online(self, online):
+        """Record the current state, e.g. from the OS network information"""
+        with self._lock:
+            changed = online != self._online
+            self._online = online
+            now = time.monotonic()
+            if online:
+                self._backoff = self.min_backoff
+                self._next_probe = now + self.online_interval
+            elif changed:
+                self._next_probe = now + self._backoff
+        if changed:
+            for callback in list(self._listeners):
+                try:
+                    callback(online)
+                except Exception as e:
+                    print(f"Connectivity listener error: {e}")
+    
+    def report_success(self):
+        """A real request got through"""
+        if not self._online:
+            self.set_online(True)
+        else:
+            self._next_probe = time.monotonic() + self.online_interval
+    
+    def report_failure(self):
+        """A real request could not connect; go offline until a probe succeeds"""
+        self.set_online(False)
+    
+    def probe_due(self):
+        """Check whether it is time for another probe"""
+        return time.monotonic() >= self._next_probe
+    
+    def probe(self):
+        """Try to reach a probe host (blocks up to probe_timeout per host); returns the new state"""
+        online = False
+        for host, port in self.probe_hosts:
+            try:
+                with socket.create_connection((host, port), timeout=self.probe_timeout):
+                    online = True
+                    break
+            except OSError:
+                continue
+        
+        self.set_online(online)
+        if not online:
+            with self._lock:
+                # Back off so a long outage costs almost nothing
+                self._next_probe = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+        return online
+    
+    def probe_if_due(self):
+        """Probe only when the backoff schedule allows it; returns the current state"""
+        if self.probe_due():
+            return self.probe()
+        return self._online
@@ -1,143 +1,308 @@
 """Website download manager for HTML/CSS/JS files"""
-import os
-import re
 import hashlib
+import os
+import shutil
+import threading
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
-import requests
 
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    BeautifulSoup = None
+from core.asset_naming import AssetIndex
+from core.async_downloader import AsyncDownloader
+from core.cache_manifest import MANIFEST_NAME, build_manifest, load_manifest, update_manifest, verify_games
+from core.compression import BlobCache
+from core.game_pack import PACK_EXTENSION, GamePack, PackInUseError, build_pack, extract_pack, read_meta
 
 
 class DownloadManager:
     """Manages downloading and caching website files"""
     
-    def __init__(self, cache_dir):
+    def __init__(self, cache_dir, connectivity=None, pack_games=True, blob_cache_mb=64):
         self.cache_dir = Path(cache_dir)
+        self.connectivity = connectivity  # optional ConnectivityMonitor
+        self.pack_games = pack_games  # store each downloaded game as one .pack file
         self.cache_dir.mkdir(exist_ok=True, parents=True)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.asset_index = AssetIndex(self.cache_dir / "cache_index.json")
+        self.engine = AsyncDownloader(connectivity=connectivity, index=self.asset_index)
+        self.open_packs = {}  # pack path -> GamePack
+        self._packs_lock = threading.Lock()  # packs are served on the GUI thread and repaired on workers
+        self.blob_cache = BlobCache(blob_cache_mb * 1024 * 1024)  # hot decompressed files
     
     def get_url_hash(self, url):
         """Generate hash for URL"""
         return hashlib.md5(url.encode()).hexdigest()
     
+    def is_offline(self):
+        """Check whether requests are known to be doomed"""
+        return self.connectivity is not None and not self.connectivity.is_online()
+    
     def download_website(self, url, game_name):
         """Download website HTML, CSS, and JS files"""
-        if BeautifulSoup is None:
+        if self.is_offline():
             return {
                 'success': False,
-                'error': 'BeautifulSoup4 is not installed. Please install it with: pip install beautifulsoup4'
+                'error': 'You are offline'
             }
         
+        return self._finish_download(url, self.engine.download_website(url, self.cache_dir / self.get_url_hash(url)))
+    
+    def download_many(self, urls):
+        """Download several websites concurrently; returns {url: result}"""
+        urls = list(dict.fromkeys(urls))
+        if self.is_offline():
+            return {url: self.download_website(url, None) for url in urls}
+        
+        pages = [(url, self.cache_dir / self.get_url_hash(url)) for url in urls]
+        results = self.engine.run(self.engine.download_many(pages))
+        return {url: self._finish_download(url, result) for url, result in zip(urls, results)}
+    
+    def _finish_download(self, url, result):
+        """Pack a freshly downloaded game; sets result['local_path'] to what should be loaded"""
+        if not result['success']:
+            return result
+        result['local_path'] = result['html_file']
         try:
-            # Create game-specific directory
-            game_dir = self.cache_dir / self.get_url_hash(url)
-            game_dir.mkdir(exist_ok=True, parents=True)
-            
-            # Download main HTML
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            html_content = response.text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Save original HTML
-            html_file = game_dir / "index.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # Download and replace CSS links
-            css_files = []
-            for link in soup.find_all('link', rel='stylesheet'):
-                href = link.get('href')
-                if href:
-                    css_url = urljoin(url, href)
-                    css_path = self._download_file(css_url, game_dir, 'css')
-                    if css_path:
-                        css_files.append(css_path)
-                        link['href'] = str(css_path.relative_to(game_dir))
-            
-            # Download and replace JS scripts
-            js_files = []
-            for script in soup.find_all('script', src=True):
-                src = script.get('src')
-                if src:
-                    js_url = urljoin(url, src)
-                    js_path = self._download_file(js_url, game_dir, 'js')
-                    if js_path:
-                        js_files.append(js_path)
-                        script['src'] = str(js_path.relative_to(game_dir))
-            
-            # Download images
-            img_files = []
-            for img in soup.find_all('img', src=True):
-                src = img.get('src')
-                if src and not src.startswith('data:'):
-                    img_url = urljoin(url, src)
-                    img_path = self._download_file(img_url, game_dir, 'images')
-                    if img_path:
-                        img_files.append(img_path)
-                        img['src'] = str(img_path.relative_to(game_dir))
-            
-            # Save modified HTML
-            modified_html = str(soup)
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(modified_html)
-            
-            return {
-                'success': True,
-                'html_file': html_file,
-                'css_files': css_files,
-                'js_files': js_files,
-                'img_files': img_files,
-                'base_dir': game_dir
-            }
+            build_manifest(result['base_dir'], url, result.get('sources', {}))
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
+            print(f"Error writing manifest for {url}: {e}")
+        if self.pack_games:
+            try:
+                result['pack_file'] = self.pack_game(url)
+                result['local_path'] = result['pack_file']
+            except Exception as e:
+                print(f"Error packing {url}: {e}")
+        return result
     
-    def _download_file(self, url, base_dir, file_type):
-        """Download a single file"""
-        try:
-            # Create subdirectory for file type
-            subdir = base_dir / file_type
-            subdir.mkdir(exist_ok=True)
-            
-            # Get filename from URL
-            parsed = urlparse(url)
-            filename = os.path.basename(parsed.path) or f"file_{self.get_url_hash(url)}"
-            
-            # Clean filename
-            filename = re.sub(r'[^\w\.-]', '_', filename)
-            
-            file_path = subdir / filename
-            
-            # Skip if already downloaded
-            if file_path.exists():
-                return file_path
-            
-            # Download file
-            response = self.session.get(url, timeout=10, stream=True)
-            response.raise_for_status()
-            
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+    def parse_stats(self):
+        """Parse throughput of downloads so far, e.g. pages per second"""
+        return self.engine.parser.stats()
+    
+    def get_pack_path(self, url):
+        """Get where a game's pack file lives"""
+        return self.cache_dir / f"{self.get_url_hash(url)}{PACK_EXTENSION}"
+    
+    def pack_game(self, url, pack_path=None):
+        """Pack a downloaded game directory into one file and remove the directory"""
+        game_dir = self.cache_dir / self.get_url_hash(url)
+        if not (game_dir / "index.html").exists():
+            raise FileNotFoundError(f"{url} is not downloaded")
+        pack_path = Path(pack_path) if pack_path else self.get_pack_path(url)
+        self.close_pack(pack_path)
+        build_pack(game_dir, pack_path, meta={'url': url})
+        if pack_path == self.get_pack_path(url):
+            self._remove_game_dir(url)
+        return pack_path
+    
+    def _remove_game_dir(self, url):
+        """Delete a game's download folder and its entries in the cache index"""
+        shutil.rmtree(self.cache_dir / self.get_url_hash(url), ignore_errors=True)
+        self.asset_index.forget(self.get_url_hash(url))
+        self.asset_index.save()
+    
+    def open_pack(self, pack_path):
+        """Get a memory-mapped reader for a pack, reusing one that is already open"""
+        pack_path = Path(pack_path)
+        with self._packs_lock:
+            pack = self.open_packs.get(pack_path)
+            if pack is None:
+                pack = GamePack(pack_path, self.blob_cache)
+                self.open_packs[pack_path] = pack
+            return pack
+    
+    def close_pack(self, pack_path=None):
+        """Unmap one open pack, or all of them, before it is replaced or deleted
+        
+        Raises PackInUseError if a running game is still reading a pack; that pack stays open.
+        """
+        busy = []
+        with self._packs_lock:
+            paths = [Path(pack_path)] if pack_path else list(self.open_packs)
+            for path in paths:
+                pack = self.open_packs.get(path)
+                if pack is None:
+                    continue
+                try:
+                    pack.close()
+                except PackInUseError:
+                    busy.append(path.name)
+                    continue
+                del self.open_packs[path]
+        if busy:
+            raise PackInUseError(f"Close the game first; still in use: {', '.join(busy)}")
+    
+    def export_game(self, url, destination):
+        """Write a downloaded game to destination as a single pack file"""
+        pack_path = self.get_pack_path(url)
+        if pack_path.exists():
+            shutil.copyfile(pack_path, destination)
+        else:
+            game_dir = self.cache_dir / self.get_url_hash(url)
+            if not (game_dir / "index.html").exists():
+                raise FileNotFoundError("This game is not downloaded")
+            build_pack(game_dir, destination, meta={'url': url})
+        return Path(destination)
+    
+    def import_game(self, pack_file):
+        """Add a pack exported on another machine to the cache; returns (url, pack path)"""
+        url = read_meta(pack_file).get('url')
+        if not url:
+            raise ValueError("This pack does not say which game it holds")
+        
+        pack_path = self.get_pack_path(url)
+        self.close_pack(pack_path)
+        part_path = pack_path.with_name(pack_path.name + ".part")
+        shutil.copyfile(pack_file, part_path)
+        os.replace(part_path, pack_path)
+        self._remove_game_dir(url)
+        return url, pack_path
+    
+    def get_game_path(self, url):
+        """Get a downloaded game's pack file or directory, or None"""
+        pack_path = self.get_pack_path(url)
+        if pack_path.exists():
+            return pack_path
+        game_dir = self.cache_dir / self.get_url_hash(url)
+        return game_dir if game_dir.is_dir() else None
+    
+    def verify_cache(self, urls=None, max_workers=None):
+        """Check downloaded games against their manifests; returns one report per game"""
+        if urls is None:
+            paths = [path for path in self.cache_dir.iterdir()
+                     if path.is_dir() or path.suffix == PACK_EXTENSION]
+        else:
+            paths = [path for path in map(self.get_game_path, urls) if path is not None]
+        return verify_games(paths, max_workers)
+    
+    def repair_game(self, url):
+        """Fetch again only the files of a game that are missing or damaged; returns a fresh report"""
+        path = self.get_game_path(url)
+        if path is None:
+            raise FileNotFoundError(f"{url} is not downloaded")
+        report = verify_games([path])[0]
+        report['repaired'] = []
+        if report['status'] == 'ok':
+            return report
+        if self.is_offline():
+            report['error'] = 'You are offline'
+            return report
+        
+        manifest = load_manifest(path)
+        bad = report['missing'] + report['corrupt']
+        files = manifest.get('files', {}) if manifest else {}
+        if manifest is None or 'index.html' in bad or any(not files.get(name, {}).get('url') for name in bad):
+            # Without a manifest or the page itself there is nothing to patch, so start over
+            self.clear_cache(url)
+            result = self.download_website(url, None)
+            report = self.verify_cache([url])[0] if result['success'] else dict(report, error=result['error'])
+            report['repaired'] = bad if result['success'] else []
+            return report
+        
+        game_dir = self.cache_dir / self.get_url_hash(url)
+        packed = path.suffix == PACK_EXTENSION
+        if packed:
+            # Packs are immutable, so unpack the good files, patch the directory and pack it again
+            self.close_pack(path)
+            self._remove_game_dir(url)
+            extract_pack(path, game_dir, skip=set(bad) | {MANIFEST_NAME})
+        
+        repaired = self.engine.run(self.engine.refetch_assets({name: files[name]['url'] for name in bad}, game_dir))
+        # The site may have changed a file since it was first downloaded, so trust the new copy
+        update_manifest(game_dir, manifest, repaired)
+        if packed:
+            self.pack_game(url, path)
+        
+        report = verify_games([path])[0]
+        report['repaired'] = repaired
+        return report
+    
+    def check_games(self, repair_urls=None, progress=None, is_cancelled=None):
+        """Verify every downloaded game, or repair the given ones; returns one report per game
+        
+        Follows the TaskRunner job contract: progress(url) is called before each
+        repair, and repairing stops between games once is_cancelled() is true.
+        """
+        if repair_urls is None:
+            return self.verify_cache()
+        reports = []
+        for url in repair_urls:
+            if is_cancelled is not None and is_cancelled():
+                break
+            if progress is not None:
+                progress(url)
+            reports.append(self.repair_game(url))
+        return reports
+    
+    def migrate_game(self, url):
+        """Bring a downloaded game up to the current cache format; returns the steps taken"""
+        steps = []
+        game_dir = self.cache_dir / self.get_url_hash(url)
+        pack_path = self.get_pack_path(url)
+        if not (game_dir / "index.html").exists() and pack_path.exists() and load_manifest(pack_path) is None:
+            # Packs from before manifests existed are unpacked so one can be written
+            self.close_pack(pack_path)
+            extract_pack(pack_path, game_dir)
+            if not self.pack_games:
+                pack_path.unlink()
+                steps.append('unpacked')
+        
+        if (game_dir / "index.html").exists():
+            if not (game_dir / MANIFEST_NAME).exists():
+                build_manifest(game_dir, url, self.asset_index.sources(game_dir.name))
+                steps.append('manifest')
+            if self.pack_games:
+                self.pack_game(url)
+                steps.append('packed')
+        return steps
+    
+    def prune_cache(self, keep_urls, dry_run=False):
+        """Delete cache entries no game in keep_urls owns, broken packs and partial files
+        
+        Returns [{'path', 'reason', 'size'}] for everything removed (or that would be).
+        """
+        keep = {self.get_url_hash(url) for url in keep_urls}
+        removed = []
+        for path in sorted(self.cache_dir.iterdir()):
+            if path.is_dir():
+                size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+                if path.name not in keep:
+                    reason = 'not in library'
+                elif path.with_suffix(PACK_EXTENSION).exists():
+                    reason = 'superseded by pack'
+                elif not (path / "index.html").exists():
+                    reason = 'incomplete download'
+                else:
+                    continue
+            elif path.suffix == PACK_EXTENSION:
+                size = path.stat().st_size
+                if path.stem not in keep:
+                    reason = 'not in library'
+                else:
+                    try:
+                        read_meta(path)
+                        continue
+                    except ValueError:
+                        reason = 'unreadable pack'
+            elif path.suffix == '.part':
+                size = path.stat().st_size
+                reason = 'partial file'
+            else:
+                continue
             
-            return file_path
-        except:
-            return None
+            removed.append({'path': str(path), 'reason': reason, 'size': size})
+            if dry_run:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+                self.asset_index.forget(path.name)
+            else:
+                self.close_pack(path)
+                path.unlink(missing_ok=True)
+        self.asset_index.save()
+        return removed
     
     def get_local_path(self, url):
-        """Get local path for downloaded website"""
+        """Get local path for downloaded website: its pack file, or its index.html"""
+        pack_path = self.get_pack_path(url)
+        if pack_path.exists():
+            return pack_path
         game_dir = self.cache_dir / self.get_url_hash(url)
         html_file = game_dir / "index.html"
         if html_file.exists():
@@ -150,6 +315,10 @@ class DownloadManager:
     
     def get_download_size(self, url):
         """Get total size of downloaded files"""
+        pack_path = self.get_pack_path(url)
+        if pack_path.exists():
+            return pack_path.stat().st_size
+        
         game_dir = self.cache_dir / self.get_url_hash(url)
         if not game_dir.exists():
             return 0
@@ -164,42 +333,65 @@ class DownloadManager:
     def clear_cache(self, url=None):
         """Clear cache for a specific URL or all cache"""
         if url:
+            removed = False
+            pack_path = self.get_pack_path(url)
+            if pack_path.exists():
+                self.close_pack(pack_path)
+                pack_path.unlink()
+                removed = True
             game_dir = self.cache_dir / self.get_url_hash(url)
             if game_dir.exists():
-                import shutil
-                shutil.rmtree(game_dir)
-                return True
+                self._remove_game_dir(url)
+                removed = True
+            return removed
         else:
             # Clear all cache
-            import shutil
+            self.close_pack()
             if self.cache_dir.exists():
                 shutil.rmtree(self.cache_dir)
                 self.cache_dir.mkdir(exist_ok=True, parents=True)
+                self.asset_index.forget()
+                self.asset_index.save()
                 return True
         return False
     
     def get_cache_info(self):
         """Get information about cached games"""
         if not self.cache_dir.exists():
-            return {'count': 0, 'total_size': 0, 'games': []}
+            return {'count': 0, 'total_size': 0, 'total_size_mb': 0.0, 'total_original_size': 0, 'games': []}
         
         games = []
         total_size = 0
+        total_original_size = 0
         
-        for game_dir in self.cache_dir.iterdir():
-            if game_dir.is_dir():
-                size = sum(f.stat().st_size for f in game_dir.rglob('*') if f.is_file())
-                total_size += size
-                games.append({
-                    'path': str(game_dir),
-                    'size': size,
-                    'size_mb': size / (1024 * 1024)
-                })
+        for game_path in self.cache_dir.iterdir():
+            if game_path.is_dir():
+                size = original_size = sum(f.stat().st_size for f in game_path.rglob('*') if f.is_file())
+            elif game_path.suffix == PACK_EXTENSION:
+                size = original_size = game_path.stat().st_size
+                try:
+                    with GamePack(game_path) as pack:
+                        # Header and index are tiny, so the stored/original ratio is the file's
+                        stored, original = pack.sizes()
+                        original_size = size - stored + original
+                except ValueError:
+                    pass
+            else:
+                continue
+            total_size += size
+            total_original_size += original_size
+            games.append({
+                'path': str(game_path),
+                'size': size,
+                'size_mb': size / (1024 * 1024),
+                'original_size': original_size
+            })
         
         return {
             'count': len(games),
             'total_size': total_size,
             'total_size_mb': total_size / (1024 * 1024),
+            'total_original_size': total_original_size,
             'games': games
         }
 
@@ -8,12 +8,35 @@ from models.game_item import GameItem
 class GameManager:
     """Manages game data and statistics"""
     
-    def __init__(self, settings_manager):
+    # Events listeners can subscribe to; callbacks receive the affected game
+    FAVORITE_CHANGED = 'favorite_changed'
+    STATS_CHANGED = 'stats_changed'
+    ICON_READY = 'icon_ready'
+    
+    def __init__(self, settings_manager, data_file=None):
         self.settings_manager = settings_manager
+        self._listeners = {}
+        self._catalog_order = None  # game name -> catalog position, built on first use
         self.games = self._initialize_games()
-        self.data_file = self.settings_manager.settings_file.parent / "game_data.json"
+        self.data_file = Path(data_file) if data_file else self.settings_manager.data_dir / "game_data.json"
         self.load_game_data()
     
+    @property
+    def games(self):
+        """The catalog, in display order"""
+        return self._games
+    
+    @games.setter
+    def games(self, games):
+        self._games = games
+        self._catalog_order = None
+    
+    def catalog_position(self, game):
+        """Position of a game in the catalog; games not in it sort last"""
+        if self._catalog_order is None:
+            self._catalog_order = {g.name: i for i, g in enumerate(self._games)}
+        return self._catalog_order.get(game.name, len(self._catalog_order))
+    
     def _initialize_games(self):
         """Initialize the list of games"""
         return [
@@ -109,6 +132,48 @@ class GameManager:
         except:
             pass
     
+    def subscribe(self, event, callback):
+        """Register a callback for a game event"""
+        self._listeners.setdefault(event, []).append(callback)
+    
+    def unsubscribe(self, event, callback):
+        """Remove a callback registered with subscribe"""
+        callbacks = self._listeners.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+    
+    def notify(self, event, game):
+        """Tell listeners that a game changed"""
+        for callback in list(self._listeners.get(event, [])):
+            callback(game)
+    
+    def sync_downloads(self, download_manager):
+        """Match games' download state to the cache, e.g. after packs were copied in or pruned
+        
+        Returns True if any game changed; the caller saves.
+        """
+        changed = False
+        for game in self.games:
+            local_path = download_manager.get_local_path(game.url)
+            if local_path is not None:
+                if not game.is_downloaded or game.local_path != str(local_path):
+                    game.local_path = str(local_path)
+                    game.is_downloaded = True
+                    changed = True
+            elif game.is_downloaded and not (game.local_path and Path(game.local_path).exists()):
+                game.local_path = None
+                game.is_downloaded = False
+                changed = True
+        return changed
+    
+    def set_favorite(self, game, favorite):
+        """Mark or unmark a game as favorite"""
+        if game.favorite == favorite:
+            return
+        game.favorite = favorite
+        game.favorite_date = datetime.now() if favorite else None
+        self.notify(self.FAVORITE_CHANGED, game)
+    
     def total_games_played(self):
         """Get total number of games played"""
         return sum(g.play_count for g in self.games)
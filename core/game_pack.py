@@ -0,0 +1,218 @@
+"""Single-file archives of downloaded games"""
+import json
+import mmap
+import os
+import shutil
+import struct
+from datetime import datetime
+from pathlib import Path
+
+from core.compression import best_codec, decompress
+
+
+MAGIC = b'PGPK'
+VERSION = 1
+# magic, version, flags, index offset, index length
+HEADER = struct.Struct('<4sHHQQ')
+
+PACK_EXTENSION = '.pack'
+
+
+class PackInUseError(OSError):
+    """A pack cannot be closed or replaced while views returned by read() are alive"""
+
+
+class PackWriter:
+    """Writes a pack: a header, the files' bytes back to back, then a JSON index"""
+    
+    # Text-like files shrink well; media is already compressed
+    COMPRESSIBLE = {'.html', '.htm', '.css', '.js', '.mjs', '.json', '.svg', '.txt', '.xml', '.wasm', '.map'}
+    MIN_COMPRESS_SIZE = 512
+    COPY_CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, path, meta=None, compress=True):
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + ".part")
+        self.meta = dict(meta or {})
+        self.codec = best_codec() if compress else None
+        self.entries = {}
+        self._file = open(self.part_path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.abort()
+    
+    def _should_compress(self, name, size):
+        return (self.codec is not None and size >= self.MIN_COMPRESS_SIZE
+                and os.path.splitext(name)[1].lower() in self.COMPRESSIBLE)
+    
+    def add(self, name, data):
+        """Add a file from memory"""
+        size = len(data)
+        codec = 'none'
+        if self._should_compress(name, size):
+            compressed = self.codec.compress(data)
+            if len(compressed) < size:
+                data, codec = compressed, self.codec.name
+        offset = self._file.tell()
+        self._file.write(data)
+        # name -> [offset, stored length, original size, codec]
+        self.entries[name] = [offset, len(data), size, codec]
+    
+    def add_file(self, name, file_path):
+        """Add a file from disk; files that are stored as-is are copied without loading them"""
+        size = os.path.getsize(file_path)
+        if self._should_compress(name, size):
+            with open(file_path, 'rb') as f:
+                self.add(name, f.read())
+            return
+        offset = self._file.tell()
+        with open(file_path, 'rb') as f:
+            shutil.copyfileobj(f, self._file, self.COPY_CHUNK_SIZE)
+        self.entries[name] = [offset, size, size, 'none']
+    
+    def finish(self):
+        """Write the index and move the pack into place"""
+        self.meta.setdefault('created', datetime.now().isoformat())
+        index = json.dumps({'meta': self.meta, 'entries': self.entries}).encode('utf-8')
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, index_offset, len(index)))
+        self._file.close()
+        os.replace(self.part_path, self.path)
+    
+    def abort(self):
+        """Throw the unfinished pack away"""
+        self._file.close()
+        self.part_path.unlink(missing_ok=True)
+
+
+class GamePack:
+    """Read-only view of a pack, memory-mapped so stored files are never loaded whole
+    
+    read() returns a memoryview into the map for uncompressed entries; close()
+    refuses with PackInUseError while such views are alive, since the map (and,
+    on Windows, the file) must stay put until they are released.
+    Compressed entries are decompressed once and kept in blob_cache, if given.
+    """
+    
+    def __init__(self, path, blob_cache=None):
+        self.path = Path(path)
+        self.blob_cache = blob_cache  # optional compression.BlobCache shared between packs
+        self._file = open(self.path, 'rb')
+        self._map = None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Not a game pack: {self.path.name}")
+            if version > VERSION:
+                raise ValueError(f"Game pack {self.path.name} needs a newer launcher")
+            index = json.loads(self._map[index_offset:index_offset + index_length])
+        except (ValueError, OSError, struct.error) as e:
+            self.close()
+            raise ValueError(f"Invalid game pack {self.path.name}: {e}")
+        self.meta = index.get('meta', {})
+        self.entries = index.get('entries', {})
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __contains__(self, name):
+        return name in self.entries
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def names(self):
+        """Names of the files in the pack"""
+        return list(self.entries)
+    
+    def size(self, name):
+        """Uncompressed size of a file"""
+        return self.entries[name][2]
+    
+    def is_compressed(self, name):
+        """Check whether a file is stored compressed"""
+        return self.entries[name][3] != 'none'
+    
+    def sizes(self):
+        """Total (stored, uncompressed) size of the files"""
+        return (sum(entry[1] for entry in self.entries.values()),
+                sum(entry[2] for entry in self.entries.values()))
+    
+    def read(self, name):
+        """Contents of a file: a zero-copy memoryview if stored as-is, else decompressed bytes"""
+        offset, length, _, codec = self.entries[name]
+        view = memoryview(self._map)[offset:offset + length]
+        if codec == 'none':
+            return view
+        
+        key = (str(self.path), name)
+        blob = self.blob_cache.get(key) if self.blob_cache is not None else None
+        if blob is None:
+            with view:
+                blob = decompress(view, codec)
+            if self.blob_cache is not None:
+                self.blob_cache.put(key, blob)
+        return blob
+    
+    def close(self):
+        """Unmap the pack; raises PackInUseError, leaving it open, while views are alive"""
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                raise PackInUseError(f"{self.path.name} is still being read")
+            self._map = None
+        self._file.close()
+        if self.blob_cache is not None:
+            self.blob_cache.discard((str(self.path),))
+
+
+def build_pack(directory, pack_path, meta=None, compress=True, skip_suffixes=('.part',)):
+    """Pack every file under directory; returns the number of files packed"""
+    directory = Path(directory)
+    files = sorted(p for p in directory.rglob('*') if p.is_file() and p.suffix not in skip_suffixes)
+    with PackWriter(pack_path, meta, compress) as writer:
+        for file_path in files:
+            writer.add_file(file_path.relative_to(directory).as_posix(), file_path)
+    return len(files)
+
+
+def read_meta(pack_path):
+    """Metadata of a pack, checking that it is valid"""
+    with GamePack(pack_path) as pack:
+        return dict(pack.meta)
+
+
+def extract_pack(pack_path, directory, skip=()):
+    """Unpack every file except the ones in skip into directory; returns the names written"""
+    directory = Path(directory)
+    written = []
+    with GamePack(pack_path) as pack:
+        for name in pack.names():
+            if name in skip:
+                continue
+            target = directory / name
+            if directory.resolve() not in target.resolve().parents:
+                continue  # never let a crafted pack write outside the game's folder
+            target.parent.mkdir(parents=True, exist_ok=True)
+            data = pack.read(name)
+            try:
+                target.write_bytes(data)
+            finally:
+                if isinstance(data, memoryview):
+                    data.release()
+            written.append(name)
+    return written
@@ -0,0 +1,251 @@
+"""Streaming scan and rewrite of asset references in HTML"""
+import codecs
+import os
+import re
+from html import escape, unescape
+from urllib.parse import urljoin, urldefrag, urlparse
+
+
+CSS_URL_PATTERN = re.compile(r'''url\(\s*(['"]?)([^'")]+?)\1\s*\)''', re.IGNORECASE)
+CSS_IMPORT_PATTERN = re.compile(r'''@import\s+(['"])([^'"]+)\1''', re.IGNORECASE)
+
+# The only places a rewrite can happen; everything between them is copied untouched
+INTERESTING_PATTERN = re.compile(r'<!--|<(/?)(script|style|link|img)(?=[\s/>])', re.IGNORECASE)
+TAG_PATTERN = re.compile(r'''<([a-zA-Z][^\s/>]*)((?:[^>"']|"[^"]*"|'[^']*')*)>''')
+ATTR_PATTERN = re.compile(r'''([^\s"'>/=]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?''')
+RAW_TEXT_END = {
+    'script': re.compile(r'</script', re.IGNORECASE),
+    'style': re.compile(r'</style', re.IGNORECASE),
+}
+META_CHARSET_PATTERN = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)''', re.IGNORECASE)
+
+FONT_EXTENSIONS = {'.woff', '.woff2', '.ttf', '.otf', '.eot'}
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.avif', '.ico', '.bmp'}
+# Folder for the file each rewritable tag points at
+TAG_FOLDERS = {'link': 'css', 'script': 'js', 'img': 'images'}
+
+TAIL_LENGTH = 8  # long enough to hold a token cut off at the end of a chunk, e.g. "<script"
+MAX_TAG_LENGTH = 64 * 1024  # a "<tag" with no ">" within this many characters is treated as text
+
+
+def resolve(base_url, ref):
+    """Absolute URL of a reference, without its fragment"""
+    return urldefrag(urljoin(base_url, ref.strip()))[0]
+
+
+def css_asset_type(ref):
+    """Folder for a file referenced from CSS"""
+    extension = os.path.splitext(urlparse(ref).path)[1].lower()
+    if extension == '.css':
+        return 'css'
+    if extension in FONT_EXTENSIONS:
+        return 'fonts'
+    if extension in IMAGE_EXTENSIONS:
+        return 'images'
+    return 'assets'
+
+
+def css_refs(css, base_url):
+    """Files a stylesheet references, as {absolute url: folder}"""
+    refs = {}
+    for match in CSS_IMPORT_PATTERN.finditer(css):
+        refs[resolve(base_url, match.group(2))] = 'css'
+    for match in CSS_URL_PATTERN.finditer(css):
+        ref = match.group(2).strip()
+        if ref and not ref.startswith(('data:', '#')):
+            refs.setdefault(resolve(base_url, ref), css_asset_type(ref))
+    return refs
+
+
+def rewrite_css(css, base_url, local):
+    """Point a stylesheet's references at local copies; local maps absolute url -> relative path"""
+    if not local:
+        return css
+    
+    def replace_url(match):
+        ref = match.group(2).strip()
+        path = None if ref.startswith('data:') else local.get(resolve(base_url, ref))
+        return f'url("{path}")' if path else match.group(0)
+    
+    def replace_import(match):
+        path = local.get(resolve(base_url, match.group(2)))
+        return f'@import "{path}"' if path else match.group(0)
+    
+    css = CSS_URL_PATTERN.sub(replace_url, css)
+    return CSS_IMPORT_PATTERN.sub(replace_import, css)
+
+
+def sniff_encoding(head):
+    """Encoding declared in the first bytes of a page, defaulting to UTF-8"""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8'
+    match = META_CHARSET_PATTERN.search(head)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return 'utf-8'
+
+
+class HtmlRewriter:
+    """Rewrites stylesheet, script and image URLs in HTML fed to it in chunks
+    
+    A tokenizer, not a parser: no tree is built and everything it does not rewrite
+    is passed through byte for byte. Memory is bounded by the longest tag or
+    <style> block, not by the page. Every reference it sees is collected in refs.
+    """
+    
+    def __init__(self, base_url, local, write):
+        self.base_url = base_url
+        self.local = local  # absolute url -> replacement path
+        self.write = write
+        self.refs = {}  # absolute url -> folder, for every stylesheet, script, image and CSS url() seen
+        self.buffer = ''
+        self.state = None  # None for markup, or 'comment', 'script' or 'style'
+        self._urls = {}  # attribute value -> absolute url, since pages repeat URLs a lot
+    
+    def feed(self, text):
+        """Rewrite the next piece of the document"""
+        self.buffer += text
+        self._process(final=False)
+    
+    def close(self):
+        """Flush everything still buffered"""
+        self._process(final=True)
+        self.buffer = ''
+    
+    def _rewrite_tag(self, tag):
+        """Rewritten text of a <link>, <script> or <img> start tag"""
+        name = tag.group(1).lower()
+        attrs = tag.group(2)
+        found = {}
+        for attr in ATTR_PATTERN.finditer(attrs):
+            found.setdefault(attr.group(1).lower(), attr)  # the first duplicate wins in HTML
+        
+        if name == 'link':
+            rel = found.get('rel')
+            rel_value = unescape(rel.group(2).strip('"\'')).lower().split() if rel and rel.group(2) else []
+            target = 'href' if 'stylesheet' in rel_value else None
+        else:
+            target = 'src'
+        
+        attr = found.get(target)
+        if attr is None or attr.group(2) is None:
+            return tag.group(0)
+        value = attr.group(2)
+        url = self._urls.get(value)
+        if url is None:
+            ref = unescape(value[1:-1] if value[:1] in ('"', "'") else value).strip()
+            url = '' if not ref or ref.startswith('data:') else resolve(self.base_url, ref)
+            self._urls[value] = url
+        if not url:
+            return tag.group(0)
+        self.refs.setdefault(url, TAG_FOLDERS[name])
+        path = self.local.get(url)
+        if not path:
+            return tag.group(0)
+        return f'<{tag.group(1)}{attrs[:attr.start(2)]}"{escape(path)}"{attrs[attr.end(2):]}>'
+    
+    def _process(self, final):
+        buffer = self.buffer
+        pos = 0
+        end = len(buffer)
+        while pos < end:
+            if self.state == 'comment':
+                close = buffer.find('-->', pos)
+                if close == -1:
+                    keep = 0 if final else min(2, end - pos)
+                    self.write(buffer[pos:end - keep])
+                    pos = end - keep
+                    break
+                self.write(buffer[pos:close + 3])
+                pos = close + 3
+                self.state = None
+            
+            elif self.state in RAW_TEXT_END:
+                close = RAW_TEXT_END[self.state].search(buffer, pos)
+                if close is None and not final:
+                    if self.state == 'script':
+                        # Script text never changes, so pass it on as it arrives
+                        keep = min(TAIL_LENGTH, end - pos)
+                        self.write(buffer[pos:end - keep])
+                        pos = end - keep
+                    break
+                stop = close.start() if close else end
+                text = buffer[pos:stop]
+                if self.state == 'style':
+                    for url, folder in css_refs(text, self.base_url).items():
+                        self.refs.setdefault(url, folder)
+                    text = rewrite_css(text, self.base_url, self.local)
+                self.write(text)
+                pos = stop
+                self.state = None
+            
+            else:
+                match = INTERESTING_PATTERN.search(buffer, pos)
+                if match is None:
+                    keep = 0 if final else min(TAIL_LENGTH, end - pos)
+                    self.write(buffer[pos:end - keep])
+                    pos = end - keep
+                    break
+                
+                self.write(buffer[pos:match.start()])
+                pos = match.start()
+                if match.group(0) == '<!--':
+                    self.write('<!--')
+                    pos = match.end()
+                    self.state = 'comment'
+                    continue
+                if match.group(1):
+                    # A closing tag; the rest of it is copied as text
+                    self.write(match.group(0))
+                    pos = match.end()
+                    continue
+                
+                tag = TAG_PATTERN.match(buffer, pos)
+                if tag is None:
+                    if not final and end - pos < MAX_TAG_LENGTH:
+                        break  # the rest of the tag has not arrived yet
+                    self.write('<')
+                    pos += 1
+                    continue
+                
+                self.write(self._rewrite_tag(tag) if match.group(2).lower() != 'style' else tag.group(0))
+                pos = tag.end()
+                if match.group(2).lower() in RAW_TEXT_END:
+                    self.state = match.group(2).lower()
+        
+        self.buffer = buffer[pos:]
+
+
+def _feed_file(rewriter, source, head, encoding, chunk_size):
+    """Decode an open page chunk by chunk into a rewriter, starting with the already read head"""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    data = head
+    while data:
+        rewriter.feed(decoder.decode(data))
+        data = source.read(chunk_size)
+    rewriter.feed(decoder.decode(b'', final=True))
+    rewriter.close()
+
+
+def scan_file(source_path, base_url, chunk_size=64 * 1024):
+    """Files a saved page needs, as {absolute url: folder}, found without building a tree"""
+    rewriter = HtmlRewriter(base_url, {}, lambda text: None)
+    with open(source_path, 'rb') as source:
+        head = source.read(1024)
+        _feed_file(rewriter, source, head, sniff_encoding(head), chunk_size)
+    return rewriter.refs
+
+
+def rewrite_file(source_path, output_path, base_url, local, chunk_size=64 * 1024):
+    """Stream source_path to output_path with its asset references pointed at local copies
+    
+    The page keeps its own encoding, so untouched bytes are written back unchanged.
+    """
+    with open(source_path, 'rb') as source:
+        head = source.read(1024)
+        encoding = sniff_encoding(head)
+        with open(output_path, 'w', encoding=encoding, errors='xmlcharrefreplace', newline='') as output:
+            _feed_file(HtmlRewriter(base_url, local, output.write), source, head, encoding, chunk_size)
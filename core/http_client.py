@@ -0,0 +1,245 @@
+"""Shared HTTP client"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx only speaks HTTP/2 when h2 is installed)
+except ImportError:
+    httpx = None
+
+
+class JitteredRetry(Retry):
+    """Retry with exponential backoff plus random jitter, so many clients do not retry in step"""
+    
+    JITTER = 0.5  # up to this fraction of the backoff is added at random
+    
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, backoff * self.JITTER) if backoff else 0
+
+
+class TokenBucket:
+    """Thread-safe byte budget for a global bandwidth limit"""
+    
+    def __init__(self, bytes_per_second=0):
+        self._lock = threading.Lock()
+        self.set_rate(bytes_per_second)
+    
+    def set_rate(self, bytes_per_second):
+        """Change the limit; 0 means unlimited"""
+        with self._lock:
+            self.rate = max(0, int(bytes_per_second))
+            # One second of burst so small reads are never delayed
+            self.capacity = self.rate
+            self.tokens = self.rate
+            self.updated = time.monotonic()
+    
+    def reserve(self, nbytes):
+        """Take nbytes from the budget; returns how many seconds to wait before using them"""
+        if not self.rate:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= nbytes
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+    
+    def consume(self, nbytes):
+        """Wait until nbytes may be transferred"""
+        wait = self.reserve(nbytes)
+        if wait:
+            time.sleep(wait)
+
+
+class _HttpxResponse:
+    """Gives an httpx response the parts of the requests.Response API the launcher uses"""
+    
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.content = response.content
+        self.encoding = response.encoding
+    
+    @property
+    def ok(self):
+        return self.status_code < 400
+    
+    @property
+    def text(self):
+        return self._response.text
+    
+    def json(self):
+        return self._response.json()
+    
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+    
+    def iter_content(self, chunk_size=65536):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+    
+    def close(self):
+        self._response.close()
+
+
+class HttpClient:
+    """One pooled, retrying, rate-limited HTTP client for all launcher traffic
+    
+    Connections are kept alive per host, so each host's TCP/TLS setup is paid once
+    per run. Whole-body requests use HTTP/2 through httpx when it and h2 are
+    installed; streamed requests always go through requests.
+    """
+    
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    
+    # Hosts that serve many small files in parallel get bigger pools
+    HOST_POOL_SIZES = {
+        'https://img.poki.com': 16,
+        'https://poki.com': 12,
+        'https://game-cdn.poki.com': 16,
+    }
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, pool_connections=32, pool_maxsize=8, retries=3, backoff_factor=0.5,
+                 max_bytes_per_second=0, http2=True):
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.bandwidth = TokenBucket(max_bytes_per_second)
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+        
+        retry = JitteredRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': self.USER_AGENT})
+        default_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount('https://', default_adapter)
+        self.session.mount('http://', default_adapter)
+        for prefix, size in self.HOST_POOL_SIZES.items():
+            self.session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=retry))
+        
+        self.http2_client = None
+        if http2 and httpx is not None:
+            # A custom transport owns the connection pool, so the limits go to it, not the client
+            limits = httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                  max_keepalive_connections=pool_connections)
+            self.http2_client = httpx.Client(
+                http2=True,
+                headers={'User-Agent': self.USER_AGENT},
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(http2=True, retries=retries, limits=limits),
+            )
+    
+    @property
+    def http2_enabled(self):
+        """Check whether whole-body requests go over HTTP/2"""
+        return self.http2_client is not None
+    
+    def set_bandwidth_limit(self, bytes_per_second):
+        """Limit total download speed across all requests; 0 for unlimited"""
+        self.bandwidth.set_rate(bytes_per_second)
+    
+    def record(self, url, nbytes=0, seconds=0.0, error=False, request=False):
+        """Add to a host's request metrics"""
+        host = urlparse(url).netloc
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(host, {'requests': 0, 'errors': 0, 'bytes': 0, 'seconds': 0.0})
+            metrics['requests'] += int(request)
+            metrics['errors'] += int(error)
+            metrics['bytes'] += nbytes
+            metrics['seconds'] += seconds
+    
+    def metrics(self):
+        """Per-host request counts, errors, bytes received and time spent"""
+        with self._metrics_lock:
+            return {host: dict(values) for host, values in self._metrics.items()}
+    
+    def request(self, method, url, stream=False, **kwargs):
+        """Send a request; streamed bodies should be read with read() or iter_content()"""
+        started = time.monotonic()
+        try:
+            if self.http2_client is not None and not stream:
+                response = self._request_http2(method, url, **kwargs)
+            else:
+                response = self.session.request(method, url, stream=stream, **kwargs)
+        except requests.RequestException:
+            self.record(url, seconds=time.monotonic() - started, error=True, request=True)
+            raise
+        
+        nbytes = 0 if stream else len(response.content)
+        self.record(url, nbytes, time.monotonic() - started, error=response.status_code >= 400, request=True)
+        if nbytes:
+            self.bandwidth.consume(nbytes)
+        return response
+    
+    def _request_http2(self, method, url, **kwargs):
+        """Send a whole-body request over httpx, mapping its errors onto requests' exceptions"""
+        # Without a timeout argument httpx keeps its default; timeout=None would disable it
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.http2_client.request(method, url, **kwargs)
+            except httpx.TimeoutException as e:
+                raise requests.Timeout(str(e))
+            except httpx.TransportError as e:
+                raise requests.ConnectionError(str(e))
+            if response.status_code not in self.RETRY_STATUSES or method not in ('GET', 'HEAD') or attempt == self.retries:
+                return _HttpxResponse(response)
+            backoff = self.backoff_factor * (2 ** attempt)
+            time.sleep(backoff + random.uniform(0, backoff * JitteredRetry.JITTER))
+    
+    def get(self, url, **kwargs):
+        """Send a GET request"""
+        return self.request('GET', url, **kwargs)
+    
+    def read(self, response, size):
+        """Read up to size bytes from a streamed response, within the bandwidth limit"""
+        chunk = response.raw.read(size, decode_content=True)
+        if chunk:
+            self.bandwidth.consume(len(chunk))
+            self.record(response.url, len(chunk))
+        return chunk
+    
+    def iter_content(self, response, chunk_size=65536):
+        """Iterate over a streamed response, within the bandwidth limit"""
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                self.bandwidth.consume(len(chunk))
+                self.record(response.url, len(chunk))
+                yield chunk
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+        if self.http2_client is not None:
+            self.http2_client.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Get the launcher-wide HTTP client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,94 @@
+"""HTML and CSS parsing for downloaded game pages"""
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.html_rewriter import css_refs, rewrite_css, rewrite_file, scan_file
+
+
+def page_refs(path, base_url):
+    """Files a saved page needs, as {absolute url: folder}; runs in a worker process"""
+    return scan_file(path, base_url)
+
+
+def rewrite_page(source_path, output_path, base_url, local):
+    """Write a saved page with its references pointed at local copies; runs in a worker process"""
+    rewrite_file(source_path, output_path, base_url, local)
+
+
+class PageParser:
+    """Runs page and stylesheet parsing off the event loop, in worker processes for bulk jobs"""
+    
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pool = None
+        self.workers = 1  # processes used by the latest run
+        
+        self.pages = 0
+        self.stylesheets = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self._in_flight = 0
+        self._busy_since = 0.0
+    
+    @staticmethod
+    def backend():
+        """Name of the HTML parser in use"""
+        return 'tokenizer'
+    
+    def start_processes(self):
+        """Parse in a pool of worker processes until stop_processes() is called"""
+        if self.pool is None and self.max_workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            self.workers = self.max_workers
+    
+    def stop_processes(self):
+        """Shut the worker processes down; parsing falls back to a thread"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+    
+    async def _run(self, func, *args):
+        """Run func in the worker pool (or a thread), timing how long parsing is busy"""
+        if self._in_flight == 0:
+            self._busy_since = time.monotonic()
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self.busy_seconds += time.monotonic() - self._busy_since
+    
+    async def page_refs(self, path, base_url):
+        """Files a saved page needs, as {absolute url: folder}"""
+        self.pages += 1
+        self.bytes += os.path.getsize(path)
+        return await self._run(page_refs, path, base_url)
+    
+    async def rewrite_page(self, source_path, output_path, base_url, local):
+        """Write a saved page with its references pointed at local copies"""
+        return await self._run(rewrite_page, source_path, output_path, base_url, local)
+    
+    async def css_refs(self, css, base_url):
+        """Files a stylesheet references, as {absolute url: folder}"""
+        self.stylesheets += 1
+        self.bytes += len(css)
+        return await self._run(css_refs, css, base_url)
+    
+    async def rewrite_css(self, css, base_url, local):
+        """Rewritten stylesheet text"""
+        return await self._run(rewrite_css, css, base_url, local)
+    
+    def stats(self):
+        """Parse throughput so far"""
+        return {
+            'backend': self.backend(),
+            'workers': self.workers,
+            'pages': self.pages,
+            'stylesheets': self.stylesheets,
+            'megabytes': self.bytes / (1024 * 1024),
+            'seconds': self.busy_seconds,
+            'pages_per_second': self.pages / self.busy_seconds if self.busy_seconds else 0.0,
+        }
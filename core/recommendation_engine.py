@@ -0,0 +1,142 @@
+"""Recommendation engine"""
+import heapq
+import math
+from datetime import datetime
+
+
+class RecommendationEngine:
+    """Scores games from play history and preferences"""
+    
+    # Weight of each feature in a game's score; features are normalised to 0..1
+    WEIGHTS = {
+        'unplayed': 3.0,
+        'category_affinity': 2.0,
+        'rating': 1.5,
+        'time_played': 1.0,
+        'streak': 1.0,
+        'recency': 0.5,
+        'content_similarity': 1.5,
+    }
+    
+    # Reason shown for a recommendation, by its strongest feature
+    REASONS = {
+        'unplayed': "🎮 New Game - Try this!",
+        'category_affinity': "⭐ Similar to your favorites",
+        'rating': "🌟 Highly Rated",
+        'time_played': "⏱️ You've played this a lot",
+        'streak': "🔥 On a streak!",
+        'recency': "🕒 Played recently",
+        'content_similarity': "🔗 Like the games you play most",
+    }
+    
+    RECENCY_HALF_LIFE_DAYS = 7
+    TOP_PLAYED_PROFILE_SIZE = 3
+    
+    def __init__(self, game_manager, weights=None, similarity_index=None):
+        self.game_manager = game_manager
+        self.similarity_index = similarity_index
+        self.weights = {**self.WEIGHTS, **(weights or {})}
+        self._scores = None
+        self._cache = {}
+        self._scored_on = None
+        
+        game_manager.subscribe(game_manager.FAVORITE_CHANGED, self.invalidate)
+        game_manager.subscribe(game_manager.STATS_CHANGED, self.invalidate)
+    
+    def invalidate(self, game=None):
+        """Drop cached scores so they are recomputed on next use"""
+        self._scores = None
+        self._cache = {}
+    
+    def _top_played_similarity(self):
+        """Similarity of each game to a profile of the most played games"""
+        if self.similarity_index is None:
+            return {}, set()
+        top_played = heapq.nlargest(
+            self.TOP_PLAYED_PROFILE_SIZE,
+            (game for game in self.game_manager.games if game.play_count > 0),
+            key=lambda game: (game.total_time, game.play_count)
+        )
+        if not top_played:
+            return {}, set()
+        weights = [max(game.total_time, 1) for game in top_played]
+        similarities = self.similarity_index.similarities_to(top_played, weights)
+        return similarities, {game.name for game in top_played}
+    
+    def _features(self, game, favorite_categories, favorite_total, max_time, max_streak, now):
+        """Compute normalised features for a game"""
+        features = {
+            'unplayed': 1.0 if game.play_count == 0 else 0.0,
+            'category_affinity': favorite_categories.get(game.category, 0) / favorite_total if favorite_total else 0.0,
+            'rating': game.rating / 5 if game.rating >= 4 else 0.0,
+            'time_played': game.total_time / max_time if max_time else 0.0,
+            'streak': game.streak / max_streak if max_streak else 0.0,
+            'recency': 0.0,
+        }
+        if game.last_played:
+            days = max((now - game.last_played).total_seconds() / 86400, 0)
+            features['recency'] = math.pow(0.5, days / self.RECENCY_HALF_LIFE_DAYS)
+        return features
+    
+    def _compute_scores(self):
+        """Score every game as {name: (score, reason)}"""
+        games = self.game_manager.games
+        now = datetime.now()
+        
+        favorite_categories = {}
+        favorite_total = 0
+        max_time = 0
+        max_streak = 0
+        for game in games:
+            if game.favorite:
+                favorite_categories[game.category] = favorite_categories.get(game.category, 0) + 1
+                favorite_total += 1
+            max_time = max(max_time, game.total_time)
+            max_streak = max(max_streak, game.streak)
+        
+        similarities, profile_games = self._top_played_similarity()
+        
+        scores = {}
+        for game in games:
+            features = self._features(game, favorite_categories, favorite_total, max_time, max_streak, now)
+            if game.name not in profile_games:
+                features['content_similarity'] = max(similarities.get(game.name, 0.0), 0.0)
+            contributions = {name: value * self.weights.get(name, 0) for name, value in features.items()}
+            score = sum(contributions.values())
+            if score <= 0:
+                continue
+            strongest = max(contributions, key=contributions.get)
+            scores[game.name] = (score, self.REASONS[strongest])
+        return scores
+    
+    def scores(self):
+        """Get {game name: (score, reason)} for all recommendable games"""
+        today = datetime.now().date()
+        if self._scores is None or self._scored_on != today:
+            self._scores = self._compute_scores()
+            self._scored_on = today
+            self._cache = {}
+        return self._scores
+    
+    def get_similar_games(self, game, limit=8):
+        """Get games similar to a game as (reason, game) pairs, best first"""
+        if self.similarity_index is None:
+            return []
+        return [(f"🔗 Similar to {game.name}", similar)
+                for similar, _ in self.similarity_index.similar_to(game, limit=limit)]
+    
+    def get_recommendations(self, limit=14):
+        """Get the top recommendations as (reason, game) pairs, best first"""
+        scores = self.scores()
+        if limit in self._cache:
+            return self._cache[limit]
+        
+        order = {game.name: i for i, game in enumerate(self.game_manager.games)}
+        top = heapq.nlargest(
+            limit,
+            (game for game in self.game_manager.games if game.name in scores),
+            key=lambda game: (scores[game.name][0], -order[game.name])
+        )
+        recommendations = [(scores[game.name][1], game) for game in top]
+        self._cache[limit] = recommendations
+        return recommendations
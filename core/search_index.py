@@ -0,0 +1,283 @@
+"""Search index for the game filter"""
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+
+class SearchIndex:
+    """In-memory inverted index over game names, descriptions, categories and tags"""
+
+    # Relative weight of a hit in each field
+    FIELD_WEIGHTS = {
+        'name': 3.0,
+        'custom_name': 3.0,
+        'tags': 2.0,
+        'category': 1.5,
+        'description': 1.0,
+    }
+
+    # How a query term matched an indexed term
+    EXACT_SCORE = 1.0
+    PREFIX_SCORE = 0.8
+    SUBSTRING_SCORE = 0.6
+    FUZZY_SCORE = 0.4
+
+    NGRAM_SIZE = 3
+    MIN_FUZZY_LENGTH = 4
+    MAX_EDIT_DISTANCE = 2
+    MAX_FUZZY_EXPANSIONS = 64  # per typo variant; plain prefix lookups are never cut short
+    CACHE_SIZE = 256
+
+    _token_re = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, games=None):
+        self._postings = defaultdict(dict)  # term -> {game key: field weight}
+        self._ngrams = defaultdict(set)  # n-gram -> terms containing it
+        self._deletes = defaultdict(set)  # single-character deletion -> terms
+        self._terms = []  # sorted vocabulary for prefix lookups
+        self._doc_terms = {}  # game key -> {term: field weight}
+        self._games = {}  # game key -> game
+        self._cache = {}
+
+        for game in games or []:
+            self.add_game(game)
+
+    @classmethod
+    def tokenize(cls, text):
+        """Split text into normalised search terms"""
+        if not text:
+            return []
+        return cls._token_re.findall(text.lower().replace("'", ""))
+
+    @staticmethod
+    def _key(game):
+        """Stable key for a game"""
+        return game.name
+
+    def _ngrams_of(self, term):
+        """Get the n-grams of a term"""
+        n = self.NGRAM_SIZE
+        return {term[i:i + n] for i in range(len(term) - n + 1)}
+
+    def _document_terms(self, game):
+        """Collect weighted terms for a game"""
+        fields = {
+            'name': game.name,
+            'custom_name': getattr(game, 'custom_name', None),
+            'tags': " ".join(getattr(game, 'tags', None) or []),
+            'category': game.category,
+            'description': game.description,
+        }
+        terms = {}
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for term in self.tokenize(text):
+                if weight > terms.get(term, 0):
+                    terms[term] = weight
+        return terms
+
+    def add_game(self, game):
+        """Index a game (re-indexes it if already present)"""
+        key = self._key(game)
+        if key in self._doc_terms:
+            self.remove_game(game)
+
+        terms = self._document_terms(game)
+        self._doc_terms[key] = terms
+        self._games[key] = game
+
+        for term, weight in terms.items():
+            postings = self._postings[term]
+            if not postings:
+                insort(self._terms, term)
+                for gram in self._ngrams_of(term):
+                    self._ngrams[gram].add(term)
+                for variant in self._deletes_of(term):
+                    self._deletes[variant].add(term)
+            postings[key] = weight
+
+        self._cache.clear()
+
+    def update_game(self, game):
+        """Re-index a game after its name, tags or other text changed"""
+        self.add_game(game)
+
+    def remove_game(self, game):
+        """Remove a game from the index"""
+        key = self._key(game)
+        terms = self._doc_terms.pop(key, None)
+        self._games.pop(key, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+                index = bisect_left(self._terms, term)
+                if index < len(self._terms) and self._terms[index] == term:
+                    del self._terms[index]
+                for gram in self._ngrams_of(term):
+                    grams = self._ngrams.get(gram)
+                    if grams is not None:
+                        grams.discard(term)
+                        if not grams:
+                            del self._ngrams[gram]
+                for variant in self._deletes_of(term):
+                    variants = self._deletes.get(variant)
+                    if variants is not None:
+                        variants.discard(term)
+                        if not variants:
+                            del self._deletes[variant]
+
+        self._cache.clear()
+
+    def rebuild(self, games):
+        """Rebuild the index from scratch"""
+        self._postings.clear()
+        self._ngrams.clear()
+        self._deletes.clear()
+        self._terms = []
+        self._doc_terms.clear()
+        self._games.clear()
+        self._cache.clear()
+        for game in games:
+            self.add_game(game)
+
+    def _prefix_terms(self, prefix, limit=None):
+        """Get indexed terms starting with prefix, at most limit of them"""
+        terms = []
+        index = bisect_left(self._terms, prefix)
+        while index < len(self._terms) and (limit is None or len(terms) < limit):
+            term = self._terms[index]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+            index += 1
+        return terms
+
+    def _substring_terms(self, term):
+        """Get indexed terms containing term, using the n-gram index"""
+        grams = self._ngrams_of(term)
+        if not grams:
+            return []
+        term_sets = sorted((self._ngrams.get(gram, set()) for gram in grams), key=len)
+        candidates = term_sets[0].intersection(*term_sets[1:])
+        return [candidate for candidate in candidates if term in candidate]
+
+    @staticmethod
+    def edit_distance(a, b, max_distance):
+        """Optimal string alignment distance, or max_distance + 1 if it is larger"""
+        if abs(len(a) - len(b)) > max_distance:
+            return max_distance + 1
+
+        previous2 = None
+        previous = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            current = [i] + [0] * len(b)
+            row_min = current[0]
+            for j in range(1, len(b) + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+                if (previous2 is not None and j > 1 and
+                        a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                    current[j] = min(current[j], previous2[j - 2] + 1)
+                row_min = min(row_min, current[j])
+            if row_min > max_distance:
+                return max_distance + 1
+            previous2, previous = previous, current
+        return previous[-1]
+
+    @classmethod
+    def _deletes_of(cls, term):
+        """Get the single-character deletions of a term"""
+        if len(term) < cls.MIN_FUZZY_LENGTH - 1:
+            return set()
+        return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+    def _fuzzy_terms(self, term):
+        """Get indexed terms within MAX_EDIT_DISTANCE of term, or of its prefix"""
+        candidates = set(self._deletes.get(term, ()))
+        prefix_candidates = set()
+        for variant in self._deletes_of(term):
+            if variant in self._postings:
+                candidates.add(variant)
+            candidates.update(self._deletes.get(variant, ()))
+            # The user may still be typing, so also match terms the typo is a prefix of
+            prefix_candidates.update(self._prefix_terms(variant, self.MAX_FUZZY_EXPANSIONS))
+
+        matches = {}
+        for candidate in candidates:
+            distance = self.edit_distance(term, candidate, self.MAX_EDIT_DISTANCE)
+            if 0 < distance <= self.MAX_EDIT_DISTANCE:
+                matches[candidate] = distance
+        for candidate in prefix_candidates - candidates:
+            distance = min(self.edit_distance(term, candidate[:len(term) + extra], 1) for extra in (-1, 0, 1))
+            if 0 < distance <= 1:
+                matches[candidate] = distance + 1
+        return matches
+
+    def _expand_term(self, term):
+        """Map a query term to {indexed term: match score}"""
+        expansions = {}
+        if term in self._postings:
+            expansions[term] = self.EXACT_SCORE
+
+        for candidate in self._prefix_terms(term):
+            expansions.setdefault(candidate, self.PREFIX_SCORE)
+
+        for candidate in self._substring_terms(term):
+            expansions.setdefault(candidate, self.SUBSTRING_SCORE)
+
+        # Typo tolerance only kicks in when the term did not match directly
+        if not expansions and len(term) >= self.MIN_FUZZY_LENGTH:
+            for candidate, distance in self._fuzzy_terms(term).items():
+                expansions[candidate] = self.FUZZY_SCORE / distance
+
+        return expansions
+
+    def scores(self, query):
+        """Score every game matching all terms of query"""
+        query_terms = self.tokenize(query)
+        if not query_terms:
+            return {}
+
+        cache_key = " ".join(query_terms)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        totals = None
+        for query_term in query_terms:
+            # A game can match through several expansions; keep its best one
+            term_scores = {}
+            for term, match_score in self._expand_term(query_term).items():
+                for key, weight in self._postings[term].items():
+                    score = weight * match_score
+                    if score > term_scores.get(key, 0.0):
+                        term_scores[key] = score
+
+            if totals is None:
+                totals = term_scores
+            else:
+                totals = {key: totals[key] + score for key, score in term_scores.items() if key in totals}
+            if not totals:
+                break
+
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[cache_key] = totals
+        return totals
+
+    def search(self, query, limit=None):
+        """Get games matching query, best match first"""
+        scores = self.scores(query)
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._games[key] for key, _ in ranked]
@@ -0,0 +1,60 @@
+"""Play session history"""
+import json
+from datetime import datetime
+from pathlib import Path
+
+
+class SessionLog:
+    """Append-only history of play sessions, one JSON object per line"""
+    
+    FIELDS = ['game', 'category', 'mode', 'started', 'ended', 'duration_seconds']
+    
+    def __init__(self, log_file):
+        self.log_file = Path(log_file)
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.current = None
+    
+    def start(self, game, mode='preview'):
+        """Start a session, ending any session that is still open"""
+        self.end()
+        self.current = {
+            'game': game.name,
+            'category': game.category,
+            'mode': mode,
+            'started': datetime.now(),
+        }
+    
+    def end(self):
+        """End the open session and append it to the log"""
+        if self.current is None:
+            return None
+        session, self.current = self.current, None
+        
+        ended = datetime.now()
+        record = {
+            'game': session['game'],
+            'category': session['category'],
+            'mode': session['mode'],
+            'started': session['started'].isoformat(timespec='seconds'),
+            'ended': ended.isoformat(timespec='seconds'),
+            'duration_seconds': int((ended - session['started']).total_seconds()),
+        }
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Error saving session: {e}")
+        return record
+    
+    def __iter__(self):
+        """Stream logged sessions from disk without loading the whole file"""
+        if not self.log_file.exists():
+            return
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash; skip it
+                    continue
+                yield {field: record.get(field) for field in self.FIELDS}
@@ -1,14 +1,24 @@
 """Settings management"""
 import json
+import os
 from pathlib import Path
 
 
+DATA_DIR_ENV = 'PAPAS_LAUNCHER_HOME'
+
+
+def default_data_dir():
+    """Where settings, game data and the cache live: $PAPAS_LAUNCHER_HOME, else ~/.papas_launcher"""
+    return Path(os.environ.get(DATA_DIR_ENV) or Path.home() / ".papas_launcher")
+
+
 class SettingsManager:
     """Manages application settings"""
     
-    def __init__(self):
-        self.settings_file = Path.home() / ".papas_launcher" / "settings.json"
-        self.settings_file.parent.mkdir(exist_ok=True)
+    def __init__(self, data_dir=None):
+        self.data_dir = Path(data_dir) if data_dir else default_data_dir()
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.settings_file = self.data_dir / "settings.json"
         self.settings = self.load_settings()
     
     def load_settings(self):
@@ -28,7 +38,7 @@ class SettingsManager:
             'user_level': 1,
             'total_xp': 0,
             'download_games_locally': False,  # New setting for local downloads
-            'cache_dir': str(self.settings_file.parent / "cache"),
+            'cache_dir': str(self.data_dir / "cache"),
             'auto_download_on_play': False,  # Auto-download when playing
             'show_notifications': True,  # Show system notifications
             'minimize_to_tray': True,  # Minimize to system tray
@@ -42,7 +52,26 @@ class SettingsManager:
             'compact_mode': False,  # Compact UI mode
             'show_game_preview': True,  # Show game preview in list
             'default_view_mode': 'list',  # Default view mode: list or grid
-            'auto_download_updates': False  # Auto-download updates when available
+            'auto_download_updates': False,  # Auto-download updates when available
+            'block_ads': True,  # Block ad and tracker requests in game pages
+            'adblock_allow': {},  # Per-game hosts never blocked: {game name: [hosts]}, '*' for all
+            'http_cache_type': 'disk',  # Web cache for online games: disk, memory or none
+            'http_cache_size_mb': 1024,  # Maximum web cache size in MB, 0 for automatic
+            'pack_downloaded_games': True,  # Store each downloaded game as one memory-mapped .pack file
+            'decompressed_cache_mb': 64,  # Memory for decompressed files of packed games, 0 to disable
+            'freeze_hidden_games': True,  # Freeze game pages that are not on screen
+            'discard_hidden_after_minutes': 10,  # Unload frozen pages after this long, 0 to keep them
+            'renderer_process_limit': 4,  # Maximum Chromium renderer processes, 0 for no limit
+            'renderer_memory_mb': 1024,  # JavaScript heap limit per renderer in MB, 0 for no limit
+            'preload_games': True,  # Load the selected or hovered game in the background
+            'preload_pages': 1,  # Hidden preloaded pages kept at once
+            'screenshot_format': 'png',  # Screenshot format: png, jpeg or webp
+            'screenshot_quality': 90,  # JPEG/WebP screenshot quality (1-100)
+            'screenshot_burst_count': 5,  # Screenshots per timed capture, 0 until stopped
+            'screenshot_burst_interval_ms': 1000,  # Time between timed screenshots
+            'update_check_ttl_hours': 6,  # Reuse the last update check for this long at startup
+            'update_mirror_url': '',  # Base URL of a GitHub API mirror for update checks, empty for GitHub
+            'max_download_kbps': 0  # Total download speed limit for launcher downloads, 0 for unlimited
         }
         
         try:
@@ -78,7 +107,7 @@ class SettingsManager:
     
     def get_cache_dir(self):
         """Get cache directory path"""
-        cache_dir = Path(self.get('cache_dir', str(self.settings_file.parent / "cache")))
+        cache_dir = Path(self.get('cache_dir', str(self.data_dir / "cache")))
         cache_dir.mkdir(exist_ok=True, parents=True)
         return cache_dir
 
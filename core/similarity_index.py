@@ -0,0 +1,251 @@
+"""Content similarity index for "more like this" recommendations"""
+import hashlib
+import zlib
+from pathlib import Path
+
+from core.search_index import SearchIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SimilarityIndex:
+    """TF-IDF vectors over game descriptions, categories, difficulty and tags"""
+    
+    # Terms are hashed into a fixed number of columns so the matrix never has to
+    # grow sideways as the catalog changes
+    N_FEATURES = 1024
+    
+    FIELD_WEIGHTS = {
+        'description': 1.0,
+        'category': 2.0,
+        'difficulty': 1.0,
+        'tags': 1.5,
+    }
+    
+    STOP_WORDS = {
+        'a', 'an', 'and', 'at', 'for', 'in', 'is', 'it', 'of', 'on', 'or',
+        'the', 'this', 'to', 'with', 'your', 'you',
+    }
+    
+    def __init__(self, index_file=None):
+        self.index_file = Path(index_file) if index_file else None
+        self._keys = []  # row -> game name
+        self._rows = {}  # game name -> row
+        self._fingerprints = {}  # game name -> fingerprint of indexed text
+        self._games = {}  # game name -> game
+        self._tf = np.zeros((0, self.N_FEATURES), dtype=np.float32) if np is not None else None
+        self._matrix = None  # L2-normalised TF-IDF rows, built lazily
+        self._dirty = False
+    
+    @staticmethod
+    def available():
+        """Check whether NumPy is installed"""
+        return np is not None
+    
+    def __len__(self):
+        return len(self._keys)
+    
+    def _fields(self, game):
+        """Get the indexed text of a game by field"""
+        return {
+            'description': game.description or "",
+            'category': game.category or "",
+            'difficulty': game.difficulty or "",
+            'tags': " ".join(getattr(game, 'tags', None) or []),
+        }
+    
+    def _fingerprint(self, fields):
+        """Fingerprint indexed text so unchanged games are not re-tokenized"""
+        text = "\x1f".join(fields[name] for name in sorted(fields))
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def _column(self, field, term):
+        """Hash a field-qualified term into a column"""
+        if field != 'description':
+            term = f"{field}:{term}"
+        return zlib.crc32(term.encode('utf-8')) % self.N_FEATURES
+    
+    def _vectorize(self, fields):
+        """Build the weighted term-frequency row of a game"""
+        row = np.zeros(self.N_FEATURES, dtype=np.float32)
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for term in SearchIndex.tokenize(text):
+                if term not in self.STOP_WORDS:
+                    row[self._column(field, term)] += weight
+        return row
+    
+    def _ensure_capacity(self, rows):
+        """Grow the term-frequency matrix to hold at least rows rows"""
+        capacity = self._tf.shape[0]
+        if rows <= capacity:
+            return
+        grown = np.zeros((max(rows, capacity * 2, 16), self.N_FEATURES), dtype=np.float32)
+        grown[:capacity] = self._tf
+        self._tf = grown
+    
+    def update_games(self, games):
+        """Index new or changed games; returns True if anything changed"""
+        if np is None:
+            return False
+        
+        changed = False
+        for game in games:
+            self._games[game.name] = game
+            fields = self._fields(game)
+            fingerprint = self._fingerprint(fields)
+            if self._fingerprints.get(game.name) == fingerprint:
+                continue
+            
+            row = self._rows.get(game.name)
+            if row is None:
+                row = len(self._keys)
+                self._ensure_capacity(row + 1)
+                self._keys.append(game.name)
+                self._rows[game.name] = row
+            self._tf[row] = self._vectorize(fields)
+            self._fingerprints[game.name] = fingerprint
+            changed = True
+        
+        if changed:
+            self._matrix = None
+            self._dirty = True
+        return changed
+    
+    def update_game(self, game):
+        """Index a new or changed game"""
+        return self.update_games([game])
+    
+    def remove_game(self, game):
+        """Remove a game from the index"""
+        self._remove(game.name)
+    
+    def _remove(self, name):
+        """Remove a game's row by name"""
+        row = self._rows.pop(name, None)
+        self._games.pop(name, None)
+        self._fingerprints.pop(name, None)
+        if row is None:
+            return
+        
+        # Move the last row into the hole to keep rows contiguous
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._tf[row] = self._tf[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._tf[last] = 0
+        self._keys.pop()
+        self._matrix = None
+        self._dirty = True
+    
+    def sync(self, games):
+        """Bring the index in line with the catalog"""
+        if np is None:
+            return False
+        names = {game.name for game in games}
+        removed = [name for name in self._keys if name not in names]
+        for name in removed:
+            self._remove(name)
+        return self.update_games(games) or bool(removed)
+    
+    def _build(self):
+        """Compute the normalised TF-IDF matrix"""
+        count = len(self._keys)
+        tf = self._tf[:count]
+        document_frequency = np.count_nonzero(tf, axis=0)
+        idf = np.log((1 + count) / (1 + document_frequency)) + 1
+        matrix = np.log1p(tf) * idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        self._matrix = (matrix / norms).astype(np.float32)
+    
+    def _top_k(self, similarities, limit, exclude_rows):
+        """Pick the best rows by similarity as (game, score) pairs"""
+        if exclude_rows:
+            similarities[list(exclude_rows)] = -np.inf
+        limit = min(limit, len(similarities))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-similarities, limit - 1)[:limit]
+        top = top[np.argsort(-similarities[top], kind='stable')]
+        return [(self._games[self._keys[row]], float(similarities[row]))
+                for row in top if similarities[row] > 0 and self._keys[row] in self._games]
+    
+    def similarities_to(self, games, weights=None):
+        """Cosine similarity of every indexed game to a weighted profile of games"""
+        if np is None or not self._keys:
+            return {}
+        if self._matrix is None:
+            self._build()
+        
+        rows = [self._rows[game.name] for game in games if game.name in self._rows]
+        if not rows:
+            return {}
+        row_weights = np.ones(len(rows), dtype=np.float32)
+        if weights is not None:
+            row_weights = np.array([weights[i] for i, game in enumerate(games) if game.name in self._rows],
+                                   dtype=np.float32)
+        profile = row_weights @ self._matrix[rows]
+        norm = np.linalg.norm(profile)
+        if norm == 0:
+            return {}
+        similarities = self._matrix @ (profile / norm)
+        return {name: float(similarities[row]) for row, name in enumerate(self._keys)}
+    
+    def similar_to(self, game, limit=5):
+        """Get the games most similar to a game as (game, score) pairs"""
+        return self.similar_to_many([game], limit=limit)
+    
+    def similar_to_many(self, games, limit=5, weights=None):
+        """Get the games most similar to a weighted set of games, excluding them"""
+        similarities = self.similarities_to(games, weights)
+        if not similarities:
+            return []
+        scores = np.array([similarities[name] for name in self._keys], dtype=np.float32)
+        exclude = {self._rows[game.name] for game in games if game.name in self._rows}
+        return self._top_k(scores, limit, exclude)
+    
+    def load(self):
+        """Load a previously saved index"""
+        if np is None or not self.index_file or not self.index_file.exists():
+            return False
+        try:
+            with np.load(self.index_file, allow_pickle=False) as data:
+                tf = data['tf']
+                if tf.shape[1] != self.N_FEATURES:
+                    return False
+                self._keys = [str(name) for name in data['keys']]
+                self._fingerprints = dict(zip(self._keys, (str(fp) for fp in data['fingerprints'])))
+                self._rows = {name: row for row, name in enumerate(self._keys)}
+                self._tf = np.zeros((max(len(self._keys), 16), self.N_FEATURES), dtype=np.float32)
+                self._tf[:len(self._keys)] = tf
+            self._matrix = None
+            self._dirty = False
+            return True
+        except Exception as e:
+            print(f"Similarity index load error: {e}")
+            return False
+    
+    def save(self):
+        """Save the index if it changed since it was loaded"""
+        if np is None or not self.index_file or not self._dirty:
+            return
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.index_file.with_suffix('.tmp.npz')
+            np.savez_compressed(
+                temp_file,
+                tf=self._tf[:len(self._keys)],
+                keys=np.array(self._keys, dtype=str),
+                fingerprints=np.array([self._fingerprints[name] for name in self._keys], dtype=str),
+            )
+            temp_file.replace(self.index_file)
+            self._dirty = False
+        except Exception as e:
+            print(f"Similarity index save error: {e}")
+
@@ -0,0 +1,186 @@
+"""Startup timeline: spans and module import times, written as a Chrome trace"""
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+
+ENV_VAR = 'PAPAS_PROFILE_STARTUP'  # an output path, or 1 for the default
+FLAG = '--profile-startup'  # --profile-startup or --profile-startup=<path>
+DEFAULT_OUTPUT = 'startup-trace.json'
+
+
+class _ImportTimer:
+    """Meta path finder that times every module import, like python -X importtime
+    
+    It finds nothing itself: it asks the finders after it and wraps the loader's
+    exec_module, so nested imports become nested spans in the trace.
+    """
+    
+    def __init__(self, profiler):
+        self.profiler = profiler
+    
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            # Another profiler's timer would ask this one back, forever
+            if isinstance(finder, _ImportTimer) or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        
+        loader = spec.loader
+        # Built-in and frozen importers are classes shared by every such module; they are fast anyway
+        if loader is None or isinstance(loader, type) or not hasattr(loader, 'exec_module'):
+            return spec
+        if not getattr(loader.exec_module, '_timed', False):
+            exec_module = loader.exec_module
+            
+            def timed_exec_module(module):
+                with self.profiler.span(module.__name__, cat='import'):
+                    exec_module(module)
+            
+            timed_exec_module._timed = True
+            try:
+                loader.exec_module = timed_exec_module
+            except AttributeError:
+                pass  # loaders with __slots__ go untimed
+        return spec
+
+
+class StartupProfiler:
+    """Collects trace events until finish() writes them for chrome://tracing or Perfetto
+    
+    Disabled unless configure() finds the environment variable or the command-line
+    flag; while disabled every call is a cheap no-op.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self.events = []
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._open = set()  # ids of spans started with begin() and not yet ended
+        self._finish_requested = False
+        self._import_timer = None
+    
+    def configure(self, argv):
+        """Turn profiling on if asked to; returns argv without the profiler's flag"""
+        output = os.environ.get(ENV_VAR)
+        remaining = []
+        for arg in argv:
+            if arg == FLAG:
+                output = output or '1'
+            elif arg.startswith(FLAG + '='):
+                output = arg.split('=', 1)[1]
+            else:
+                remaining.append(arg)
+        if output and output != '0':
+            self.enable(DEFAULT_OUTPUT if output == '1' else output)
+        return remaining
+    
+    def enable(self, output, imports=True):
+        """Start recording; output is where finish() writes the trace"""
+        self.enabled = True
+        self.output = Path(output)
+        self.events.append({'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': threading.get_ident(),
+                            'args': {'name': 'main'}})
+        if imports and self._import_timer is None:
+            self._import_timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+    
+    @staticmethod
+    def _now():
+        return time.perf_counter() * 1e6  # trace timestamps are in microseconds
+    
+    def _add(self, event):
+        event.setdefault('pid', self._pid)
+        event.setdefault('tid', threading.get_ident())
+        with self._lock:
+            self.events.append(event)
+    
+    def span(self, name, cat='startup', **args):
+        """Context manager recording how long its block takes"""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, cat, args)
+    
+    @contextmanager
+    def _span(self, name, cat, args):
+        start = self._now()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self._add({'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': self._now() - start,
+                           'args': args})
+    
+    def begin(self, name, cat='async'):
+        """Start a span that ends in a callback; returns a token for end(), or None when disabled"""
+        if not self.enabled:
+            return None
+        span_id = next(self._ids)
+        self._open.add(span_id)
+        self._add({'name': name, 'cat': cat, 'ph': 'b', 'id': span_id, 'ts': self._now()})
+        return (name, cat, span_id)
+    
+    def end(self, token):
+        """End a span started with begin()"""
+        if token is None or not self.enabled:
+            return
+        name, cat, span_id = token
+        if span_id not in self._open:
+            return
+        self._open.discard(span_id)
+        self._add({'name': name, 'cat': cat, 'ph': 'e', 'id': span_id, 'ts': self._now()})
+        if self._finish_requested and not self._open:
+            self.finish()
+    
+    def mark(self, name):
+        """Record an instant, e.g. the first frame"""
+        if self.enabled:
+            self._add({'name': name, 'cat': 'startup', 'ph': 'i', 's': 'p', 'ts': self._now()})
+    
+    def request_finish(self):
+        """Finish as soon as every begin() span has ended"""
+        self._finish_requested = True
+        if self.enabled and not self._open:
+            self.finish()
+    
+    def finish(self):
+        """Stop recording and write the trace"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self._import_timer is not None and self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+        with self._lock:
+            events = list(self.events)
+        try:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.output, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            print(f"Startup trace written to {self.output.resolve()}")
+        except Exception as e:
+            print(f"Error writing startup trace: {e}")
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_startup_profiler():
+    """Get the launcher-wide startup profiler"""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = StartupProfiler()
+        return _profiler
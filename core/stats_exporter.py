@@ -0,0 +1,187 @@
+"""Streaming export of play statistics"""
+import csv
+import json
+import os
+import zipfile
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+class StatsExporter:
+    """Writes session history or per-game totals in chunks, so memory use stays flat"""
+    
+    SESSION_FIELDS = ['game', 'category', 'mode', 'started', 'ended', 'duration_seconds']
+    GAME_FIELDS = ['game', 'category', 'difficulty', 'plays', 'total_minutes', 'rating', 'favorite', 'streak']
+    
+    # format -> file extension
+    FORMATS = {
+        'csv': 'csv',
+        'jsonl': 'jsonl',
+        'parquet': 'parquet',
+        'npz': 'npz',
+    }
+    
+    CHUNK_SIZE = 50000
+    
+    def __init__(self, sessions, games=()):
+        self.sessions = sessions  # re-iterable source of session dicts, e.g. a SessionLog
+        self.games = games
+    
+    @classmethod
+    def available_formats(cls):
+        """Get the formats that can be written with the installed libraries"""
+        formats = ['csv', 'jsonl']
+        if pq is not None:
+            formats.append('parquet')
+        if np is not None:
+            formats.append('npz')
+        return formats
+    
+    def game_rows(self):
+        """Per-game totals as rows"""
+        for game in self.games:
+            yield {
+                'game': game.name,
+                'category': game.category,
+                'difficulty': game.difficulty,
+                'plays': game.play_count,
+                'total_minutes': game.total_time // 60,
+                'rating': game.rating,
+                'favorite': game.favorite,
+                'streak': game.streak,
+            }
+    
+    @staticmethod
+    def _chunks(rows, size):
+        """Split a row stream into lists of at most size rows"""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                return
+            yield chunk
+    
+    def export(self, path, fmt='csv', what='sessions', progress=None, is_cancelled=None):
+        """Export sessions or game totals to path; returns the number of rows written
+        
+        progress is called with the running row count after every chunk, and the
+        export stops early (leaving no file behind) once is_cancelled returns True.
+        """
+        if fmt not in self.available_formats():
+            raise ValueError(f"Export format not available: {fmt}")
+        
+        if what == 'games':
+            rows, fields = self.game_rows(), self.GAME_FIELDS
+        else:
+            rows, fields = iter(self.sessions), self.SESSION_FIELDS
+        
+        writer = getattr(self, f"_write_{fmt}")
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        try:
+            written = writer(temp_path, fields, self._chunks(rows, self.CHUNK_SIZE), progress, is_cancelled)
+            if written is None:
+                temp_path.unlink(missing_ok=True)
+                return 0
+            os.replace(temp_path, path)
+            return written
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def _step(written, progress, is_cancelled):
+        """Report progress; returns False if the export was cancelled"""
+        if progress is not None:
+            progress(written)
+        return not (is_cancelled is not None and is_cancelled())
+    
+    def _write_csv(self, path, fields, chunks, progress, is_cancelled):
+        written = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for chunk in chunks:
+                writer.writerows(chunk)
+                written += len(chunk)
+                if not self._step(written, progress, is_cancelled):
+                    return None
+        return written
+    
+    def _write_jsonl(self, path, fields, chunks, progress, is_cancelled):
+        written = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.writelines(json.dumps(row) + "\n" for row in chunk)
+                written += len(chunk)
+                if not self._step(written, progress, is_cancelled):
+                    return None
+        return written
+    
+    def _arrow_schema(self, fields):
+        """Arrow column types for the exported fields"""
+        types = {
+            'started': pa.timestamp('s'),
+            'ended': pa.timestamp('s'),
+            'duration_seconds': pa.int64(),
+            'plays': pa.int64(),
+            'total_minutes': pa.int64(),
+            'rating': pa.int64(),
+            'favorite': pa.bool_(),
+            'streak': pa.int64(),
+        }
+        return pa.schema([(field, types.get(field, pa.string())) for field in fields])
+    
+    def _write_parquet(self, path, fields, chunks, progress, is_cancelled):
+        schema = self._arrow_schema(fields)
+        written = 0
+        with pq.ParquetWriter(str(path), schema, compression='zstd') as writer:
+            for chunk in chunks:
+                columns = {field: [row.get(field) for row in chunk] for field in fields}
+                for field in ('started', 'ended'):
+                    if field in columns:
+                        columns[field] = [datetime.fromisoformat(value) if value else None
+                                          for value in columns[field]]
+                writer.write_table(pa.table(columns, schema=schema))
+                written += len(chunk)
+                if not self._step(written, progress, is_cancelled):
+                    return None
+        return written
+    
+    def _numpy_column(self, field, values):
+        """Convert one column of a chunk to a NumPy array"""
+        if field in ('started', 'ended'):
+            return np.array([value or 'NaT' for value in values], dtype='datetime64[s]')
+        if field == 'favorite':
+            return np.array(values, dtype=bool)
+        if field in ('duration_seconds', 'plays', 'total_minutes', 'rating', 'streak'):
+            return np.array([value or 0 for value in values], dtype=np.int64)
+        return np.array([value or '' for value in values], dtype=str)
+    
+    def _write_npz(self, path, fields, chunks, progress, is_cancelled):
+        # np.savez_compressed needs every array in memory, so write the same zip
+        # layout one chunk at a time; np.load(path) gives arrays named <field>_<chunk>
+        written = 0
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for index, chunk in enumerate(chunks):
+                for field in fields:
+                    array = self._numpy_column(field, [row.get(field) for row in chunk])
+                    with archive.open(f"{field}_{index:05d}.npy", 'w', force_zip64=True) as member:
+                        np.lib.format.write_array(member, array, allow_pickle=False)
+                written += len(chunk)
+                if not self._step(written, progress, is_cancelled):
+                    return None
+        return written
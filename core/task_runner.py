@@ -0,0 +1,92 @@
+"""Background jobs without Qt: futures with progress callbacks and cooperative cancellation"""
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+
+class InlineExecutor(Executor):
+    """Runs each job immediately in the calling thread, e.g. for scripts, tests and benchmarks"""
+    
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class Task:
+    """A submitted job: its future, plus progress reporting and a cancel flag the job polls"""
+    
+    def __init__(self, on_progress=None):
+        self.future = None
+        self._cancelled = threading.Event()
+        self._progress_callbacks = [on_progress] if on_progress else []
+    
+    def report(self, *args):
+        """Pass progress from the job to every progress callback"""
+        for callback in list(self._progress_callbacks):
+            callback(*args)
+    
+    def cancel(self):
+        """Ask the job to stop; one that has not started yet never will"""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+    
+    def is_cancelled(self):
+        """Check whether cancel() was called"""
+        return self._cancelled.is_set()
+    
+    def add_progress_callback(self, callback):
+        """Call callback(*args) whenever the job reports progress"""
+        self._progress_callbacks.append(callback)
+    
+    def add_done_callback(self, callback):
+        """Call callback(task) once the job finishes, straight away if it already has"""
+        self.future.add_done_callback(lambda future: callback(self))
+    
+    def running(self):
+        """Check whether the job is queued or running"""
+        return self.future is not None and not self.future.done()
+    
+    def result(self, timeout=None):
+        """The job's return value, waiting for it; re-raises its exception"""
+        return self.future.result(timeout)
+
+
+class TaskRunner:
+    """Runs jobs on a pluggable executor
+    
+    Jobs follow the same contract as StatsExporter.export: they take progress and
+    is_cancelled keyword arguments, call progress(...) as they go and return early
+    once is_cancelled() is true.
+    """
+    
+    def __init__(self, executor=None, max_workers=4):
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+    
+    def submit(self, func, *args, on_progress=None, on_done=None, **kwargs):
+        """Start func(*args, progress=..., is_cancelled=..., **kwargs); returns its Task"""
+        task = Task(on_progress)
+        task.future = self.executor.submit(func, *args, progress=task.report, is_cancelled=task.is_cancelled, **kwargs)
+        if on_done:
+            task.add_done_callback(on_done)
+        return task
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        """Stop the executor; with cancel_futures, jobs that have not started never will"""
+        self.executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_task_runner():
+    """Get the launcher-wide task runner"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = TaskRunner()
+        return _runner
@@ -0,0 +1,321 @@
+"""Update checks and update downloads, without Qt"""
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import requests
+
+from core.http_client import get_http_client
+
+
+class UpdateService:
+    """Asks GitHub (or a mirror of its API) for the latest release"""
+    
+    DEFAULT_API_BASE = "https://api.github.com"
+    
+    def __init__(self, current_version, repo_url, cache_file=None, ttl_hours=6, api_base_url=None, use_cache=True,
+                 connectivity=None):
+        self.current_version = current_version
+        self.repo_url = repo_url
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl_seconds = ttl_hours * 3600
+        # A mirror that serves the same /repos/<owner>/<repo>/releases/latest API
+        self.api_base_url = (api_base_url or self.DEFAULT_API_BASE).rstrip('/')
+        self.use_cache = use_cache
+        self.connectivity = connectivity  # optional ConnectivityMonitor
+    
+    def load_cache(self):
+        """Load the cached release response"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    
+    def save_cache(self, cache):
+        """Save the release response cache"""
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            print(f"Error saving update cache: {e}")
+    
+    def fetch_latest_release(self, api_url):
+        """Get the latest release, from the cache within the TTL or with a conditional request"""
+        cache = self.load_cache()
+        if cache.get('url') != api_url:
+            cache = {}
+        
+        if self.use_cache and cache.get('data') and time.time() - cache.get('checked_at', 0) < self.ttl_seconds:
+            return cache['data']
+        if self.connectivity is not None and not self.connectivity.is_online():
+            # Offline: the last known release is the best answer, however old
+            return cache.get('data')
+        
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cache.get('etag') and cache.get('data'):
+            headers['If-None-Match'] = cache['etag']
+        try:
+            response = get_http_client().get(api_url, headers=headers, timeout=10)
+        except (requests.ConnectionError, requests.Timeout):
+            if self.connectivity is not None:
+                self.connectivity.report_failure()
+            return cache.get('data')
+        if self.connectivity is not None:
+            self.connectivity.report_success()
+        
+        if response.status_code == 304:
+            # Unchanged; GitHub does not count this against the rate limit
+            data = cache['data']
+        elif response.status_code == 200:
+            data = response.json()
+            cache['etag'] = response.headers.get('ETag')
+        else:
+            # E.g. 403 when rate limited; the last known release is still the best answer
+            return cache.get('data')
+        
+        cache.update({'url': api_url, 'checked_at': time.time(), 'data': data})
+        self.save_cache(cache)
+        return data
+    
+    def compare_versions(self, v1, v2):
+        """Compare two version strings properly"""
+        try:
+            # Try using packaging library if available
+            try:
+                from packaging import version
+                return version.parse(v1) > version.parse(v2)
+            except ImportError:
+                pass
+            
+            # Fallback to manual comparison
+            v1_parts = [int(x) for x in v1.split('.')]
+            v2_parts = [int(x) for x in v2.split('.')]
+            # Pad shorter version with zeros
+            max_len = max(len(v1_parts), len(v2_parts))
+            v1_parts.extend([0] * (max_len - len(v1_parts)))
+            v2_parts.extend([0] * (max_len - len(v2_parts)))
+            return v1_parts > v2_parts
+        except:
+            # Last resort: string comparison
+            return v1 > v2
+    
+    def check(self, progress=None, is_cancelled=None):
+        """Look for a newer release; returns (version, release page url, release data), or None"""
+        parts = self.repo_url.replace("https://github.com/", "").split("/")
+        if len(parts) < 2:
+            return None
+        api_url = f"{self.api_base_url}/repos/{parts[0]}/{parts[1]}/releases/latest"
+        data = self.fetch_latest_release(api_url)
+        if not data:
+            return None
+        
+        latest_version = data.get('tag_name', '').replace('v', '').replace('V', '')
+        current_version = self.current_version.replace('v', '').replace('V', '')
+        # Properly compare versions
+        if latest_version and self.compare_versions(latest_version, current_version):
+            return latest_version, data.get('html_url', ''), data
+        return None
+
+
+class FileDownload:
+    """Resumable, checksum-verified download of one file"""
+    
+    MIN_CHUNK_SIZE = 64 * 1024
+    MAX_CHUNK_SIZE = 4 * 1024 * 1024
+    TARGET_CHUNK_SECONDS = 0.1  # grow or shrink chunks to take about this long to read
+    PROGRESS_INTERVAL = 0.05  # seconds between progress reports, so a GUI is never flooded
+    
+    def __init__(self, url, destination_path, expected_sha256=None, checksum_url=None, version=None):
+        self.url = url
+        self.destination_path = Path(destination_path)
+        # Partial data is kept here so an interrupted download can resume; assets keep their
+        # name across releases, so the version is part of the name
+        suffix = f".{version}.part" if version else ".part"
+        self.part_path = self.destination_path.with_name(self.destination_path.name + suffix)
+        # The validator (ETag or Last-Modified) and size of the partial data, for If-Range
+        self.state_path = self.part_path.with_name(self.part_path.name + ".json")
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.checksum_url = checksum_url
+        self.http = get_http_client()
+    
+    @staticmethod
+    def checksum_for_asset(assets, asset):
+        """Find where a release asset's SHA-256 is published
+        
+        Returns (sha256, checksum_url): GitHub's ``digest`` field if present, else the
+        URL of a matching ``<name>.sha256`` or ``SHA256SUMS`` asset, else (None, None).
+        """
+        digest = asset.get('digest') or ''
+        if digest.lower().startswith('sha256:'):
+            return digest.split(':', 1)[1], None
+        
+        name = asset.get('name', '')
+        by_name = {a.get('name', ''): a.get('browser_download_url') for a in assets}
+        for candidate in (f"{name}.sha256", "SHA256SUMS", "SHA256SUMS.txt", "checksums.txt"):
+            if by_name.get(candidate):
+                return None, by_name[candidate]
+        return None, None
+    
+    def fetch_expected_sha256(self):
+        """Read the expected hash for this file from the checksum URL"""
+        response = self.http.get(self.checksum_url, timeout=30)
+        response.raise_for_status()
+        name = self.destination_path.name
+        for line in response.text.splitlines():
+            parts = line.split()
+            if not parts:
+                continue
+            # "<hash>  <name>", "<hash> *<name>", or a file holding just the hash
+            if len(parts) == 1 or parts[-1].lstrip('*') == name:
+                return parts[0].lower()
+        raise ValueError(f"No checksum for {name} in {self.checksum_url}")
+    
+    def load_state(self):
+        """Validator and total size saved with the partial data, or {}"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    
+    def save_state(self, response, total_size):
+        """Remember what the partial data belongs to, so a resume can ask for the same file"""
+        etag = response.headers.get('ETag')
+        # If-Range only accepts strong ETags
+        validator = etag if etag and not etag.startswith('W/') else response.headers.get('Last-Modified')
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump({'url': self.url, 'validator': validator, 'total': total_size}, f)
+    
+    def discard_partial(self):
+        """Delete the partial data and its state"""
+        self.part_path.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+    
+    def remove_stale_parts(self):
+        """Delete partial downloads of other versions of this file"""
+        prefix = self.destination_path.name + "."
+        for path in self.destination_path.parent.glob(glob.escape(prefix) + "*part*"):
+            if path not in (self.part_path, self.state_path):
+                path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def content_range(response):
+        """(first byte, total size or None) of a 206 response, or None if it has no usable Content-Range"""
+        match = re.fullmatch(r'bytes (\d+)-\d+/(\d+|\*)', response.headers.get('Content-Range', '').strip())
+        if not match:
+            return None
+        return int(match.group(1)), None if match.group(2) == '*' else int(match.group(2))
+    
+    def _hash_existing(self, sha256):
+        """Feed the already downloaded part into the hash; returns its size"""
+        size = 0
+        with open(self.part_path, 'rb') as f:
+            while True:
+                block = f.read(self.MAX_CHUNK_SIZE)
+                if not block:
+                    return size
+                sha256.update(block)
+                size += len(block)
+    
+    def run(self, progress=None, is_cancelled=None):
+        """Download the file, calling progress(downloaded, total) as it goes
+        
+        Returns the destination path, or None if cancelled; the partial file is kept
+        so the next run resumes. Raises on errors and checksum mismatches.
+        """
+        progress = progress or (lambda downloaded, total: None)
+        is_cancelled = is_cancelled or (lambda: False)
+        self.destination_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.checksum_url and not self.expected_sha256:
+            self.expected_sha256 = self.fetch_expected_sha256()
+        
+        self.remove_stale_parts()
+        
+        sha256 = hashlib.sha256()
+        downloaded = 0
+        response = None
+        state = self.load_state()
+        if self.part_path.exists() and state.get('url') == self.url and state.get('validator'):
+            downloaded = self._hash_existing(sha256)
+            # If-Range: the server sends the rest only if the file is still the one we started on
+            headers = {'Range': f'bytes={downloaded}-', 'If-Range': state['validator']}
+            response = self.http.get(self.url, stream=True, timeout=30, headers=headers)
+            content_range = self.content_range(response) if response.status_code == 206 else None
+            if content_range and content_range[0] == downloaded:
+                total_size = content_range[1] or state.get('total') or 0
+            elif response.status_code == 200:
+                # The file changed (or ranges are unsupported): this is the whole new file
+                sha256 = hashlib.sha256()
+                downloaded = 0
+            else:
+                # Including 416: the part file does not fit the file on the server, so start again
+                response.close()
+                response = None
+        
+        if response is None or downloaded == 0:
+            if response is None:
+                self.discard_partial()
+                sha256 = hashlib.sha256()
+                downloaded = 0
+                response = self.http.get(self.url, stream=True, timeout=30)
+            response.raise_for_status()
+            total_size = int(response.headers.get('content-length', 0))
+            self.save_state(response, total_size)
+        
+        chunk_size = self.MIN_CHUNK_SIZE
+        last_progress = 0
+        with open(self.part_path, 'ab' if downloaded else 'wb') as f:
+            while True:
+                if is_cancelled():
+                    response.close()
+                    return None
+                
+                started = time.monotonic()
+                chunk = self.http.read(response, chunk_size)
+                if not chunk:
+                    break
+                elapsed = time.monotonic() - started
+                
+                f.write(chunk)
+                sha256.update(chunk)
+                downloaded += len(chunk)
+                
+                # Bigger chunks on fast links, smaller ones on slow links
+                if elapsed < self.TARGET_CHUNK_SECONDS / 2:
+                    chunk_size = min(chunk_size * 2, self.MAX_CHUNK_SIZE)
+                elif elapsed > self.TARGET_CHUNK_SECONDS * 2:
+                    chunk_size = max(chunk_size // 2, self.MIN_CHUNK_SIZE)
+                
+                now = time.monotonic()
+                if now - last_progress >= self.PROGRESS_INTERVAL:
+                    last_progress = now
+                    progress(downloaded, total_size)
+        
+        progress(downloaded, total_size or downloaded)
+        
+        if total_size and downloaded < total_size:
+            # The connection dropped; the part file is kept so the next run resumes
+            raise IOError(f"Download ended early ({downloaded:,} of {total_size:,} bytes); try again to resume")
+        if total_size and downloaded > total_size:
+            self.discard_partial()
+            raise ValueError("Size mismatch: the downloaded file is corrupt")
+        if self.expected_sha256 and sha256.hexdigest() != self.expected_sha256:
+            # Corrupt data must not be resumed from
+            self.discard_partial()
+            raise ValueError("Checksum mismatch: the downloaded file is corrupt")
+        
+        os.replace(self.part_path, self.destination_path)
+        self.state_path.unlink(missing_ok=True)
+        return str(self.destination_path)
@@ -0,0 +1,183 @@
+"""Ad and tracker URL filter"""
+from collections import deque
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+# Third-party ad and analytics hosts; subdomains are blocked too
+DEFAULT_BLOCKED_HOSTS = [
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'googletagservices.com',
+    'googletagmanager.com',
+    'google-analytics.com',
+    'adservice.google.com',
+    'amazon-adsystem.com',
+    'adnxs.com',
+    'criteo.com',
+    'criteo.net',
+    'pubmatic.com',
+    'rubiconproject.com',
+    'openx.net',
+    'casalemedia.com',
+    'taboola.com',
+    'outbrain.com',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'moatads.com',
+    'hotjar.com',
+    'adsrvr.org',
+]
+
+# URL fragments that identify ad and analytics requests on any host
+DEFAULT_BLOCKED_PATTERNS = [
+    '/pagead/',
+    '/adserver/',
+    '/ads/ad',
+    'prebid',
+    '/gpt.js',
+    '/gtag/js',
+    '/analytics.js',
+    '/ga.js',
+    'pixel.gif',
+    '/beacon?',
+]
+
+
+class _PatternMatcher:
+    """Aho-Corasick automaton for finding any of many substrings in one pass"""
+    
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [False]
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+    
+    def _add(self, pattern):
+        """Add a pattern to the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(False)
+            state = next_state
+        self._output[state] = True
+    
+    def _link(self):
+        """Compute failure links breadth-first"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] or self._output[self._fail[next_state]]
+    
+    def search(self, text):
+        """Check whether text contains any pattern"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+        return False
+
+
+class UrlFilter:
+    """Decides which requests to block, with per-game allow overrides"""
+    
+    def __init__(self, blocked_hosts=None, blocked_patterns=None, allowed_hosts=None, allowed_patterns=None):
+        self.blocked_hosts = set(DEFAULT_BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts)
+        self.allowed_hosts = set(allowed_hosts or [])
+        self.blocked_patterns = list(DEFAULT_BLOCKED_PATTERNS if blocked_patterns is None else blocked_patterns)
+        self.allowed_patterns = list(allowed_patterns or [])
+        self._matcher = _PatternMatcher(self.blocked_patterns)
+        self._allow_matcher = _PatternMatcher(self.allowed_patterns) if self.allowed_patterns else None
+        self.game_overrides = {}  # game name -> hosts allowed while that game is loaded
+    
+    @classmethod
+    def from_file(cls, path):
+        """Build a filter from the defaults plus a filter list file
+        
+        Lines may be a host (``example.com`` or ``||example.com^``) or a URL
+        fragment containing ``/`` (``||example.com/ads/``); either becomes an
+        allow rule when prefixed with ``@@``. Lines starting with ``!`` or ``#``
+        are comments.
+        """
+        hosts = list(DEFAULT_BLOCKED_HOSTS)
+        patterns = list(DEFAULT_BLOCKED_PATTERNS)
+        allowed = []
+        allowed_patterns = []
+        path = Path(path) if path else None
+        if path and path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip().lower()
+                    if not line or line[0] in '!#':
+                        continue
+                    allow = line.startswith('@@')
+                    if allow:
+                        line = line[2:]
+                    if line.startswith('||'):
+                        line = line[2:].rstrip('^')
+                    if '/' in line or '?' in line:
+                        (allowed_patterns if allow else patterns).append(line)
+                    elif allow:
+                        allowed.append(line)
+                    else:
+                        hosts.append(line)
+        return cls(hosts, patterns, allowed, allowed_patterns)
+    
+    def set_game_overrides(self, overrides):
+        """Set {game name: [hosts]} that are never blocked while that game is loaded
+        
+        A host of ``*`` turns blocking off entirely for that game.
+        """
+        self.game_overrides = {name: set(hosts) for name, hosts in (overrides or {}).items()}
+    
+    @staticmethod
+    def _host_suffixes(host):
+        """Yield a host and each of its parent domains"""
+        while host:
+            yield host
+            dot = host.find('.')
+            if dot < 0:
+                return
+            host = host[dot + 1:]
+    
+    def should_block(self, url, game_name=None):
+        """Check whether a request URL should be blocked"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https', 'ws', 'wss'):
+            return False
+        host = (parts.hostname or '').lower()
+        
+        overrides = self.game_overrides.get(game_name) if game_name else None
+        if overrides and '*' in overrides:
+            return False
+        for suffix in self._host_suffixes(host):
+            if suffix in self.allowed_hosts or (overrides and suffix in overrides):
+                return False
+        url = url.lower()
+        if self._allow_matcher is not None and self._allow_matcher.search(url):
+            return False
+        for suffix in self._host_suffixes(host):
+            if suffix in self.blocked_hosts:
+                return True
+        
+        return self._matcher.search(url)
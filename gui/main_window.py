@@ -1,9 +1,10 @@
 """Main window for the game launcher"""
 import sys
+import bisect
 import random
 import webbrowser
-import requests
 from datetime import datetime
+from html import escape as html_escape
 from pathlib import Path
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QListWidget, QListWidgetItem, QPushButton, QLabel, 
@@ -12,26 +13,55 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTableWidget, QTableWidgetItem, QHeaderView, QFrame,
                              QSlider, QSystemTrayIcon, QMenu, QScrollArea,
                              QFileDialog, QGroupBox, QSpinBox)
-from PyQt6.QtCore import Qt, QUrl, QSize, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QUrl, QSize, QTimer, QEvent, pyqtSignal
 from PyQt6.QtGui import QPixmap, QIcon, QColor, QFont, QAction, QShortcut, QKeySequence
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply, QNetworkDiskCache
 
 from core.settings_manager import SettingsManager
 from core.game_manager import GameManager
 from core.achievement_manager import AchievementManager
 from core.download_manager import DownloadManager
+from core.search_index import SearchIndex
+from core.recommendation_engine import RecommendationEngine
+from core.similarity_index import SimilarityIndex
+from core.startup_profiler import get_startup_profiler
+from core.url_filter import UrlFilter
+from core.session_log import SessionLog
+from core.stats_exporter import StatsExporter
+from core.connectivity import ConnectivityMonitor
+from core.http_client import get_http_client
+from core.game_pack import PACK_EXTENSION
+from core.task_runner import get_task_runner
 from gui.tabs.games_tab import GamesTab
 from gui.widgets.fullscreen_game_window import FullscreenGameWindow
+from gui.web.request_interceptor import AdBlockInterceptor
+from gui.web.profile import GameWebProfile
+from gui.web.lifecycle import PageLifecycleManager
+from gui.web.preloader import GamePreloader
+from gui.web.pack_scheme import PACK_SCHEME, PackSchemeHandler
 from utils.update_checker import UpdateChecker
 from utils.update_checker import UpdateChecker
 from utils.daily_challenge_generator import DailyChallengeGenerator
 from utils.downloader import FileDownloader
+from utils.screenshot_capture import ScreenshotCapture
+from utils.stats_export_worker import StatsExportWorker
+from utils.cache_check_worker import CacheCheckWorker
+from utils.connectivity_watcher import ConnectivityWatcher
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Reply errors that mean the network itself is unreachable
+    CONNECTION_ERRORS = (
+        QNetworkReply.NetworkError.HostNotFoundError,
+        QNetworkReply.NetworkError.TimeoutError,
+        QNetworkReply.NetworkError.TemporaryNetworkFailureError,
+        QNetworkReply.NetworkError.NetworkSessionFailedError,
+        QNetworkReply.NetworkError.UnknownNetworkError,
+    )
+    
     def __init__(self):
         super().__init__()
         
@@ -42,11 +72,35 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(f"🎮 Papa's Games Launcher v{self.version}")
         self.setGeometry(100, 100, 1700, 1000)
         
+        # Startup phases are timed when the launcher runs with --profile-startup
+        self.profiler = get_startup_profiler()
+        self.icons_span = None
+        self.update_check_span = None
+        
         # Initialize managers
-        self.settings_manager = SettingsManager()
-        self.game_manager = GameManager(self.settings_manager)
-        self.achievement_manager = AchievementManager(self.game_manager, self.settings_manager)
-        self.download_manager = DownloadManager(self.settings_manager.get_cache_dir())
+        with self.profiler.span("SettingsManager"):
+            self.settings_manager = SettingsManager()
+        with self.profiler.span("GameManager"):
+            self.game_manager = GameManager(self.settings_manager)
+            self.achievement_manager = AchievementManager(self.game_manager, self.settings_manager)
+        with self.profiler.span("DownloadManager"):
+            self.connectivity = ConnectivityMonitor()
+            self.http_client = get_http_client()
+            self.http_client.set_bandwidth_limit(self.settings_manager.get('max_download_kbps', 0) * 1024)
+            self.download_manager = DownloadManager(self.settings_manager.get_cache_dir(), self.connectivity,
+                                                    self.settings_manager.get('pack_downloaded_games', True),
+                                                    self.settings_manager.get('decompressed_cache_mb', 64))
+        with self.profiler.span("search and similarity index"):
+            self.search_index = SearchIndex(self.game_manager.games)
+            self.similarity_index = SimilarityIndex(self.settings_manager.data_dir / "similarity_index.npz")
+            self.similarity_index.load()
+            self.similarity_index.sync(self.game_manager.games)
+            self.recommendation_engine = RecommendationEngine(self.game_manager, similarity_index=self.similarity_index)
+        self.session_log = SessionLog(self.settings_manager.data_dir / "sessions.jsonl")
+        self.stats_export_worker = None
+        self.cache_check_worker = None
+        self.update_downloader = None
+        self.update_progress = None
         
         # User profile
         self.username = self.settings_manager.get('username', 'Player')
@@ -68,10 +122,59 @@ class MainWindow(QMainWindow):
             'purple': {'name': 'Royal Purple', 'emoji': '👑'},
         }
         
-        # Networking
+        # Persistent profile shared by every game view
+        with self.profiler.span("web profile"):
+            self.web_profile = GameWebProfile(self.settings_manager)
+        
+        # Packed downloads are served from their memory map
+        self.pack_scheme_handler = PackSchemeHandler(self.download_manager, self)
+        self.web_profile.profile.installUrlSchemeHandler(PACK_SCHEME, self.pack_scheme_handler)
+        with self.profiler.span("sync downloaded games"):
+            self.sync_downloaded_games()
+        
+        # Freeze game pages that are not on screen
+        self.page_lifecycle = PageLifecycleManager(self.settings_manager.get('discard_hidden_after_minutes', 10), self)
+        self.page_lifecycle.enabled = self.settings_manager.get('freeze_hidden_games', True)
+        
+        # Load the selected game in the background before Play is pressed
+        self.preloader = GamePreloader(self.web_profile, self.settings_manager.get('preload_pages', 1), self,
+                                       self.connectivity)
+        self.preloader.enabled = self.settings_manager.get('preload_games', True)
+        
+        # Ad and tracker blocking for game pages
+        with self.profiler.span("ad blocking"):
+            self.setup_ad_blocking()
+        
+        # Screenshots are encoded off the GUI thread
+        self.screenshot_capture = ScreenshotCapture(
+            self.settings_manager.data_dir / "screenshots",
+            self.settings_manager.get('screenshot_format', 'png'),
+            self.settings_manager.get('screenshot_quality', 90),
+            self
+        )
+        self.screenshot_capture.saved.connect(self.on_screenshot_saved)
+        self.screenshot_capture.error.connect(self.on_screenshot_error)
+        self.screenshot_capture.burst_finished.connect(self.on_screenshot_burst_finished)
+        
+        # Networking; icons are kept in a disk cache so they show up offline
         self.network_manager = QNetworkAccessManager()
+        icon_cache = QNetworkDiskCache(self)
+        icon_cache.setCacheDirectory(str(self.settings_manager.data_dir / "icon_cache"))
+        icon_cache.setMaximumCacheSize(50 * 1024 * 1024)
+        self.network_manager.setCache(icon_cache)
         self.network_manager.finished.connect(self.on_icon_downloaded)
         self.pending_requests = {}
+        self.placeholder_icon = None
+        
+        # Watch connectivity so offline starts skip requests that would only time out
+        self.connectivity_watcher = ConnectivityWatcher(self.connectivity, self)
+        self.connectivity_watcher.online_changed.connect(self.on_connectivity_changed)
+        
+        # Rows currently shown for each game, updated in place on game events
+        self.favorite_items = {}
+        self.favorite_positions = []  # catalog position of each favorites row, in row order
+        self.recommendation_items = {}
+        self.recommendations_stale = False
         
         # Timers
         self.play_timer = QTimer()
@@ -84,33 +187,72 @@ class MainWindow(QMainWindow):
         self.daily_challenge = DailyChallengeGenerator.generate(self.game_manager)
         
         # System tray
-        self.setup_system_tray()
+        with self.profiler.span("system tray"):
+            self.setup_system_tray()
         
         # Shortcuts
         self.setup_shortcuts()
         
         # Initialize UI
-        self.init_ui()
-        self.load_icons()
-        self.load_achievements()
-        self.update_statistics()
-        self.update_favorites_list()
-        self.update_challenge_display()
+        with self.profiler.span("init_ui"):
+            self.init_ui()
+            self.setup_game_events()
+        with self.profiler.span("load icons"):
+            self.load_icons()
+        with self.profiler.span("fill lists and statistics"):
+            self.load_achievements()
+            self.update_statistics()
+            self.update_favorites_list()
+            self.update_recommendations()
+            self.update_challenge_display()
         
         # Check for updates on startup
         if self.settings_manager.get('check_updates', True):
-            self.check_for_updates()
+            self.check_for_updates(use_cache=True)
         
         # Show welcome message for first time users
         if not self.settings_manager.get('welcomed', False):
             self.show_welcome_dialog()
     
+    def setup_game_events(self):
+        """Subscribe panels to game changes so they update only affected rows"""
+        self.game_manager.subscribe(GameManager.FAVORITE_CHANGED, self.on_favorite_changed)
+        self.game_manager.subscribe(GameManager.STATS_CHANGED, self.on_game_stats_changed)
+        self.game_manager.subscribe(GameManager.ICON_READY, self.on_game_icon_ready)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        self.page_lifecycle.track(self.games_tab.web_view)
+    
+    def setup_ad_blocking(self):
+        """Install the ad and tracker request interceptor"""
+        self.url_filter = UrlFilter.from_file(self.settings_manager.data_dir / "filters.txt")
+        self.url_filter.set_game_overrides(self.settings_manager.get('adblock_allow', {}))
+        self.ad_block_interceptor = AdBlockInterceptor(self.url_filter, self)
+        self.ad_block_interceptor.enabled = self.settings_manager.get('block_ads', True)
+        self.ad_block_interceptor.set_games(self.game_manager.games, self.download_manager.get_url_hash)
+        self.web_profile.profile.setUrlRequestInterceptor(self.ad_block_interceptor)
+    
+    def is_ad_blocking_allowed(self, game):
+        """Check whether blocking is turned off for a game"""
+        return '*' in self.settings_manager.get('adblock_allow', {}).get(game.name, [])
+    
+    def set_ad_blocking_allowed(self, game, allowed):
+        """Turn ad blocking off (allowed) or back on for a single game"""
+        overrides = dict(self.settings_manager.get('adblock_allow', {}))
+        if allowed:
+            overrides[game.name] = ['*']
+        else:
+            overrides.pop(game.name, None)
+        self.settings_manager.set('adblock_allow', overrides)
+        self.url_filter.set_game_overrides(overrides)
+    
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
         QShortcut(QKeySequence("Ctrl+F"), self, self.focus_search)
         QShortcut(QKeySequence("Ctrl+H"), self, self.go_home)
         QShortcut(QKeySequence("F11"), self, self.toggle_fullscreen)
         QShortcut(QKeySequence("Ctrl+S"), self, self.show_settings)
+        QShortcut(QKeySequence("F12"), self, self.take_screenshot)
+        QShortcut(QKeySequence("Shift+F12"), self, self.take_burst_screenshots)
         QShortcut(QKeySequence("Ctrl+Q"), self, self.close)
     
     def focus_search(self):
@@ -236,7 +378,7 @@ class MainWindow(QMainWindow):
         update_btn = QPushButton("🔄 Update")
         update_btn.setMinimumHeight(35)
         update_btn.setMinimumWidth(100)
-        update_btn.clicked.connect(self.check_for_updates)
+        update_btn.clicked.connect(lambda: self.check_for_updates())
         toolbar_layout.addWidget(update_btn)
         
         self.apply_toolbar_style(toolbar)
@@ -267,8 +409,8 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(challenge_tab, "🎯 Daily Challenge")
         
         # Recommendations tab
-        recommendations_tab = self.create_recommendations_tab()
-        self.tabs.addTab(recommendations_tab, "💡 For You")
+        self.recommendations_tab = self.create_recommendations_tab()
+        self.tabs.addTab(self.recommendations_tab, "💡 For You")
         
         # About tab
         about_tab = self.create_about_tab()
@@ -292,10 +434,10 @@ class MainWindow(QMainWindow):
         header_layout.addWidget(title)
         header_layout.addStretch()
         
-        count_label = QLabel(f"({sum(1 for g in self.game_manager.games if g.favorite)} games)")
-        count_label.setFont(QFont("Arial", 12))
-        count_label.setStyleSheet("color: #666;")
-        header_layout.addWidget(count_label)
+        self.favorites_count_label = QLabel(f"({sum(1 for g in self.game_manager.games if g.favorite)} games)")
+        self.favorites_count_label.setFont(QFont("Arial", 12))
+        self.favorites_count_label.setStyleSheet("color: #666;")
+        header_layout.addWidget(self.favorites_count_label)
         layout.addLayout(header_layout)
         
         # Description
@@ -616,7 +758,7 @@ class MainWindow(QMainWindow):
         refresh_rec_btn = QPushButton("🔄 Refresh")
         refresh_rec_btn.setMinimumHeight(35)
         refresh_rec_btn.setMinimumWidth(120)
-        refresh_rec_btn.clicked.connect(self.update_recommendations)
+        refresh_rec_btn.clicked.connect(self.refresh_recommendations)
         header_layout.addWidget(refresh_rec_btn)
         layout.addLayout(header_layout)
         
@@ -760,9 +902,23 @@ class MainWindow(QMainWindow):
             item = self.games_tab.game_list.item(i)
             game = item.data(Qt.ItemDataRole.UserRole)
             
+            # Icons already fetched this run are reused, e.g. after re-sorting the list
+            if game.icon:
+                item.setIcon(game.icon)
+                continue
+            
             request = QNetworkRequest(QUrl(game.icon_url))
+            # Icons rarely change, so use the cached copy when there is one; offline, use only the cache
+            cache_control = (QNetworkRequest.CacheLoadControl.PreferCache if self.connectivity.is_online()
+                             else QNetworkRequest.CacheLoadControl.AlwaysCache)
+            request.setAttribute(QNetworkRequest.Attribute.CacheLoadControlAttribute, cache_control)
+            # All icons come from one CDN, so multiplex them over a single connection
+            request.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
             reply = self.network_manager.get(request)
             self.pending_requests[reply] = (game, item)
+        
+        if self.pending_requests and self.icons_span is None:
+            self.icons_span = self.profiler.begin("icon requests")
     
     def on_icon_downloaded(self, reply):
         """Handle icon download completion"""
@@ -770,6 +926,8 @@ class MainWindow(QMainWindow):
             game, item = self.pending_requests[reply]
             
             if reply.error() == QNetworkReply.NetworkError.NoError:
+                if not reply.attribute(QNetworkRequest.Attribute.SourceIsFromCacheAttribute):
+                    self.connectivity.report_success()
                 image_data = reply.readAll()
                 pixmap = QPixmap()
                 if pixmap.loadFromData(image_data):
@@ -778,20 +936,105 @@ class MainWindow(QMainWindow):
                     icon = QIcon(scaled_pixmap)
                     item.setIcon(icon)
                     game.icon = icon
+                    self.game_manager.notify(GameManager.ICON_READY, game)
+            elif reply.error() in self.CONNECTION_ERRORS:
+                # One unreachable icon host says little about the network, so let a probe decide
+                self.connectivity_watcher.start_probe()
             
             del self.pending_requests[reply]
             
             if not self.pending_requests:
+                self.profiler.end(self.icons_span)
+                self.icons_span = None
                 if hasattr(self.games_tab, 'status_label'):
                     self.games_tab.status_label.setText(f"{len(self.game_manager.games)} games ready!")
-                self.update_favorites_list()
-                self.update_recommendations()
         
         reply.deleteLater()
     
+    def on_connectivity_changed(self, online):
+        """Switch between online and offline behaviour"""
+        if online:
+            if hasattr(self.games_tab, 'status_label'):
+                self.games_tab.status_label.setText("🌐 Back online")
+            # Fetch any icons that were not cached while offline
+            self.load_icons()
+        else:
+            self.preloader.cancel()
+            if hasattr(self.games_tab, 'status_label'):
+                self.games_tab.status_label.setText("📴 Offline - downloaded games still work")
+    
+    def show_offline_page(self, game):
+        """Explain that an online-only game cannot start while offline"""
+        html = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{
+                    margin: 0;
+                    display: flex;
+                    justify-content: center;
+                    align-items: center;
+                    height: 100vh;
+                    background: #2c3e50;
+                    color: white;
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                    text-align: center;
+                }}
+                h1 {{ font-size: 3em; margin: 0; }}
+                p {{ font-size: 1.2em; opacity: 0.85; }}
+            </style>
+        </head>
+        <body>
+            <div>
+                <h1>📴</h1>
+                <h2>You're offline</h2>
+                <p>{html_escape(game.name)} needs an internet connection.</p>
+                <p>Download games while online to play them offline.</p>
+            </div>
+        </body>
+        </html>
+        """
+        self.games_tab.web_view.setHtml(html)
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"📴 Offline - {game.name} isn't downloaded")
+    
+    def sync_downloaded_games(self):
+        """Mark games whose files are in the cache, e.g. packs copied in to pre-seed a kiosk"""
+        if self.game_manager.sync_downloads(self.download_manager):
+            self.game_manager.save_game_data()
+    
+    def load_downloaded_game(self, view, game):
+        """Load a game's downloaded copy into view; returns False if there is none"""
+        if not (game.is_downloaded and game.local_path):
+            return False
+        local_path = Path(game.local_path)
+        if not local_path.exists():
+            return False
+        if local_path.suffix == PACK_EXTENSION:
+            view.setUrl(PackSchemeHandler.url_for(local_path))
+        else:
+            # Load the file itself so relative paths work and its own charset is used
+            view.setUrl(QUrl.fromLocalFile(str(local_path)))
+        return True
+    
+    def is_playable_offline(self, game):
+        """Check whether a game can start without the network"""
+        return bool(game.is_downloaded and game.local_path and Path(game.local_path).exists())
+    
+    def game_icon(self, game):
+        """Get a game's icon, or a placeholder until it has downloaded"""
+        if game.icon:
+            return game.icon
+        if self.placeholder_icon is None:
+            placeholder_pixmap = QPixmap(64, 64)
+            placeholder_pixmap.fill(Qt.GlobalColor.lightGray)
+            self.placeholder_icon = QIcon(placeholder_pixmap)
+        return self.placeholder_icon
+    
     def load_achievements(self):
         """Load achievements from game data"""
-        data_file = self.settings_manager.settings_file.parent / "game_data.json"
+        data_file = self.settings_manager.data_dir / "game_data.json"
         try:
             if data_file.exists():
                 import json
@@ -803,8 +1046,13 @@ class MainWindow(QMainWindow):
     
     def play_game(self, game):
         """Play a game"""
+        if not self.connectivity.is_online() and not self.is_playable_offline(game):
+            self.show_offline_page(game)
+            return
+        
         self.current_game = game
         self.game_start_time = datetime.now()
+        self.session_log.start(game, 'preview')
         
         game.play_count += 1
         game.last_played = self.game_start_time
@@ -824,18 +1072,16 @@ class MainWindow(QMainWindow):
         self.add_xp(xp_gained)
         
         # Check if game is downloaded locally
-        if game.is_downloaded and game.local_path:
-            html_file = Path(game.local_path)
-            if html_file.exists():
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                self.games_tab.web_view.setHtml(html_content, baseUrl=QUrl.fromLocalFile(str(html_file.parent)))
-        else:
+        if self.load_downloaded_game(self.games_tab.web_view, game):
+            pass
+        elif not self.preloader.load_into(self.games_tab.web_view, game):
             self.games_tab.web_view.setUrl(QUrl(game.url))
         
         if hasattr(self.games_tab, 'status_label'):
             self.games_tab.status_label.setText(f"▶️ Playing: {game.name} (+{xp_gained} XP)")
         
+        self.game_manager.notify(GameManager.STATS_CHANGED, game)
+        
         self.play_timer.start(1000)
         
         if self.settings_manager.get('notifications_enabled', True):
@@ -859,9 +1105,14 @@ class MainWindow(QMainWindow):
     
     def play_game_fullscreen(self, game):
         """Play game in fullscreen window"""
+        if not self.connectivity.is_online() and not self.is_playable_offline(game):
+            self.show_offline_page(game)
+            return
+        
         # Update game stats
         self.current_game = game
         self.game_start_time = datetime.now()
+        self.session_log.start(game, 'fullscreen')
         
         game.play_count += 1
         game.last_played = self.game_start_time
@@ -881,20 +1132,17 @@ class MainWindow(QMainWindow):
         self.add_xp(xp_gained)
         
         # Create and show fullscreen window
-        self.fullscreen_window = FullscreenGameWindow(self)
+        self.fullscreen_window = FullscreenGameWindow(self, self.web_profile)
         self.fullscreen_window.closed.connect(self.on_fullscreen_closed)
+        self.fullscreen_window.screenshot_requested.connect(self.take_screenshot)
+        self.fullscreen_window.burst_requested.connect(self.take_burst_screenshots)
         
         # Check if game is downloaded locally
-        if game.is_downloaded and game.local_path:
-            html_file = Path(game.local_path)
-            if html_file.exists():
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                # Use baseUrl so relative paths work
-                base_url = QUrl.fromLocalFile(str(html_file.parent / ""))
-                self.fullscreen_window.web_view.setHtml(html_content, base_url)
-            else:
-                self.fullscreen_window.set_url(QUrl(game.url))
+        if self.load_downloaded_game(self.fullscreen_window.web_view, game):
+            pass
+        elif self.preloader.load_into(self.fullscreen_window.web_view, game):
+            # The preloaded page already loaded, so run the fullscreen script on it now
+            self.fullscreen_window.install_fullscreen_script(run_now=True)
         else:
             self.fullscreen_window.set_url(QUrl(game.url))
         
@@ -904,10 +1152,13 @@ class MainWindow(QMainWindow):
             reminder_minutes = self.settings_manager.get('play_reminder_minutes', 60)
             self.notification_timer.start(reminder_minutes * 60 * 1000)
         
-        # Show fullscreen window
+        # Show fullscreen window and pause the preview behind it
         self.fullscreen_window.show()
+        self.page_lifecycle.track(self.fullscreen_window.web_view)
+        self.update_page_lifecycle()
         
         # Save game data
+        self.game_manager.notify(GameManager.STATS_CHANGED, game)
         self.game_manager.save_game_data()
         self.update_statistics()
         
@@ -930,8 +1181,12 @@ class MainWindow(QMainWindow):
         # Stop timers when fullscreen closes
         self.play_timer.stop()
         self.notification_timer.stop()
+        self.session_log.end()
+        if self.fullscreen_window is not None:
+            self.page_lifecycle.untrack(self.fullscreen_window.web_view)
         self.fullscreen_window = None
         self.current_game = None
+        self.update_page_lifecycle()
     
     def download_game_files(self, game):
         """Download game files locally"""
@@ -941,7 +1196,7 @@ class MainWindow(QMainWindow):
         result = self.download_manager.download_website(game.url, game.name)
         
         if result['success']:
-            game.local_path = str(result['html_file'])
+            game.local_path = str(result['local_path'])
             game.is_downloaded = True
             self.game_manager.save_game_data()
             if hasattr(self.games_tab, 'status_label'):
@@ -955,6 +1210,101 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Download Failed", 
                               f"Failed to download {game.name}:\n{result.get('error', 'Unknown error')}")
     
+    def export_game_pack(self, game):
+        """Save a downloaded game as one pack file, e.g. to copy to another machine"""
+        if not self.download_manager.is_downloaded(game.url):
+            QMessageBox.information(self, "Not Downloaded", f"Download {game.name} before exporting it.")
+            return
+        
+        safe_name = "".join(c if c.isalnum() or c in " -_" else "_" for c in game.name).strip()
+        filename, _ = QFileDialog.getSaveFileName(self, "Export Game Pack", f"{safe_name}{PACK_EXTENSION}",
+                                                  f"Game packs (*{PACK_EXTENSION})")
+        if filename:
+            try:
+                self.download_manager.export_game(game.url, filename)
+                QMessageBox.information(self, "Success", f"{game.name} exported to:\n{filename}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export: {e}")
+    
+    def import_game_pack(self):
+        """Add a game pack exported on another machine"""
+        filename, _ = QFileDialog.getOpenFileName(self, "Import Game Pack", "", f"Game packs (*{PACK_EXTENSION})")
+        if not filename:
+            return
+        
+        try:
+            url, pack_path = self.download_manager.import_game(filename)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to import: {e}")
+            return
+        
+        game = next((g for g in self.game_manager.games if g.url == url), None)
+        if game is None:
+            QMessageBox.warning(self, "Imported", f"The pack was imported, but no game in the library uses:\n{url}")
+            return
+        game.local_path = str(pack_path)
+        game.is_downloaded = True
+        self.game_manager.save_game_data()
+        QMessageBox.information(self, "Success", f"{game.name} can now be played offline.")
+    
+    def verify_offline_games(self, repair_urls=None):
+        """Check downloaded games against their manifests, or repair the given ones"""
+        if self.cache_check_worker is not None and self.cache_check_worker.isRunning():
+            QMessageBox.information(self, "Check Running", "The offline games are already being checked.")
+            return
+        
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText("🩺 Checking offline games..." if repair_urls is None
+                                                else "🩺 Repairing offline games...")
+        self.cache_check_worker = CacheCheckWorker(self.download_manager, repair_urls)
+        self.cache_check_worker.progress.connect(self.on_cache_repair_progress)
+        self.cache_check_worker.finished.connect(
+            lambda reports: self.on_cache_checked(reports, repaired=repair_urls is not None))
+        self.cache_check_worker.error.connect(lambda e: QMessageBox.critical(self, "Error", f"Failed to check games: {e}"))
+        self.cache_check_worker.start()
+    
+    def on_cache_repair_progress(self, url):
+        """Show which game is being repaired"""
+        game = next((g for g in self.game_manager.games if g.url == url), None)
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"🩺 Repairing {game.name if game else url}...")
+    
+    def on_cache_checked(self, reports, repaired=False):
+        """Summarise a cache check and offer to repair damaged games"""
+        if repaired:
+            self.sync_downloaded_games()
+        names = {g.url: g.name for g in self.game_manager.games}
+        healthy = [r for r in reports if r['status'] == 'ok']
+        damaged = [r for r in reports if r['status'] != 'ok' and r['url']]
+        unknown = len(reports) - len(healthy) - len(damaged)
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"🩺 {len(healthy)} of {len(reports)} offline games are healthy")
+        
+        if not damaged:
+            message = f"All {len(healthy)} offline games are intact."
+            if unknown:
+                message += f"\n{unknown} other cache entries could not be checked."
+            QMessageBox.information(self, "Offline Games", message)
+            return
+        
+        lines = []
+        for report in damaged:
+            problem = report['error'] or ("no manifest" if report['status'] == 'unverified' else
+                                          f"{len(report['missing'])} missing, {len(report['corrupt'])} damaged files")
+            lines.append(f"• {names.get(report['url'], report['url'])}: {problem}")
+        if repaired:
+            QMessageBox.warning(self, "Offline Games", "These games could not be fully repaired:\n\n" + "\n".join(lines))
+            return
+        
+        reply = QMessageBox.question(
+            self, "Offline Games",
+            f"{len(healthy)} of {len(reports)} offline games are intact. These need attention:\n\n"
+            + "\n".join(lines) + "\n\nDownload the missing and damaged files again?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.verify_offline_games([report['url'] for report in damaged])
+    
     def add_xp(self, amount):
         """Add XP and check for level up"""
         self.total_xp += amount
@@ -1009,14 +1359,83 @@ class MainWindow(QMainWindow):
             )
     
     def update_favorites_list(self):
-        """Update favorites list"""
+        """Rebuild the favorites list"""
         self.favorites_list.clear()
+        self.favorite_items = {}
+        self.favorite_positions = []
         
         for game in self.game_manager.games:
-            if game.favorite and game.icon:
-                item = QListWidgetItem(game.icon, game.name)
-                item.setData(Qt.ItemDataRole.UserRole, game)
-                self.favorites_list.addItem(item)
+            if game.favorite:
+                self.add_favorite_item(game)
+        self.update_favorites_count()
+    
+    def add_favorite_item(self, game):
+        """Add a row for a favorite game, keeping catalog order"""
+        item = QListWidgetItem(self.game_icon(game), game.name)
+        item.setData(Qt.ItemDataRole.UserRole, game)
+        
+        position = self.game_manager.catalog_position(game)
+        row = bisect.bisect_left(self.favorite_positions, position)
+        self.favorite_positions.insert(row, position)
+        self.favorites_list.insertItem(row, item)
+        self.favorite_items[game.name] = item
+    
+    def update_favorites_count(self):
+        """Update the favorites header count"""
+        self.favorites_count_label.setText(f"({len(self.favorite_items)} games)")
+    
+    def on_favorite_changed(self, game):
+        """Insert or remove the favorite row for a toggled game"""
+        item = self.favorite_items.pop(game.name, None)
+        if item is not None:
+            row = self.favorites_list.row(item)
+            self.favorites_list.takeItem(row)
+            del self.favorite_positions[row]
+        if game.favorite:
+            self.add_favorite_item(game)
+        self.update_favorites_count()
+        self.mark_recommendations_stale()
+    
+    def on_game_stats_changed(self, game):
+        """Handle play count, time, streak or rating changes"""
+        self.mark_recommendations_stale()
+    
+    def on_game_icon_ready(self, game):
+        """Swap the placeholder icon on rows showing this game"""
+        item = self.favorite_items.get(game.name)
+        if item is not None:
+            item.setIcon(game.icon)
+        item = self.recommendation_items.get(game.name)
+        if item is not None:
+            item.setIcon(game.icon)
+    
+    def mark_recommendations_stale(self):
+        """Refresh recommendations now if visible, otherwise when next shown"""
+        if self.tabs.currentWidget() is self.recommendations_tab:
+            self.update_recommendations()
+        else:
+            self.recommendations_stale = True
+    
+    def on_tab_changed(self, index):
+        """Refresh stale panels when their tab is shown"""
+        if self.tabs.widget(index) is self.recommendations_tab and self.recommendations_stale:
+            self.update_recommendations()
+        self.update_page_lifecycle()
+    
+    def update_page_lifecycle(self):
+        """Run only the game view that is on screen and freeze the rest"""
+        if self.fullscreen_window is not None:
+            self.page_lifecycle.activate(self.fullscreen_window.web_view)
+        elif self.isMinimized() or self.tabs.currentWidget() is not self.games_tab:
+            self.page_lifecycle.activate(None)
+        else:
+            self.page_lifecycle.activate(self.games_tab.web_view)
+    
+    def changeEvent(self, event):
+        """Freeze the preview while the window is minimized"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, 'games_tab'):
+            self.update_page_lifecycle()
     
     def play_favorite(self, item):
         """Play a favorite game"""
@@ -1068,6 +1487,7 @@ class MainWindow(QMainWindow):
                 game.total_time = 0
                 game.last_played = None
                 game.streak = 0
+                self.game_manager.notify(GameManager.STATS_CHANGED, game)
             
             self.game_manager.save_game_data()
             self.update_statistics()
@@ -1075,7 +1495,7 @@ class MainWindow(QMainWindow):
     
     def save_achievements(self):
         """Save achievements to game data"""
-        data_file = self.settings_manager.settings_file.parent / "game_data.json"
+        data_file = self.settings_manager.data_dir / "game_data.json"
         try:
             import json
             if data_file.exists():
@@ -1120,106 +1540,152 @@ class MainWindow(QMainWindow):
             self.update_challenge_display()
             QMessageBox.information(self, "Challenge Complete!", f"🎉 Daily Challenge Complete!\n+{xp_reward} XP")
     
+    def refresh_recommendations(self):
+        """Recompute recommendations, e.g. to pick up play time from the current session"""
+        self.recommendation_engine.invalidate()
+        self.update_recommendations()
+    
     def update_recommendations(self):
-        """Update game recommendations with enhanced algorithm"""
-        self.recommendations_list.clear()
-        
-        recommended = []
+        """Render recommendations from the recommendation engine"""
+        self.recommendations_stale = False
         
-        # 1. Recommend unplayed games (highest priority)
-        unplayed = [g for g in self.game_manager.games if g.play_count == 0]
-        for game in unplayed[:4]:
-            recommended.append(("🎮 New Game - Try this!", game))
-        
-        # 2. Recommend games in favorite categories
-        favorite_categories = set()
-        for game in self.game_manager.games:
-            if game.favorite:
-                favorite_categories.add(game.category)
-        
-        for game in self.game_manager.games:
-            if game.category in favorite_categories and game.play_count > 0 and game not in [r[1] for r in recommended]:
-                if len(recommended) < 8:
-                    recommended.append(("⭐ Similar to your favorites", game))
-        
-        # 3. Add highly rated games
-        highly_rated = sorted([g for g in self.game_manager.games if g.rating >= 4], 
-                             key=lambda x: x.rating, reverse=True)
-        for game in highly_rated[:3]:
-            if len(recommended) < 10 and game not in [r[1] for r in recommended]:
-                recommended.append(("🌟 Highly Rated", game))
-        
-        # 4. Recommend games with long play time (user enjoys them)
-        long_play = sorted([g for g in self.game_manager.games if g.total_time > 1800], 
-                          key=lambda x: x.total_time, reverse=True)
-        for game in long_play[:2]:
-            if len(recommended) < 12 and game not in [r[1] for r in recommended]:
-                recommended.append(("⏱️ You've played this a lot", game))
-        
-        # 5. Recommend games with streaks
-        streak_games = sorted([g for g in self.game_manager.games if g.streak > 0], 
-                            key=lambda x: x.streak, reverse=True)
-        for game in streak_games[:2]:
-            if len(recommended) < 14 and game not in [r[1] for r in recommended]:
-                recommended.append(("🔥 On a streak!", game))
-        
-        # Display recommendations
-        for reason, game in recommended:
-            if game.icon:
-                item = QListWidgetItem(game.icon, f"{game.name}\n{reason}")
-                item.setData(Qt.ItemDataRole.UserRole, game)
-                item.setToolTip(f"{game.description}\nCategory: {game.category} | Difficulty: {game.difficulty}")
-                self.recommendations_list.addItem(item)
+        recommended = self.recommendation_engine.get_recommendations(limit=14)
+        self.render_recommendations(recommended)
         
         # Update info label
         if hasattr(self, 'recommendations_info'):
             self.recommendations_info.setText(f"Showing {len(recommended)} personalized recommendations")
     
+    def render_recommendations(self, recommended):
+        """Fill the recommendations list with (reason, game) pairs"""
+        self.recommendations_list.clear()
+        self.recommendation_items = {}
+        
+        for reason, game in recommended:
+            item = QListWidgetItem(self.game_icon(game), f"{game.name}\n{reason}")
+            item.setData(Qt.ItemDataRole.UserRole, game)
+            item.setToolTip(f"{game.description}\nCategory: {game.category} | Difficulty: {game.difficulty}")
+            self.recommendations_list.addItem(item)
+            self.recommendation_items[game.name] = item
+    
+    def show_similar_games(self, game):
+        """Show games similar to a game in the recommendations tab"""
+        similar = self.recommendation_engine.get_similar_games(game)
+        if not similar:
+            if self.similarity_index.available():
+                message = f"No games are similar enough to {game.name}."
+            else:
+                message = "Similar games are unavailable. Install numpy to enable them."
+            QMessageBox.information(self, "More Like This", message)
+            return
+        
+        self.recommendations_stale = False
+        self.tabs.setCurrentWidget(self.recommendations_tab)
+        self.render_recommendations(similar)
+        self.recommendations_info.setText(f"Showing {len(similar)} games similar to {game.name}")
+        # Personalized recommendations come back when the tab is next shown
+        self.recommendations_stale = True
+    
     def export_statistics(self):
-        """Export statistics to CSV"""
-        filename, _ = QFileDialog.getSaveFileName(
+        """Export session history or per-game totals in the background"""
+        if self.stats_export_worker is not None and self.stats_export_worker.isRunning():
+            QMessageBox.information(self, "Export Running", "A statistics export is already running.")
+            return
+        
+        # file dialog filter -> (format, what)
+        filters = {
+            "Session history - CSV (*.csv)": ('csv', 'sessions'),
+            "Session history - JSON Lines (*.jsonl)": ('jsonl', 'sessions'),
+            "Session history - Parquet (*.parquet)": ('parquet', 'sessions'),
+            "Session history - NumPy archive (*.npz)": ('npz', 'sessions'),
+            "Game totals - CSV (*.csv)": ('csv', 'games'),
+        }
+        available = StatsExporter.available_formats()
+        filters = {name: choice for name, choice in filters.items() if choice[0] in available}
+        
+        filename, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Export Statistics",
             f"papa_games_stats_{datetime.now().strftime('%Y%m%d')}.csv",
-            "CSV Files (*.csv)"
+            ";;".join(filters)
         )
         
         if filename:
-            try:
-                with open(filename, 'w') as f:
-                    f.write("Game,Category,Difficulty,Plays,Total Time (min),Rating,Favorite,Streak\n")
-                    for game in self.game_manager.games:
-                        total_mins = game.total_time // 60
-                        f.write(f"{game.name},{game.category},{game.difficulty},{game.play_count},{total_mins},{game.rating},{game.favorite},{game.streak}\n")
-                
-                QMessageBox.information(self, "Success", f"Statistics exported to:\n{filename}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to export: {str(e)}")
+            fmt, what = filters.get(selected_filter, ('csv', 'sessions'))
+            extension = f".{StatsExporter.FORMATS[fmt]}"
+            if not filename.lower().endswith(extension):
+                filename = str(Path(filename).with_suffix(extension))
+            
+            exporter = StatsExporter(self.session_log, list(self.game_manager.games))
+            self.stats_export_worker = StatsExportWorker(exporter, filename, fmt, what)
+            self.stats_export_worker.progress.connect(self.on_stats_export_progress)
+            self.stats_export_worker.finished.connect(self.on_stats_exported)
+            self.stats_export_worker.error.connect(lambda e: QMessageBox.critical(self, "Error", f"Failed to export: {e}"))
+            self.stats_export_worker.start()
+    
+    def on_stats_export_progress(self, rows):
+        """Show export progress"""
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"📤 Exporting statistics... {rows:,} rows")
+    
+    def on_stats_exported(self, filename, rows):
+        """Report a finished export"""
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"✅ Exported {rows:,} rows")
+        QMessageBox.information(self, "Success", f"Statistics exported to:\n{filename}")
+    
+    def active_game_view(self):
+        """Get the web view the current game is shown in"""
+        if self.fullscreen_window is not None:
+            return self.fullscreen_window.web_view
+        return self.games_tab.web_view
     
     def take_screenshot(self):
         """Take screenshot of current game"""
         if self.current_game:
-            screenshots_dir = self.settings_manager.settings_file.parent / "screenshots"
-            screenshots_dir.mkdir(exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = screenshots_dir / f"{self.current_game.name}_{timestamp}.png"
-            
-            # Take screenshot of web view
-            pixmap = self.games_tab.web_view.grab()
-            pixmap.save(str(filename))
-            
-            if hasattr(self.games_tab, 'status_label'):
-                self.games_tab.status_label.setText(f"📷 Screenshot saved!")
-            QMessageBox.information(self, "Screenshot", f"Screenshot saved to:\n{filename}")
+            self.screenshot_capture.capture(self.active_game_view(), self.current_game.name)
         else:
             QMessageBox.warning(self, "No Game", "Please start a game first!")
     
+    def take_burst_screenshots(self):
+        """Start timed screenshots of the current game, or stop them if running"""
+        if self.screenshot_capture.is_bursting():
+            self.screenshot_capture.stop_burst()
+            return
+        if not self.current_game:
+            QMessageBox.warning(self, "No Game", "Please start a game first!")
+            return
+        
+        self.screenshot_capture.start_burst(
+            lambda: self.active_game_view() if self.current_game else None,
+            self.current_game.name,
+            self.settings_manager.get('screenshot_burst_count', 5),
+            self.settings_manager.get('screenshot_burst_interval_ms', 1000)
+        )
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText("📷 Taking screenshots... (Shift+F12 to stop)")
+    
+    def on_screenshot_saved(self, filepath):
+        """Show where a screenshot was saved"""
+        if hasattr(self.games_tab, 'status_label') and not self.screenshot_capture.is_bursting():
+            self.games_tab.status_label.setText(f"📷 Screenshot saved: {Path(filepath).name}")
+    
+    def on_screenshot_error(self, message):
+        """Show a screenshot failure without interrupting the game"""
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"❌ Screenshot failed: {message}")
+    
+    def on_screenshot_burst_finished(self, count):
+        """Show how many screenshots a burst took"""
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"📷 {count} screenshots saved")
+    
     def go_home(self):
         """Go to home screen"""
         self.show_welcome_screen()
         self.play_timer.stop()
         self.notification_timer.stop()
+        self.session_log.end()
         self.current_game = None
         if hasattr(self.games_tab, 'status_label'):
             self.games_tab.status_label.setText("Ready")
@@ -1450,9 +1916,239 @@ class MainWindow(QMainWindow):
         auto_download_updates.setChecked(self.settings_manager.get('auto_download_updates', False))
         general_layout.addWidget(auto_download_updates)
         
+        update_ttl_layout = QHBoxLayout()
+        update_ttl_layout.addWidget(QLabel("Check for updates at most every:"))
+        update_ttl = QSpinBox()
+        update_ttl.setRange(0, 24 * 7)
+        update_ttl.setSuffix(" h")
+        update_ttl.setSpecialValueText("Every startup")
+        update_ttl.setValue(self.settings_manager.get('update_check_ttl_hours', 6))
+        update_ttl_layout.addWidget(update_ttl)
+        general_layout.addLayout(update_ttl_layout)
+        
+        update_mirror_layout = QHBoxLayout()
+        update_mirror_layout.addWidget(QLabel("Update server:"))
+        update_mirror = QLineEdit(self.settings_manager.get('update_mirror_url', ''))
+        update_mirror.setPlaceholderText(UpdateChecker.DEFAULT_API_BASE)
+        update_mirror_layout.addWidget(update_mirror)
+        general_layout.addLayout(update_mirror_layout)
+        
         general_group.setLayout(general_layout)
         layout.addWidget(general_group)
         
+        # Ad blocking settings
+        adblock_group = QGroupBox("🛡️ Ad Blocking")
+        adblock_layout = QVBoxLayout()
+        
+        block_ads = QCheckBox("Block ads and trackers in games")
+        block_ads.setChecked(self.settings_manager.get('block_ads', True))
+        adblock_layout.addWidget(block_ads)
+        
+        blocked_label = QLabel(f"Blocked {self.ad_block_interceptor.total_blocked} requests this session")
+        blocked_label.setStyleSheet("color: #666;")
+        adblock_layout.addWidget(blocked_label)
+        
+        adblock_group.setLayout(adblock_layout)
+        layout.addWidget(adblock_group)
+        
+        # Web cache settings
+        cache_group = QGroupBox("💽 Game Cache")
+        cache_layout = QVBoxLayout()
+        
+        cache_type_layout = QHBoxLayout()
+        cache_type_layout.addWidget(QLabel("Cache type:"))
+        cache_type = QComboBox()
+        cache_type.addItem("Disk", 'disk')
+        cache_type.addItem("Memory only", 'memory')
+        cache_type.addItem("Off", 'none')
+        cache_type.setCurrentIndex(max(0, cache_type.findData(self.settings_manager.get('http_cache_type', 'disk'))))
+        cache_type_layout.addWidget(cache_type)
+        cache_layout.addLayout(cache_type_layout)
+        
+        cache_size_layout = QHBoxLayout()
+        cache_size_layout.addWidget(QLabel("Maximum size:"))
+        cache_size = QSpinBox()
+        cache_size.setRange(0, 20480)
+        cache_size.setSingleStep(256)
+        cache_size.setSuffix(" MB")
+        cache_size.setSpecialValueText("Automatic")
+        cache_size.setValue(self.settings_manager.get('http_cache_size_mb', 1024))
+        cache_size_layout.addWidget(cache_size)
+        cache_layout.addLayout(cache_size_layout)
+        
+        cache_usage_layout = QHBoxLayout()
+        cache_usage_label = QLabel()
+        cache_usage_label.setStyleSheet("color: #666;")
+        cache_usage_layout.addWidget(cache_usage_label)
+        cache_usage_layout.addStretch()
+        clear_cache_btn = QPushButton("🗑️ Clear Cache")
+        cache_usage_layout.addWidget(clear_cache_btn)
+        cache_layout.addLayout(cache_usage_layout)
+        
+        def update_cache_usage():
+            cache_usage_label.setText(f"Using {self.web_profile.cache_usage() / (1024 * 1024):.1f} MB on disk")
+        
+        def clear_web_cache():
+            self.web_profile.clear_cache()
+            # Clearing finishes in the background, so refresh the usage shortly after
+            QTimer.singleShot(1000, update_cache_usage)
+        
+        clear_cache_btn.clicked.connect(clear_web_cache)
+        update_cache_usage()
+        
+        pack_games = QCheckBox("Store downloaded games as single-file packs")
+        pack_games.setChecked(self.settings_manager.get('pack_downloaded_games', True))
+        cache_layout.addWidget(pack_games)
+        
+        blob_cache_layout = QHBoxLayout()
+        blob_cache_layout.addWidget(QLabel("Decompressed file cache:"))
+        blob_cache_size = QSpinBox()
+        blob_cache_size.setRange(0, 1024)
+        blob_cache_size.setSingleStep(16)
+        blob_cache_size.setSuffix(" MB")
+        blob_cache_size.setSpecialValueText("Off")
+        blob_cache_size.setValue(self.settings_manager.get('decompressed_cache_mb', 64))
+        blob_cache_layout.addWidget(blob_cache_size)
+        cache_layout.addLayout(blob_cache_layout)
+        
+        pack_info = self.download_manager.get_cache_info()
+        if pack_info['total_original_size'] > pack_info['total_size']:
+            compression_label = QLabel(f"Offline games: {pack_info['total_size_mb']:.1f} MB on disk, "
+                                       f"{pack_info['total_original_size'] / (1024 * 1024):.1f} MB uncompressed")
+            compression_label.setStyleSheet("color: #666;")
+            cache_layout.addWidget(compression_label)
+        
+        pack_buttons_layout = QHBoxLayout()
+        import_pack_btn = QPushButton("📥 Import Game Pack...")
+        import_pack_btn.clicked.connect(self.import_game_pack)
+        pack_buttons_layout.addWidget(import_pack_btn)
+        verify_games_btn = QPushButton("🩺 Verify Offline Games")
+        verify_games_btn.setToolTip("Check downloaded games for missing or damaged files and repair them")
+        verify_games_btn.clicked.connect(lambda: self.verify_offline_games())
+        pack_buttons_layout.addWidget(verify_games_btn)
+        cache_layout.addLayout(pack_buttons_layout)
+        
+        cache_group.setLayout(cache_layout)
+        layout.addWidget(cache_group)
+        
+        # Screenshot settings
+        screenshot_group = QGroupBox("📷 Screenshots")
+        screenshot_layout = QVBoxLayout()
+        
+        screenshot_format_layout = QHBoxLayout()
+        screenshot_format_layout.addWidget(QLabel("Format:"))
+        screenshot_format = QComboBox()
+        format_names = {'png': "PNG (lossless)", 'jpeg': "JPEG", 'webp': "WebP"}
+        for format_name in ScreenshotCapture.supported_formats():
+            screenshot_format.addItem(format_names[format_name], format_name)
+        screenshot_format.setCurrentIndex(max(0, screenshot_format.findData(self.settings_manager.get('screenshot_format', 'png'))))
+        screenshot_format_layout.addWidget(screenshot_format)
+        screenshot_layout.addLayout(screenshot_format_layout)
+        
+        screenshot_quality_layout = QHBoxLayout()
+        screenshot_quality_layout.addWidget(QLabel("JPEG/WebP quality:"))
+        screenshot_quality = QSpinBox()
+        screenshot_quality.setRange(1, 100)
+        screenshot_quality.setValue(self.settings_manager.get('screenshot_quality', 90))
+        screenshot_quality_layout.addWidget(screenshot_quality)
+        screenshot_layout.addLayout(screenshot_quality_layout)
+        
+        burst_layout = QHBoxLayout()
+        burst_layout.addWidget(QLabel("Timed capture (Shift+F12):"))
+        burst_count = QSpinBox()
+        burst_count.setRange(0, 1000)
+        burst_count.setSuffix(" shots")
+        burst_count.setSpecialValueText("Until stopped")
+        burst_count.setValue(self.settings_manager.get('screenshot_burst_count', 5))
+        burst_layout.addWidget(burst_count)
+        burst_interval = QSpinBox()
+        burst_interval.setRange(100, 600000)
+        burst_interval.setSingleStep(100)
+        burst_interval.setPrefix("every ")
+        burst_interval.setSuffix(" ms")
+        burst_interval.setValue(self.settings_manager.get('screenshot_burst_interval_ms', 1000))
+        burst_layout.addWidget(burst_interval)
+        screenshot_layout.addLayout(burst_layout)
+        
+        screenshot_group.setLayout(screenshot_layout)
+        layout.addWidget(screenshot_group)
+        
+        # Background game settings
+        background_group = QGroupBox("⏸️ Background Games")
+        background_layout = QVBoxLayout()
+        
+        freeze_hidden = QCheckBox("Pause games that are not visible")
+        freeze_hidden.setChecked(self.settings_manager.get('freeze_hidden_games', True))
+        background_layout.addWidget(freeze_hidden)
+        
+        discard_layout = QHBoxLayout()
+        discard_layout.addWidget(QLabel("Unload paused games after:"))
+        discard_after = QSpinBox()
+        discard_after.setRange(0, 240)
+        discard_after.setSuffix(" min")
+        discard_after.setSpecialValueText("Never")
+        discard_after.setValue(self.settings_manager.get('discard_hidden_after_minutes', 10))
+        discard_layout.addWidget(discard_after)
+        background_layout.addLayout(discard_layout)
+        
+        preload_games = QCheckBox("Start loading the selected game before Play")
+        preload_games.setChecked(self.settings_manager.get('preload_games', True))
+        background_layout.addWidget(preload_games)
+        
+        renderer_memory_layout = QHBoxLayout()
+        renderer_memory_layout.addWidget(QLabel("Game memory limit:"))
+        renderer_memory = QSpinBox()
+        renderer_memory.setRange(0, 16384)
+        renderer_memory.setSingleStep(256)
+        renderer_memory.setSuffix(" MB")
+        renderer_memory.setSpecialValueText("Unlimited")
+        renderer_memory.setValue(self.settings_manager.get('renderer_memory_mb', 1024))
+        renderer_memory_layout.addWidget(renderer_memory)
+        background_layout.addLayout(renderer_memory_layout)
+        
+        renderer_processes_layout = QHBoxLayout()
+        renderer_processes_layout.addWidget(QLabel("Maximum game processes:"))
+        renderer_processes = QSpinBox()
+        renderer_processes.setRange(0, 16)
+        renderer_processes.setSpecialValueText("Unlimited")
+        renderer_processes.setValue(self.settings_manager.get('renderer_process_limit', 4))
+        renderer_processes_layout.addWidget(renderer_processes)
+        background_layout.addLayout(renderer_processes_layout)
+        
+        restart_label = QLabel("Memory and process limits apply after a restart")
+        restart_label.setStyleSheet("color: #666;")
+        background_layout.addWidget(restart_label)
+        
+        background_group.setLayout(background_layout)
+        layout.addWidget(background_group)
+        
+        # Network settings
+        network_group = QGroupBox("🌐 Network")
+        network_layout = QVBoxLayout()
+        
+        bandwidth_layout = QHBoxLayout()
+        bandwidth_layout.addWidget(QLabel("Download speed limit:"))
+        bandwidth_limit = QSpinBox()
+        bandwidth_limit.setRange(0, 1024 * 1024)
+        bandwidth_limit.setSingleStep(256)
+        bandwidth_limit.setSuffix(" KB/s")
+        bandwidth_limit.setSpecialValueText("Unlimited")
+        bandwidth_limit.setValue(self.settings_manager.get('max_download_kbps', 0))
+        bandwidth_layout.addWidget(bandwidth_limit)
+        network_layout.addLayout(bandwidth_layout)
+        
+        host_metrics = sorted(self.http_client.metrics().items(), key=lambda item: -item[1]['bytes'])
+        metrics_lines = [f"{host}: {values['requests']} requests, {values['errors']} errors, "
+                         f"{values['bytes'] / (1024 * 1024):.1f} MB"
+                         for host, values in host_metrics[:5]]
+        protocol = "HTTP/2" if self.http_client.http2_enabled else "HTTP/1.1"
+        metrics_label = QLabel("\n".join([f"Launcher downloads use {protocol} this session"] + metrics_lines))
+        metrics_label.setStyleSheet("color: #666;")
+        network_layout.addWidget(metrics_label)
+        
+        network_group.setLayout(network_layout)
+        layout.addWidget(network_group)
+        
         # Buttons
         btn_layout = QHBoxLayout()
         save_btn = QPushButton("💾 Save")
@@ -1465,6 +2161,36 @@ class MainWindow(QMainWindow):
             self.settings_manager.set('auto_save', auto_save.isChecked())
             self.settings_manager.set('download_games_locally', download_locally.isChecked())
             self.settings_manager.set('auto_download_updates', auto_download_updates.isChecked())
+            self.settings_manager.set('update_check_ttl_hours', update_ttl.value())
+            self.settings_manager.set('update_mirror_url', update_mirror.text().strip())
+            self.settings_manager.set('max_download_kbps', bandwidth_limit.value())
+            self.http_client.set_bandwidth_limit(bandwidth_limit.value() * 1024)
+            self.settings_manager.set('block_ads', block_ads.isChecked())
+            self.ad_block_interceptor.enabled = block_ads.isChecked()
+            self.settings_manager.set('http_cache_type', cache_type.currentData())
+            self.settings_manager.set('http_cache_size_mb', cache_size.value())
+            self.web_profile.apply_settings()
+            self.settings_manager.set('pack_downloaded_games', pack_games.isChecked())
+            self.download_manager.pack_games = pack_games.isChecked()
+            self.settings_manager.set('decompressed_cache_mb', blob_cache_size.value())
+            self.download_manager.blob_cache.resize(blob_cache_size.value() * 1024 * 1024)
+            self.settings_manager.set('freeze_hidden_games', freeze_hidden.isChecked())
+            self.settings_manager.set('discard_hidden_after_minutes', discard_after.value())
+            self.settings_manager.set('renderer_memory_mb', renderer_memory.value())
+            self.settings_manager.set('renderer_process_limit', renderer_processes.value())
+            self.page_lifecycle.enabled = freeze_hidden.isChecked()
+            self.page_lifecycle.discard_after_ms = discard_after.value() * 60 * 1000
+            self.settings_manager.set('screenshot_format', screenshot_format.currentData())
+            self.settings_manager.set('screenshot_quality', screenshot_quality.value())
+            self.settings_manager.set('screenshot_burst_count', burst_count.value())
+            self.settings_manager.set('screenshot_burst_interval_ms', burst_interval.value())
+            self.screenshot_capture.image_format = screenshot_format.currentData()
+            self.screenshot_capture.quality = screenshot_quality.value()
+            self.settings_manager.set('preload_games', preload_games.isChecked())
+            self.preloader.enabled = preload_games.isChecked()
+            if not preload_games.isChecked():
+                self.preloader.clear()
+            self.update_page_lifecycle()
             self.update_profile_display()
             dialog.accept()
             QMessageBox.information(self, "Success", "Settings saved!")
@@ -1531,15 +2257,30 @@ class MainWindow(QMainWindow):
         dialog.accept()
         QMessageBox.information(self, "Welcome!", f"Welcome, {username}! 🎉\nEnjoy your gaming experience!")
     
-    def check_for_updates(self):
-        """Check for updates"""
+    def check_for_updates(self, use_cache=False):
+        """Check for updates (startup checks reuse a recent answer instead of asking again)"""
+        if not use_cache and not self.connectivity.is_online():
+            if hasattr(self.games_tab, 'status_label'):
+                self.games_tab.status_label.setText("📴 Offline - can't check for updates")
+            return
+        
         if hasattr(self.games_tab, 'status_label'):
             self.games_tab.status_label.setText("Checking for updates...")
         
-        self.update_checker = UpdateChecker(self.version, self.github_repo)
+        self.update_checker = UpdateChecker(
+            self.version,
+            self.github_repo,
+            cache_file=self.settings_manager.data_dir / "update_cache.json",
+            ttl_hours=self.settings_manager.get('update_check_ttl_hours', 6),
+            api_base_url=self.settings_manager.get('update_mirror_url', '') or None,
+            use_cache=use_cache,
+            connectivity=self.connectivity
+        )
         self.update_checker.update_available.connect(self.on_update_available)
         self.update_checker.no_update.connect(self.on_no_update)
         self.update_checker.finished.connect(lambda: self.games_tab.status_label.setText("Ready") if hasattr(self.games_tab, 'status_label') else None)
+        self.update_check_span = self.profiler.begin("update check")
+        self.update_checker.finished.connect(lambda: self.profiler.end(self.update_check_span))
         self.update_checker.start()
     
     def on_no_update(self):
@@ -1569,30 +2310,34 @@ class MainWindow(QMainWindow):
                 self.download_update(latest_version, url, release_data)
     
     def download_update(self, version, url, release_data):
-        """Download the update"""
+        """Download the update in the background"""
+        if self.update_downloader is not None and self.update_downloader.isRunning():
+            return
+        if not self.connectivity.is_online():
+            QMessageBox.warning(self, "Offline", "You're offline. Connect to the internet to download the update.")
+            return
         try:
             # Find the download URL (look for zip or exe files)
             assets = release_data.get('assets', [])
-            download_url = None
-            filename = None
+            selected_asset = None
             
             # Prefer .zip files, then .exe, then any other asset
             for asset in assets:
                 asset_name = asset.get('name', '')
                 if asset_name.endswith('.zip'):
-                    download_url = asset.get('browser_download_url')
-                    filename = asset_name
+                    selected_asset = asset
                     break
-                elif asset_name.endswith('.exe') and not download_url:
-                    download_url = asset.get('browser_download_url')
-                    filename = asset_name
+                elif asset_name.endswith('.exe') and not selected_asset:
+                    selected_asset = asset
             
-            if not download_url and assets:
+            if not selected_asset and assets:
                 # Use first asset as fallback
-                download_url = assets[0].get('browser_download_url')
-                filename = assets[0].get('name', 'update.zip')
+                selected_asset = assets[0]
             
+            download_url = selected_asset.get('browser_download_url') if selected_asset else None
             if download_url:
+                filename = selected_asset.get('name') or 'update.zip'
+                
                 # Download to user's Downloads folder
                 downloads_path = Path.home() / "Downloads"
                 downloads_path.mkdir(exist_ok=True)
@@ -1601,59 +2346,27 @@ class MainWindow(QMainWindow):
                 if hasattr(self.games_tab, 'status_label'):
                     self.games_tab.status_label.setText(f"⬇️ Downloading update {version}...")
                 
-                # Show progress dialog
-                from PyQt6.QtWidgets import QProgressDialog
-                progress = QProgressDialog(f"Downloading {filename}...", "Cancel", 0, 100, self)
-                progress.setWindowTitle("Downloading Update")
-                progress.setWindowModality(Qt.WindowModality.WindowModal)
-                progress.setMinimumDuration(0)
-                progress.show()
-                
-                # Download the file
-                response = requests.get(download_url, stream=True, timeout=60)
-                response.raise_for_status()
-                
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
+                # Verify against the checksum published with the release, if any
+                expected_sha256, checksum_url = FileDownloader.checksum_for_asset(assets, selected_asset)
+                self.update_downloader = FileDownloader(download_url, filepath, expected_sha256, checksum_url,
+                                                        version=version)
                 
-                with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if progress.wasCanceled():
-                            filepath.unlink(missing_ok=True)
-                            progress.close()
-                            if hasattr(self.games_tab, 'status_label'):
-                                self.games_tab.status_label.setText("Download cancelled")
-                            return
-                        
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            if total_size > 0:
-                                progress_value = int((downloaded / total_size) * 100)
-                                progress.setValue(progress_value)
-                
-                progress.close()
-                
-                if hasattr(self.games_tab, 'status_label'):
-                    self.games_tab.status_label.setText(f"✅ Update downloaded to Downloads folder")
-                
-                reply = QMessageBox.question(
-                    self,
-                    "✅ Download Complete",
-                    f"Update {version} has been downloaded to:\n{filepath}\n\nWould you like to open the folder?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    QMessageBox.StandardButton.Yes
-                )
+                # Non-modal progress so the launcher stays usable while downloading
+                from PyQt6.QtWidgets import QProgressDialog
+                self.update_progress = QProgressDialog(f"Downloading {filename}...", "Cancel", 0, 100, self)
+                self.update_progress.setWindowTitle("Downloading Update")
+                self.update_progress.setWindowModality(Qt.WindowModality.NonModal)
+                self.update_progress.setMinimumDuration(0)
+                self.update_progress.setAutoClose(False)
+                self.update_progress.setAutoReset(False)
+                self.update_progress.canceled.connect(self.update_downloader.cancel)
                 
-                if reply == QMessageBox.StandardButton.Yes:
-                    import os
-                    import platform
-                    if platform.system() == "Windows":
-                        os.startfile(filepath.parent)
-                    elif platform.system() == "Darwin":  # macOS
-                        os.system(f"open '{filepath.parent}'")
-                    else:  # Linux
-                        os.system(f"xdg-open '{filepath.parent}'")
+                self.update_downloader.progress.connect(self.on_update_download_progress)
+                self.update_downloader.finished.connect(lambda path: self.on_update_downloaded(version, path))
+                self.update_downloader.cancelled.connect(self.on_update_download_cancelled)
+                self.update_downloader.error.connect(lambda message: self.on_update_download_error(url, message))
+                self.update_downloader.start()
+                self.update_progress.show()
             else:
                 # No downloadable asset, just open the release page
                 QMessageBox.information(
@@ -1663,12 +2376,60 @@ class MainWindow(QMainWindow):
                 )
                 self.open_url(url)
         except Exception as e:
-            QMessageBox.warning(
-                self,
-                "Download Error",
-                f"Failed to download update:\n{str(e)}\n\nOpening release page in browser instead."
-            )
-            self.open_url(url)
+            self.on_update_download_error(url, str(e))
+    
+    def on_update_download_progress(self, downloaded, total):
+        """Show update download progress"""
+        if self.update_progress is not None and total > 0:
+            self.update_progress.setValue(int(downloaded * 100 / total))
+    
+    def close_update_progress(self):
+        """Close the update progress dialog"""
+        if self.update_progress is not None:
+            self.update_progress.close()
+            self.update_progress = None
+    
+    def on_update_download_cancelled(self):
+        """Handle a cancelled update download (the partial file is kept for resuming)"""
+        self.close_update_progress()
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText("Download cancelled")
+    
+    def on_update_download_error(self, url, message):
+        """Handle a failed update download"""
+        self.close_update_progress()
+        QMessageBox.warning(
+            self,
+            "Download Error",
+            f"Failed to download update:\n{message}\n\nOpening release page in browser instead."
+        )
+        self.open_url(url)
+    
+    def on_update_downloaded(self, version, filepath):
+        """Handle a finished and verified update download"""
+        self.close_update_progress()
+        filepath = Path(filepath)
+        
+        if hasattr(self.games_tab, 'status_label'):
+            self.games_tab.status_label.setText(f"✅ Update downloaded to Downloads folder")
+        
+        reply = QMessageBox.question(
+            self,
+            "✅ Download Complete",
+            f"Update {version} has been downloaded to:\n{filepath}\n\nWould you like to open the folder?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            import os
+            import platform
+            if platform.system() == "Windows":
+                os.startfile(filepath.parent)
+            elif platform.system() == "Darwin":  # macOS
+                os.system(f"open '{filepath.parent}'")
+            else:  # Linux
+                os.system(f"xdg-open '{filepath.parent}'")
     
     def open_url(self, url):
         """Open URL in browser"""
@@ -1676,9 +2437,16 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """Handle close event"""
+        self.session_log.end()
         self.game_manager.save_game_data()
         self.save_achievements()
+        self.similarity_index.save()
         self.settings_manager.set('total_xp', self.total_xp)
         self.settings_manager.set('user_level', self.user_level)
+        # Pool threads are joined at exit, so stop long jobs instead of waiting for them
+        for worker in (self.update_downloader, self.stats_export_worker, self.cache_check_worker):
+            if worker is not None:
+                worker.cancel()
+        get_task_runner().shutdown(wait=False, cancel_futures=True)
         event.accept()
 
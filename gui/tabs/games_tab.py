@@ -2,8 +2,8 @@
 from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QListWidget, 
                              QListWidgetItem, QLineEdit, QComboBox, QCheckBox,
                              QLabel, QPushButton, QTextEdit, QSlider, QFrame,
-                             QGroupBox, QSplitter)
-from PyQt6.QtCore import Qt, QSize
+                             QGroupBox, QSplitter, QMenu)
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QPixmap, QIcon, QFont
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
@@ -11,6 +11,11 @@ from PyQt6.QtWebEngineWidgets import QWebEngineView
 class GamesTab(QWidget):
     """Games tab widget"""
     
+    SEARCH_DEBOUNCE_MS = 150
+    PRELOAD_SELECT_DELAY_MS = 150
+    PRELOAD_HOVER_DELAY_MS = 600
+    SORT_POSITION_ROLE = Qt.ItemDataRole.UserRole + 1
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
@@ -41,7 +46,12 @@ class GamesTab(QWidget):
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Search games... (Ctrl+F)")
         self.search_box.setMinimumHeight(32)
-        self.search_box.textChanged.connect(self.filter_games)
+        # Debounce typing so the index is queried once per pause, not per keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_games)
+        self.search_box.textChanged.connect(self.search_timer.start)
         search_container.addWidget(self.search_box)
         left_layout.addLayout(search_container)
         
@@ -110,7 +120,11 @@ class GamesTab(QWidget):
         self.game_list.setIconSize(QSize(56, 56))  # Slightly smaller icons for more items visible
         self.game_list.setSpacing(4)  # Reduced spacing
         self.game_list.itemClicked.connect(self.on_game_selected)
+        self.game_list.setMouseTracking(True)
+        self.game_list.itemEntered.connect(self.on_game_hovered)
         self.game_list.setAlternatingRowColors(True)
+        self.game_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.game_list.customContextMenuRequested.connect(self.show_game_context_menu)
         # Give game list stretch priority so it takes most of the vertical space
         left_layout.addWidget(self.game_list, stretch=10)
         
@@ -228,6 +242,7 @@ class GamesTab(QWidget):
         right_layout.addWidget(web_label)
         
         self.web_view = QWebEngineView()
+        self.main_window.web_profile.attach(self.web_view)
         right_layout.addWidget(self.web_view)
         
         splitter.addWidget(left_panel)
@@ -246,9 +261,11 @@ class GamesTab(QWidget):
         placeholder_pixmap.fill(Qt.GlobalColor.lightGray)
         placeholder_icon = QIcon(placeholder_pixmap)
         
-        for game in games:
+        for position, game in enumerate(games):
             item = QListWidgetItem(placeholder_icon, game.name)
             item.setData(Qt.ItemDataRole.UserRole, game)
+            # Where the chosen sort put the game, so the order comes back when a search is cleared
+            item.setData(self.SORT_POSITION_ROLE, position)
             self.game_list.addItem(item)
     
     def on_game_selected(self, item):
@@ -283,6 +300,15 @@ class GamesTab(QWidget):
         self.favorite_btn.setChecked(game.favorite)
         self.rating_slider.setValue(game.rating)
         self.rating_label.setText(f"{game.rating}/5")
+        
+        # Start loading the game in the background so Play is near instant
+        self.main_window.preloader.schedule(game, self.PRELOAD_SELECT_DELAY_MS)
+    
+    def on_game_hovered(self, item):
+        """Preload a game the pointer rests on"""
+        if self.main_window:
+            game = item.data(Qt.ItemDataRole.UserRole)
+            self.main_window.preloader.schedule(game, self.PRELOAD_HOVER_DELAY_MS, selected=False)
     
     def save_game_notes(self):
         """Save notes for current game - removed notes field in compact layout"""
@@ -307,9 +333,8 @@ class GamesTab(QWidget):
         item = self.game_list.currentItem()
         if item and self.main_window:
             game = item.data(Qt.ItemDataRole.UserRole)
-            game.favorite = self.favorite_btn.isChecked()
+            self.main_window.game_manager.set_favorite(game, self.favorite_btn.isChecked())
             self.main_window.game_manager.save_game_data()
-            self.main_window.update_favorites_list()
             self.main_window.achievement_manager.check_achievements()
     
     def rate_game(self, value):
@@ -320,6 +345,7 @@ class GamesTab(QWidget):
             game.rating = value
             self.rating_label.setText(f"{value}/5")
             self.main_window.game_manager.save_game_data()
+            self.main_window.game_manager.notify(self.main_window.game_manager.STATS_CHANGED, game)
             self.main_window.update_statistics()
             self.main_window.achievement_manager.check_achievements()
     
@@ -330,7 +356,8 @@ class GamesTab(QWidget):
         
         category = self.category_filter.currentText()
         difficulty = self.difficulty_filter.currentText()
-        search_text = self.search_box.text().lower()
+        search_text = self.search_box.text().strip()
+        search_matches = self.main_window.search_index.scores(search_text) if search_text else None
         show_unplayed_only = self.show_unplayed.isChecked()
         show_favorites_only = getattr(self, 'show_favorites_only', None) and self.show_favorites_only.isChecked()
         show_downloaded_only = getattr(self, 'show_downloaded_only', None) and self.show_downloaded_only.isChecked()
@@ -341,13 +368,37 @@ class GamesTab(QWidget):
             
             category_match = category == "All" or game.category == category
             difficulty_match = difficulty == "All" or game.difficulty == difficulty
-            search_match = search_text in game.name.lower() or search_text in game.description.lower()
+            search_match = search_matches is None or game.name in search_matches
             unplayed_match = not show_unplayed_only or game.play_count == 0
             favorites_match = not show_favorites_only or game.favorite
             downloaded_match = not show_downloaded_only or game.is_downloaded
             
             item.setHidden(not (category_match and difficulty_match and search_match and 
                               unplayed_match and favorites_match and downloaded_match))
+        
+        self.order_by_score(search_matches)
+    
+    def order_by_score(self, search_matches):
+        """Put the best search matches first; without a search, restore the chosen sort order"""
+        items = [self.game_list.item(i) for i in range(self.game_list.count())]
+        if search_matches:
+            key = lambda item: (-search_matches.get(item.data(Qt.ItemDataRole.UserRole).name, 0),
+                                item.data(self.SORT_POSITION_ROLE))
+        else:
+            key = lambda item: item.data(self.SORT_POSITION_ROLE)
+        ordered = sorted(items, key=key)
+        if all(a is b for a, b in zip(items, ordered)):
+            return
+        
+        # Taking the items out keeps them (and their icons); only their rows change
+        current = self.game_list.currentItem()
+        while self.game_list.count():
+            self.game_list.takeItem(0)
+        for item in ordered:
+            self.game_list.addItem(item)
+        if current is not None:
+            self.game_list.setCurrentItem(current)
+        self.game_list.scrollToTop()
     
     def sort_games(self, sort_by):
         """Sort games"""
@@ -381,6 +432,27 @@ class GamesTab(QWidget):
         if self.main_window:
             self.main_window.load_icons()
     
+    def show_game_context_menu(self, pos):
+        """Show the context menu for a game in the list"""
+        item = self.game_list.itemAt(pos)
+        if not item or not self.main_window:
+            return
+        game = item.data(Qt.ItemDataRole.UserRole)
+        
+        menu = QMenu(self)
+        similar_action = menu.addAction("🔗 More like this")
+        similar_action.triggered.connect(lambda: self.main_window.show_similar_games(game))
+        
+        allow_ads_action = menu.addAction("🛡️ Allow ads for this game")
+        allow_ads_action.setCheckable(True)
+        allow_ads_action.setChecked(self.main_window.is_ad_blocking_allowed(game))
+        allow_ads_action.toggled.connect(lambda checked: self.main_window.set_ad_blocking_allowed(game, checked))
+        
+        export_action = menu.addAction("📦 Export game pack...")
+        export_action.setEnabled(game.is_downloaded)
+        export_action.triggered.connect(lambda: self.main_window.export_game_pack(game))
+        menu.exec(self.game_list.viewport().mapToGlobal(pos))
+    
     def go_home(self):
         """Go to home screen"""
         if self.main_window:
@@ -0,0 +1 @@
+"""Web engine integration package"""
@@ -0,0 +1,93 @@
+"""Lifecycle management for game pages that are not on screen"""
+import os
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+
+def configure_renderer_memory(settings_manager):
+    """Pass the renderer process and memory budget to Chromium (call before QApplication)"""
+    flags = []
+    process_limit = int(settings_manager.get('renderer_process_limit', 4))
+    if process_limit > 0:
+        flags.append(f"--renderer-process-limit={process_limit}")
+    heap_mb = int(settings_manager.get('renderer_memory_mb', 1024))
+    if heap_mb > 0:
+        flags.append(f"--js-flags=--max-old-space-size={heap_mb}")
+    if not flags:
+        return
+    
+    # Keep any flags the user already set in the environment
+    existing = os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', '')
+    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = " ".join([existing] + flags).strip()
+
+
+class PageLifecycleManager(QObject):
+    """Freezes game views that are hidden and discards them after a while"""
+    
+    def __init__(self, discard_after_minutes=10, parent=None):
+        super().__init__(parent)
+        self.discard_after_ms = int(discard_after_minutes * 60 * 1000)
+        self.enabled = True
+        self.views = {}  # view -> discard timer
+        self.active_view = None
+    
+    def track(self, view):
+        """Start managing a web view"""
+        if view in self.views:
+            return
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self.discard(view))
+        self.views[view] = timer
+        view.destroyed.connect(lambda: self.untrack(view))
+    
+    def untrack(self, view):
+        """Stop managing a web view"""
+        timer = self.views.pop(view, None)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        if self.active_view is view:
+            self.active_view = None
+    
+    def activate(self, view):
+        """Make view the only running page; pass None to suspend every page"""
+        self.active_view = view
+        for tracked in list(self.views):
+            if tracked is view:
+                self.restore(tracked)
+            elif self.enabled:
+                self.suspend(tracked)
+    
+    def suspend(self, view):
+        """Freeze a hidden page so its scripts, timers and audio stop"""
+        page = view.page()
+        if page is None or page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            return
+        page.setAudioMuted(True)
+        # Visible pages cannot be frozen
+        page.setVisible(False)
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+        if self.discard_after_ms > 0:
+            self.views[view].start(self.discard_after_ms)
+    
+    def discard(self, view):
+        """Release a frozen page's renderer memory; it reloads when restored"""
+        page = view.page()
+        if page is None or view is self.active_view:
+            return
+        if page.lifecycleState() == QWebEnginePage.LifecycleState.Frozen:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+    
+    def restore(self, view):
+        """Bring a page back to the active state"""
+        timer = self.views.get(view)
+        if timer is not None:
+            timer.stop()
+        page = view.page()
+        if page is None:
+            return
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        page.setVisible(view.isVisible())
+        page.setAudioMuted(False)
@@ -0,0 +1,97 @@
+"""Serves packed games to the web engine from their memory map"""
+import mimetypes
+import re
+from pathlib import Path
+from PyQt6.QtCore import QIODevice, QBuffer, QByteArray, QUrl
+from PyQt6.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+
+from core.game_pack import PACK_EXTENSION
+
+
+PACK_SCHEME = b'papas-pack'
+PACK_ID_PATTERN = re.compile(r'[0-9a-f]{32}')  # pack files are named after the game URL's hash
+
+
+def register_pack_scheme():
+    """Register the pack URL scheme; must run before the QApplication is created"""
+    scheme = QWebEngineUrlScheme(PACK_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    # Secure and CORS-enabled so games get the same APIs they have on their own site
+    scheme.setFlags(QWebEngineUrlScheme.Flag.SecureScheme
+                    | QWebEngineUrlScheme.Flag.CorsEnabled
+                    | QWebEngineUrlScheme.Flag.FetchApiAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class _MappedFileDevice(QIODevice):
+    """Read-only device over a memoryview of the mapped pack
+    
+    Files are never loaded whole; each read copies just the chunk the web engine
+    asks for, since PyQt hands readData() results back as new bytes.
+    """
+    
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.open(QIODevice.OpenModeFlag.ReadOnly)
+        if parent is not None:
+            # The engine may drop the job without closing us; the pack cannot be closed until the view goes
+            parent.destroyed.connect(lambda: view.release())
+    
+    def isSequential(self):
+        return False
+    
+    def size(self):
+        return len(self.view)
+    
+    def readData(self, maxlen):
+        start = self.pos()
+        return bytes(self.view[start:start + maxlen])
+    
+    def writeData(self, data):
+        return -1
+    
+    def close(self):
+        super().close()
+        self.view.release()
+
+
+class PackSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Answers papas-pack://<pack>/<file> requests from the packs in the download cache"""
+    
+    def __init__(self, download_manager, parent=None):
+        super().__init__(parent)
+        self.download_manager = download_manager
+    
+    @staticmethod
+    def url_for(pack_path, name="index.html"):
+        """URL that loads a file from a pack"""
+        return QUrl(f"{PACK_SCHEME.decode()}://{Path(pack_path).stem}/{name}")
+    
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        if not PACK_ID_PATTERN.fullmatch(url.host()):
+            job.fail(QWebEngineUrlRequestJob.Error.UrlInvalid)
+            return
+        pack_path = self.download_manager.cache_dir / f"{url.host()}{PACK_EXTENSION}"
+        name = url.path(QUrl.ComponentFormattingOption.FullyDecoded).lstrip('/') or "index.html"
+        try:
+            pack = self.download_manager.open_pack(pack_path)
+            if name not in pack:
+                job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+                return
+            data = pack.read(name)
+        except Exception as e:
+            print(f"Error serving {url.toString()}: {e}")
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+        
+        content_type = (mimetypes.guess_type(name)[0] or 'application/octet-stream').encode()
+        if isinstance(data, memoryview):
+            device = _MappedFileDevice(data, job)
+        else:
+            # Compressed entries were decompressed into new bytes anyway
+            device = QBuffer(job)
+            device.setData(QByteArray(data))
+            device.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(content_type, device)
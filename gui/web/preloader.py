@@ -0,0 +1,114 @@
+"""Speculative loading of the game the user is about to play"""
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QTimer, QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+
+class GamePreloader(QObject):
+    """Loads a selected or hovered game into a hidden page so Play can show it at once"""
+    
+    def __init__(self, web_profile, max_pages=1, parent=None, connectivity=None):
+        super().__init__(parent)
+        self.web_profile = web_profile
+        self.connectivity = connectivity  # optional ConnectivityMonitor
+        self.max_pages = max_pages
+        self.enabled = True
+        self.pages = OrderedDict()  # game name -> hidden page, oldest first
+        self.ready = set()  # names of games whose page finished loading
+        self.pending_game = None
+        self.pending_selected = False
+        
+        self.dwell_timer = QTimer(self)
+        self.dwell_timer.setSingleShot(True)
+        self.dwell_timer.timeout.connect(self.start_pending)
+    
+    def schedule(self, game, delay_ms=400, selected=True):
+        """Preload game if it stays selected or hovered for delay_ms"""
+        self.dwell_timer.stop()
+        self.pending_game = None
+        # A new selection cancels unfinished loads; hovering never does
+        if selected:
+            self.cancel_loading(keep=game.name)
+        if not self.enabled or self.max_pages <= 0 or game.is_downloaded or game.name in self.pages:
+            return
+        if self.connectivity is not None and not self.connectivity.is_online():
+            return
+        self.pending_game = game
+        self.pending_selected = selected
+        self.dwell_timer.start(delay_ms)
+    
+    def cancel(self):
+        """Forget the pending game and stop pages that are still loading"""
+        self.dwell_timer.stop()
+        self.pending_game = None
+        self.cancel_loading()
+    
+    def cancel_loading(self, keep=None):
+        """Drop pages that have not finished loading, except the one for keep"""
+        for name in [name for name in self.pages if name not in self.ready and name != keep]:
+            self.drop(name)
+    
+    def drop(self, name):
+        """Delete the hidden page for a game"""
+        page = self.pages.pop(name, None)
+        self.ready.discard(name)
+        if page is not None:
+            page.triggerAction(QWebEnginePage.WebAction.Stop)
+            page.deleteLater()
+    
+    def clear(self):
+        """Delete every hidden page"""
+        self.cancel()
+        for name in list(self.pages):
+            self.drop(name)
+    
+    def start_pending(self):
+        """Start loading the game that has been selected long enough"""
+        game, self.pending_game = self.pending_game, None
+        if game is None or game.name in self.pages:
+            return
+        
+        # Stay within the page budget; only a selection may evict the oldest preloaded game
+        if len(self.pages) >= self.max_pages and not self.pending_selected:
+            return
+        while len(self.pages) >= self.max_pages:
+            self.drop(next(iter(self.pages)))
+        
+        page = self.web_profile.create_page(self)
+        page.setAudioMuted(True)
+        page.setVisible(False)
+        page.loadFinished.connect(lambda ok, name=game.name, page=page: self.on_load_finished(name, page, ok))
+        self.pages[game.name] = page
+        page.setUrl(QUrl(game.url))
+    
+    def on_load_finished(self, name, page, ok):
+        """Freeze a preloaded page once it has loaded, or drop it if loading failed"""
+        # Ignore pages that were dropped or already handed to a view
+        if self.pages.get(name) is not page:
+            return
+        if not ok:
+            self.drop(name)
+            return
+        self.ready.add(name)
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+    
+    def take_page(self, game):
+        """Hand over the preloaded page for game, or None if there is none"""
+        self.dwell_timer.stop()
+        page = self.pages.pop(game.name, None)
+        self.ready.discard(game.name)
+        if page is None:
+            return None
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        page.setAudioMuted(False)
+        return page
+    
+    def load_into(self, view, game):
+        """Show game's preloaded page in view; returns False if it was not preloaded"""
+        page = self.take_page(game)
+        if page is None:
+            return False
+        # The view now owns the page and deletes its previous one
+        page.setParent(view)
+        view.setPage(page)
+        return True
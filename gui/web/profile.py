@@ -0,0 +1,60 @@
+"""Persistent web engine profile shared by all game views"""
+import os
+from pathlib import Path
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+
+
+class GameWebProfile:
+    """Named on-disk profile so game bundles, cookies and saves survive restarts"""
+    
+    PROFILE_NAME = "papas_launcher"
+    
+    CACHE_TYPES = {
+        'disk': QWebEngineProfile.HttpCacheType.DiskHttpCache,
+        'memory': QWebEngineProfile.HttpCacheType.MemoryHttpCache,
+        'none': QWebEngineProfile.HttpCacheType.NoCache,
+    }
+    
+    def __init__(self, settings_manager):
+        self.settings_manager = settings_manager
+        self.root = Path(settings_manager.data_dir) / "web_profile"
+        self.root.mkdir(parents=True, exist_ok=True)
+        
+        # Parented to the application so it outlives every page that uses it
+        self.profile = QWebEngineProfile(self.PROFILE_NAME, QApplication.instance())
+        self.profile.setPersistentStoragePath(str(self.root / "storage"))
+        self.profile.setCachePath(str(self.root / "cache"))
+        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
+        self.apply_settings()
+    
+    def apply_settings(self):
+        """Apply the cache type and size from settings"""
+        cache_type = self.settings_manager.get('http_cache_type', 'disk')
+        self.profile.setHttpCacheType(self.CACHE_TYPES.get(cache_type, self.CACHE_TYPES['disk']))
+        # 0 lets Chromium pick the size itself
+        size_mb = max(0, int(self.settings_manager.get('http_cache_size_mb', 1024)))
+        self.profile.setHttpCacheMaximumSize(size_mb * 1024 * 1024)
+    
+    def create_page(self, parent=None):
+        """Create a page that uses this profile"""
+        return QWebEnginePage(self.profile, parent)
+    
+    def attach(self, view):
+        """Make a web view load through this profile"""
+        view.setPage(self.create_page(view))
+    
+    def cache_usage(self):
+        """Get the size of the HTTP cache on disk in bytes"""
+        total = 0
+        for dirpath, _, filenames in os.walk(self.profile.cachePath()):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return total
+    
+    def clear_cache(self):
+        """Clear the HTTP cache (cookies and game saves are kept)"""
+        self.profile.clearHttpCache()
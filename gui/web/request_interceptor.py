@@ -0,0 +1,57 @@
+"""Request interceptor for game pages"""
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
+from gui.web.pack_scheme import PACK_SCHEME
+
+
+class AdBlockInterceptor(QWebEngineUrlRequestInterceptor):
+    """Blocks ad and analytics requests matched by a UrlFilter"""
+    
+    URL_KEY_OPTIONS = (QUrl.UrlFormattingOption.RemoveQuery |
+                       QUrl.UrlFormattingOption.RemoveFragment |
+                       QUrl.UrlFormattingOption.StripTrailingSlash)
+    
+    def __init__(self, url_filter, parent=None):
+        super().__init__(parent)
+        self.url_filter = url_filter
+        self.enabled = True
+        self.game_urls = {}  # game page url -> game name
+        self.pack_hosts = {}  # papas-pack:// host -> game name, for downloaded games
+        self.blocked_counts = {}  # game name or page host -> blocked requests
+        self.total_blocked = 0
+    
+    def set_games(self, games, url_hash=None):
+        """Set the games whose pages get per-game overrides and counters
+        
+        url_hash maps a game URL to the host its pack is served under, e.g.
+        DownloadManager.get_url_hash, so packed games are recognised too.
+        """
+        self.game_urls = {QUrl(game.url).toString(self.URL_KEY_OPTIONS): game.name for game in games}
+        self.pack_hosts = {url_hash(game.url): game.name for game in games} if url_hash else {}
+    
+    def game_for_page(self, page_url):
+        """Get the name of the game a page belongs to, if any"""
+        if page_url.scheme() == PACK_SCHEME.decode():
+            return self.pack_hosts.get(page_url.host())
+        return self.game_urls.get(page_url.toString(self.URL_KEY_OPTIONS))
+    
+    def interceptRequest(self, info):
+        """Block the request if the filter matches it"""
+        if not self.enabled:
+            return
+        if info.resourceType() == QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            return
+        
+        page_url = info.firstPartyUrl()
+        game_name = self.game_for_page(page_url)
+        if self.url_filter.should_block(info.requestUrl().toString(), game_name):
+            info.block(True)
+            key = game_name or page_url.host()
+            self.blocked_counts[key] = self.blocked_counts.get(key, 0) + 1
+            self.total_blocked += 1
+    
+    def reset_counters(self):
+        """Reset the blocked request counters"""
+        self.blocked_counts = {}
+        self.total_blocked = 0
@@ -2,14 +2,133 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWebEngineCore import QWebEngineScript, QWebEngineSettings
 from PyQt6.QtGui import QKeySequence, QShortcut
 
 
 class FullscreenGameWindow(QWidget):
     """Fullscreen window for playing games"""
     closed = pyqtSignal()
+    screenshot_requested = pyqtSignal()
+    burst_requested = pyqtSignal()
     
-    def __init__(self, parent=None):
+    # Installed into every frame at DOMContentLoaded. It waits for the game canvas to be
+    # added instead of polling and requests fullscreen on it. A rejected request (say the
+    # canvas is not attached or sized yet) is retried every 500 ms, up to 10 times.
+    FULLSCREEN_SCRIPT_NAME = "papas_fullscreen"
+    FULLSCREEN_SCRIPT = """
+    (function() {
+        if (window.__papasFullscreen) {
+            return;
+        }
+        var RETRY_MS = 500;
+        var MAX_ATTEMPTS = 10;
+        var attempts = 0;
+        var done = false;
+        var pending = false;  // a request has been made and has not settled yet
+        var retryTimer = null;
+        var lastCanvas = null;
+        
+        function stopObserving() {
+            observer.disconnect();
+        }
+        
+        function startObserving() {
+            observer.observe(document.documentElement, {childList: true, subtree: true});
+        }
+        
+        function finish() {
+            done = true;
+            pending = false;
+            stopObserving();
+            clearTimeout(retryTimer);
+            document.removeEventListener('fullscreenchange', onFullscreenChange);
+            document.removeEventListener('fullscreenerror', onFailed);
+        }
+        
+        function onFullscreenChange() {
+            if (document.fullscreenElement) {
+                finish();
+            }
+        }
+        
+        function onFailed(err) {
+            if (done || !pending) {
+                return;
+            }
+            pending = false;
+            console.log('Canvas fullscreen failed:', err);
+            if (attempts >= MAX_ATTEMPTS) {
+                finish();
+                return;
+            }
+            // A new canvas may turn up, or the same one may be ready a little later
+            startObserving();
+            clearTimeout(retryTimer);
+            retryTimer = setTimeout(function() { check(null); }, RETRY_MS);
+        }
+        
+        function enterFullscreen(element) {
+            var request = element.requestFullscreen || element.webkitRequestFullscreen;
+            if (!request) {
+                return;
+            }
+            attempts++;
+            pending = true;
+            stopObserving();
+            try {
+                var result = request.call(element);
+                if (result && result.then) {
+                    result.then(finish, onFailed);
+                }
+                // Prefixed requests return nothing and report through the events instead
+            } catch(err) {
+                onFailed(err);
+            }
+        }
+        
+        function check(canvas) {
+            if (done || pending) {
+                return;
+            }
+            if (document.fullscreenElement) {
+                finish();
+                return;
+            }
+            if (!canvas) {
+                canvas = lastCanvas && lastCanvas.isConnected ? lastCanvas : document.querySelector('canvas');
+            }
+            if (canvas) {
+                lastCanvas = canvas;
+                enterFullscreen(canvas);
+            }
+        }
+        
+        // Only look at nodes that were just added, never rescan the whole document
+        var observer = new MutationObserver(function(mutations) {
+            for (var i = 0; i < mutations.length; i++) {
+                var added = mutations[i].addedNodes;
+                for (var j = 0; j < added.length; j++) {
+                    var node = added[j];
+                    var canvas = node.nodeName === 'CANVAS' ? node :
+                        (node.querySelector ? node.querySelector('canvas') : null);
+                    if (canvas) {
+                        check(canvas);
+                        return;
+                    }
+                }
+            }
+        });
+        document.addEventListener('fullscreenchange', onFullscreenChange);
+        document.addEventListener('fullscreenerror', onFailed);
+        startObserving();
+        
+        window.__papasFullscreen = function() { check(null); };
+        check(null);
+    })();
+    """
+    
+    def __init__(self, parent=None, web_profile=None):
         super().__init__(parent)
         # Use proper fullscreen window flags
         self.setWindowFlags(
@@ -53,15 +172,21 @@ class FullscreenGameWindow(QWidget):
         
         # Web view - make it fill the entire screen
         self.web_view = QWebEngineView()
+        if web_profile is not None:
+            web_profile.attach(self.web_view)
         self.web_view.setSizePolicy(
             Qt.SizePolicy.Policy.Expanding,
             Qt.SizePolicy.Policy.Expanding
         )
         layout.addWidget(self.web_view, stretch=1)
+        self.install_fullscreen_script()
+        self.web_view.loadFinished.connect(self.on_load_finished)
         
         # Shortcuts
         QShortcut(QKeySequence("Escape"), self, self.close)
         QShortcut(QKeySequence("F11"), self, self.toggle_fullscreen)
+        QShortcut(QKeySequence("F12"), self, self.screenshot_requested.emit)
+        QShortcut(QKeySequence("Shift+F12"), self, self.burst_requested.emit)
         
         # Mouse tracking for showing/hiding top bar
         self.setMouseTracking(True)
@@ -75,110 +200,44 @@ class FullscreenGameWindow(QWidget):
         self.cursor_timer.timeout.connect(self.hide_cursor)
         self.last_mouse_move = None
     
+    def install_fullscreen_script(self, run_now=False):
+        """Install the fullscreen script and accept fullscreen requests on the current page"""
+        page = self.web_view.page()
+        page.settings().setAttribute(QWebEngineSettings.WebAttribute.FullScreenSupportEnabled, True)
+        page.fullScreenRequested.connect(lambda request: request.accept())
+        
+        scripts = page.scripts()
+        for script in scripts.find(self.FULLSCREEN_SCRIPT_NAME):
+            scripts.remove(script)
+        script = QWebEngineScript()
+        script.setName(self.FULLSCREEN_SCRIPT_NAME)
+        script.setSourceCode(self.FULLSCREEN_SCRIPT)
+        script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+        script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+        script.setRunsOnSubFrames(True)
+        scripts.insert(script)
+        if run_now:
+            page.runJavaScript(self.FULLSCREEN_SCRIPT, QWebEngineScript.ScriptWorldId.ApplicationWorld)
+    
     def set_url(self, url):
         """Set the URL to load"""
         self.web_view.setUrl(url)
-        # Try to trigger fullscreen in the web content after page loads
-        QTimer.singleShot(2000, self.request_game_fullscreen)
     
     def set_html(self, html):
         """Set HTML content"""
         self.web_view.setHtml(html)
-        # Try to trigger fullscreen in the web content after page loads
-        QTimer.singleShot(2000, self.request_game_fullscreen)
+    
+    def on_load_finished(self, ok):
+        """Check once for a game canvas when the page has loaded"""
+        if ok:
+            self.request_game_fullscreen()
     
     def request_game_fullscreen(self):
         """Request fullscreen mode for the game content"""
-        # Inject JavaScript to request fullscreen on the game canvas/container
-        fullscreen_script = """
-        (function() {
-            // Try to find and request fullscreen on common game containers
-            function requestFullscreen() {
-                // Try canvas elements first (common in HTML5 games)
-                var canvases = document.querySelectorAll('canvas');
-                for (var i = 0; i < canvases.length; i++) {
-                    var canvas = canvases[i];
-                    if (canvas && (canvas.requestFullscreen || canvas.webkitRequestFullscreen || canvas.mozRequestFullScreen || canvas.msRequestFullscreen)) {
-                        try {
-                            if (canvas.requestFullscreen) {
-                                canvas.requestFullscreen();
-                            } else if (canvas.webkitRequestFullscreen) {
-                                canvas.webkitRequestFullscreen();
-                            } else if (canvas.mozRequestFullScreen) {
-                                canvas.mozRequestFullScreen();
-                            } else if (canvas.msRequestFullscreen) {
-                                canvas.msRequestFullscreen();
-                            }
-                            console.log('Canvas fullscreen requested');
-                            return;
-                        } catch(err) {
-                            console.log('Canvas fullscreen failed:', err);
-                        }
-                    }
-                }
-                
-                // Try iframe
-                var iframes = document.querySelectorAll('iframe');
-                for (var i = 0; i < iframes.length; i++) {
-                    var iframe = iframes[i];
-                    try {
-                        if (iframe.contentDocument || iframe.contentWindow) {
-                            var doc = iframe.contentDocument || iframe.contentWindow.document;
-                            var iframeCanvas = doc.querySelector('canvas');
-                            if (iframeCanvas && iframeCanvas.requestFullscreen) {
-                                iframeCanvas.requestFullscreen();
-                                console.log('Iframe canvas fullscreen requested');
-                                return;
-                            }
-                        }
-                    } catch(e) {
-                        console.log('Iframe access error:', e);
-                    }
-                }
-                
-                // Try game container divs
-                var gameContainers = document.querySelectorAll('[id*="game"], [class*="game"], [id*="canvas"], [class*="canvas"]');
-                for (var i = 0; i < gameContainers.length; i++) {
-                    var container = gameContainers[i];
-                    if (container && container.requestFullscreen) {
-                        try {
-                            container.requestFullscreen();
-                            console.log('Game container fullscreen requested');
-                            return;
-                        } catch(err) {
-                            console.log('Container fullscreen failed:', err);
-                        }
-                    }
-                }
-                
-                // Try body or main container as last resort
-                var body = document.body;
-                if (body && (body.requestFullscreen || body.webkitRequestFullscreen)) {
-                    try {
-                        if (body.requestFullscreen) {
-                            body.requestFullscreen();
-                        } else if (body.webkitRequestFullscreen) {
-                            body.webkitRequestFullscreen();
-                        }
-                        console.log('Body fullscreen requested');
-                    } catch(err) {
-                        console.log('Body fullscreen failed:', err);
-                    }
-                }
-            }
-            
-            // Try immediately
-            requestFullscreen();
-            
-            // Also try after delays in case elements load later
-            setTimeout(requestFullscreen, 500);
-            setTimeout(requestFullscreen, 1000);
-            setTimeout(requestFullscreen, 2000);
-            setTimeout(requestFullscreen, 3000);
-            setTimeout(requestFullscreen, 5000);
-        })();
-        """
-        self.web_view.page().runJavaScript(fullscreen_script)
+        self.web_view.page().runJavaScript(
+            "window.__papasFullscreen && window.__papasFullscreen();",
+            QWebEngineScript.ScriptWorldId.ApplicationWorld
+        )
     
     def showEvent(self, event):
         """Show fullscreen on show"""
@@ -0,0 +1 @@
+"""Command-line tools for managing the launcher without its GUI"""
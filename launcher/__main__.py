@@ -0,0 +1,11 @@
+"""Entry point for python -m launcher"""
+import multiprocessing
+import sys
+
+from launcher.cli import main
+
+
+if __name__ == '__main__':
+    # Bulk downloads parse pages in worker processes
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Headless command-line interface: downloads, cache upkeep and stats export without Qt"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from core.download_manager import DownloadManager
+from core.game_manager import GameManager
+from core.http_client import get_http_client
+from core.session_log import SessionLog
+from core.settings_manager import DATA_DIR_ENV, SettingsManager
+
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # the command ran, but something did not work, e.g. a download or a damaged game
+EXIT_USAGE = 2  # bad arguments; also what argparse exits with
+
+
+class UsageError(Exception):
+    """Bad arguments, e.g. an unknown game or a count below 1"""
+    
+    def __init__(self, message, parser=None):
+        super().__init__(message)
+        self.parser = parser  # the (sub)command parser whose usage to show
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    """Raises UsageError instead of exiting, so main() can report it as JSON"""
+    
+    def error(self, message):
+        raise UsageError(message, self)
+
+
+class Library:
+    """The launcher's data, loaded lazily so each command only pays for what it uses"""
+    
+    def __init__(self, data_dir=None):
+        self.settings = SettingsManager(data_dir)
+        self.games = GameManager(self.settings)
+        self._downloads = None
+    
+    @property
+    def downloads(self):
+        if self._downloads is None:
+            get_http_client().set_bandwidth_limit(self.settings.get('max_download_kbps', 0) * 1024)
+            self._downloads = DownloadManager(self.settings.get_cache_dir(),
+                                              pack_games=self.settings.get('pack_downloaded_games', True),
+                                              blob_cache_mb=0)
+        return self._downloads
+    
+    def session_log(self):
+        return SessionLog(self.settings.data_dir / "sessions.jsonl")
+    
+    def find_games(self, names):
+        """Games matching names or URLs, case-insensitively; raises UsageError for unknown ones"""
+        by_key = {}
+        for game in self.games.games:
+            by_key[game.name.lower()] = game
+            by_key[game.url.lower()] = game
+        unknown = [name for name in names if name.lower() not in by_key]
+        if unknown:
+            raise UsageError(f"Unknown game: {', '.join(unknown)}")
+        return list({id(game): game for game in (by_key[name.lower()] for name in names)}.values())
+    
+    def name_of(self, url):
+        return next((game.name for game in self.games.games if game.url == url), url)
+
+
+def _int_at_least(minimum):
+    """argparse type for whole numbers of at least minimum"""
+    def parse(text):
+        try:
+            value = int(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"not a number: {text}")
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}: {text}")
+        return value
+    return parse
+
+
+positive_int = _int_at_least(1)
+non_negative_int = _int_at_least(0)
+
+
+def _download(library, games, jobs):
+    """Download games in parallel and record them in the library"""
+    library.downloads.engine.max_pages = jobs
+    results = library.downloads.download_many([game.url for game in games]) if games else {}
+    downloaded, failed = [], {}
+    for game in games:
+        result = results[game.url]
+        if result['success']:
+            game.local_path = str(result['local_path'])
+            game.is_downloaded = True
+            downloaded.append(game.name)
+        else:
+            failed[game.name] = result.get('error', 'Unknown error')
+    library.games.save_game_data()
+    
+    payload = {'downloaded': downloaded, 'failed': failed}
+    lines = [f"✅ {name}" for name in downloaded] + [f"❌ {name}: {error}" for name, error in failed.items()]
+    lines.append(f"{len(downloaded)} downloaded, {len(failed)} failed")
+    return (EXIT_FAILED if failed else EXIT_OK), payload, lines
+
+
+def cmd_download(library, args):
+    """Download (or re-download) the named games"""
+    if not args.games and not args.all:
+        raise UsageError("Name at least one game, or use --all")
+    games = list(library.games.games) if args.all else library.find_games(args.games)
+    return _download(library, games, args.jobs)
+
+
+def cmd_prefetch(library, args):
+    """Download games that are not downloaded yet, favourites and most played first"""
+    games = [game for game in library.games.games if not library.downloads.is_downloaded(game.url)]
+    games.sort(key=lambda game: (not game.favorite, -game.play_count))
+    if args.limit:
+        games = games[:args.limit]
+    return _download(library, games, args.jobs)
+
+
+def cmd_verify(library, args):
+    """Check downloaded games against their manifests, optionally repairing them"""
+    urls = [game.url for game in library.find_games(args.games)] if args.games else None
+    reports = library.downloads.verify_cache(urls, args.workers)
+    if args.repair:
+        reports = [library.downloads.repair_game(report['url'])
+                   if report['status'] != 'ok' and report['url'] else report
+                   for report in reports]
+        if library.games.sync_downloads(library.downloads):
+            library.games.save_game_data()
+    
+    lines = []
+    failed = 0
+    for report in reports:
+        report['game'] = library.name_of(report['url']) if report['url'] else None
+        label = report['game'] or Path(report['path']).name
+        bad = report['status'] in ('damaged', 'unreadable') or report['missing']
+        failed += bool(bad)
+        if report['status'] == 'ok':
+            detail = f"{report['files']} files ok"
+        elif report['status'] == 'unverified' and not bad:
+            detail = "no manifest; run 'migrate' to add one"
+        else:
+            detail = report['error'] or f"{len(report['missing'])} missing, {len(report['corrupt'])} damaged"
+        lines.append(f"{'✅' if not bad else '❌'} {label}: {detail}")
+    lines.append(f"{len(reports) - failed} of {len(reports)} games intact")
+    return (EXIT_FAILED if failed else EXIT_OK), {'games': reports, 'failed': failed}, lines
+
+
+def cmd_prune(library, args):
+    """Remove cache entries that no game uses, broken packs and partial files"""
+    removed = library.downloads.prune_cache([game.url for game in library.games.games], args.dry_run)
+    if not args.dry_run and library.games.sync_downloads(library.downloads):
+        library.games.save_game_data()
+    freed = sum(entry['size'] for entry in removed)
+    lines = [f"{'Would remove' if args.dry_run else 'Removed'} {Path(entry['path']).name} ({entry['reason']})"
+             for entry in removed]
+    lines.append(f"{freed / (1024 * 1024):.1f} MB {'would be ' if args.dry_run else ''}freed")
+    return EXIT_OK, {'removed': removed, 'freed_bytes': freed, 'dry_run': args.dry_run}, lines
+
+
+def cmd_export_stats(library, args):
+    """Write play statistics to a file"""
+    # Imported here because it pulls in numpy, which no other command needs
+    from core.stats_exporter import StatsExporter
+    fmt = args.format or Path(args.path).suffix.lstrip('.').lower() or 'csv'
+    if fmt not in StatsExporter.available_formats():
+        raise UsageError(f"Cannot write {fmt}; available formats: {', '.join(StatsExporter.available_formats())}")
+    exporter = StatsExporter(library.session_log(), list(library.games.games))
+    rows = exporter.export(args.path, fmt, args.what)
+    return EXIT_OK, {'path': str(args.path), 'format': fmt, 'what': args.what, 'rows': rows}, \
+        [f"Exported {rows:,} rows to {args.path}"]
+
+
+def cmd_migrate(library, args):
+    """Upgrade downloaded games to the current cache format and fix the library's download records"""
+    migrated = {}
+    for game in library.games.games:
+        steps = library.downloads.migrate_game(game.url)
+        if steps:
+            migrated[game.name] = steps
+    library_updated = library.games.sync_downloads(library.downloads)
+    if library_updated:
+        library.games.save_game_data()
+    lines = [f"{name}: {', '.join(steps)}" for name, steps in migrated.items()]
+    if library_updated:
+        lines.append("Updated download records in the library")
+    lines.append(f"{len(migrated)} games migrated")
+    return EXIT_OK, {'migrated': migrated, 'library_updated': library_updated}, lines
+
+
+def cmd_cache_info(library, args):
+    """Show how much the offline cache holds"""
+    info = library.downloads.get_cache_info()
+    info['cache_dir'] = str(library.downloads.cache_dir)
+    for entry in info['games']:
+        entry['game'] = next((game.name for game in library.games.games
+                              if library.downloads.get_url_hash(game.url) == Path(entry['path']).stem), None)
+    lines = [f"{entry['game'] or Path(entry['path']).name}: {entry['size_mb']:.1f} MB" for entry in info['games']]
+    lines.append(f"{info['count']} games, {info['total_size_mb']:.1f} MB on disk "
+                 f"({info['total_original_size'] / (1024 * 1024):.1f} MB uncompressed) in {info['cache_dir']}")
+    return EXIT_OK, info, lines
+
+
+def build_parser():
+    """Argument parser for every subcommand"""
+    parser = ArgumentParser(prog='python -m launcher',
+                            description="Manage Papa's Games Launcher without its window.")
+    parser.add_argument('--json', action='store_true', help="print one JSON document instead of text")
+    parser.add_argument('--data-dir', help=f"launcher data folder (default: ${DATA_DIR_ENV} or ~/.papas_launcher)")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+    
+    download = commands.add_parser('download', help=cmd_download.__doc__)
+    download.add_argument('games', nargs='*', help="game names or URLs")
+    download.add_argument('--all', action='store_true', help="every game in the library")
+    download.add_argument('-j', '--jobs', type=positive_int, default=4, help="games to download at once (default 4)")
+    download.set_defaults(func=cmd_download)
+    
+    prefetch = commands.add_parser('prefetch', help=cmd_prefetch.__doc__)
+    prefetch.add_argument('-n', '--limit', type=non_negative_int, default=0,
+                          help="download at most this many games (default 0: all)")
+    prefetch.add_argument('-j', '--jobs', type=positive_int, default=4, help="games to download at once (default 4)")
+    prefetch.set_defaults(func=cmd_prefetch)
+    
+    verify = commands.add_parser('verify', help=cmd_verify.__doc__)
+    verify.add_argument('games', nargs='*', help="game names or URLs (default: the whole cache)")
+    verify.add_argument('--repair', action='store_true', help="download missing or damaged files again")
+    verify.add_argument('--workers', type=positive_int, default=None, help="hashing threads")
+    verify.set_defaults(func=cmd_verify)
+    
+    prune = commands.add_parser('prune', help=cmd_prune.__doc__)
+    prune.add_argument('--dry-run', action='store_true', help="only list what would be removed")
+    prune.set_defaults(func=cmd_prune)
+    
+    export_stats = commands.add_parser('export-stats', help=cmd_export_stats.__doc__)
+    export_stats.add_argument('path', help="output file")
+    # Checked by cmd_export_stats, which reports the formats this install can write
+    export_stats.add_argument('--format', help="file format, e.g. csv or jsonl (default: from the file extension, else csv)")
+    export_stats.add_argument('--what', choices=['sessions', 'games'], default='sessions',
+                              help="session history or per-game totals")
+    export_stats.set_defaults(func=cmd_export_stats)
+    
+    migrate = commands.add_parser('migrate', help=cmd_migrate.__doc__)
+    migrate.set_defaults(func=cmd_migrate)
+    
+    cache_info = commands.add_parser('cache-info', help=cmd_cache_info.__doc__)
+    cache_info.set_defaults(func=cmd_cache_info)
+    return parser
+
+
+def main(argv=None):
+    """Run one command; returns the process exit code"""
+    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Known before parsing, so argparse's own errors can be reported as JSON too
+    as_json = '--json' in argv
+    try:
+        args = parser.parse_args(argv)
+        code, payload, lines = args.func(Library(args.data_dir), args)
+    except UsageError as e:
+        if as_json:
+            print(json.dumps({'error': str(e)}))
+        else:
+            usage_parser = e.parser or parser
+            usage_parser.print_usage(sys.stderr)
+            print(f"{usage_parser.prog}: error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except Exception as e:
+        if as_json:
+            print(json.dumps({'error': str(e)}))
+        else:
+            print(f"error: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    
+    if as_json:
+        print(json.dumps(payload, indent=2, default=str))
+    else:
+        for line in lines:
+            print(line)
+    return code
@@ -1,21 +1,53 @@
 """Main entry point for Papa's Games Launcher"""
 import sys
-from PyQt6.QtWidgets import QApplication
-from gui.main_window import MainWindow
+import multiprocessing
+from core.startup_profiler import get_startup_profiler
+
+profiler = get_startup_profiler()
+if __name__ == '__main__':
+    # Enabled before the heavy imports below so they show up in the trace
+    sys.argv = profiler.configure(sys.argv)
+
+with profiler.span("import PyQt6"):
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+with profiler.span("import launcher"):
+    from core.settings_manager import SettingsManager
+    from gui.main_window import MainWindow
+    from gui.web.lifecycle import configure_renderer_memory
+    from gui.web.pack_scheme import register_pack_scheme
+
+# How long to wait for icons and the update check before writing the trace anyway
+PROFILE_TIMEOUT_MS = 15000
 
 
 def main():
     """Main function"""
-    app = QApplication(sys.argv)
-    app.setApplicationName("Papa's Games Launcher")
-    app.setOrganizationName("sugarypumpkin822")
+    with profiler.span("configure Chromium"):
+        # Chromium reads its flags once, so the memory budget must be set before QApplication
+        configure_renderer_memory(SettingsManager())
+        # Custom URL schemes must also be registered before QApplication
+        register_pack_scheme()
     
-    window = MainWindow()
-    window.show()
+    with profiler.span("QApplication"):
+        app = QApplication(sys.argv)
+        app.setApplicationName("Papa's Games Launcher")
+        app.setOrganizationName("sugarypumpkin822")
+    
+    with profiler.span("MainWindow"):
+        window = MainWindow()
+    with profiler.span("show"):
+        window.show()
+    
+    if profiler.enabled:
+        # The first zero timer fires once the event loop has painted the window
+        QTimer.singleShot(0, lambda: (profiler.mark("first frame"), profiler.request_finish()))
+        QTimer.singleShot(PROFILE_TIMEOUT_MS, profiler.finish)
     
     sys.exit(app.exec())
 
 
 if __name__ == '__main__':
+    # Bulk downloads parse pages in worker processes, which frozen builds must support
+    multiprocessing.freeze_support()
     main()
-
@@ -37,13 +37,37 @@ def build_exe():
         # Hidden imports that might not be detected automatically
         '--hidden-import=core',
         '--hidden-import=core.achievement_manager',
+        '--hidden-import=core.asset_naming',
+        '--hidden-import=core.async_downloader',
+        '--hidden-import=core.cache_manifest',
+        '--hidden-import=core.compression',
+        '--hidden-import=core.connectivity',
         '--hidden-import=core.download_manager',
         '--hidden-import=core.game_manager',
+        '--hidden-import=core.game_pack',
+        '--hidden-import=core.html_rewriter',
+        '--hidden-import=core.http_client',
+        '--hidden-import=core.page_parser',
+        '--hidden-import=core.recommendation_engine',
+        '--hidden-import=core.search_index',
+        '--hidden-import=core.session_log',
         '--hidden-import=core.settings_manager',
+        '--hidden-import=core.similarity_index',
+        '--hidden-import=core.startup_profiler',
+        '--hidden-import=core.stats_exporter',
+        '--hidden-import=core.task_runner',
+        '--hidden-import=core.update_service',
+        '--hidden-import=core.url_filter',
         '--hidden-import=gui',
         '--hidden-import=gui.main_window',
         '--hidden-import=gui.tabs',
         '--hidden-import=gui.tabs.games_tab',
+        '--hidden-import=gui.web',
+        '--hidden-import=gui.web.lifecycle',
+        '--hidden-import=gui.web.pack_scheme',
+        '--hidden-import=gui.web.preloader',
+        '--hidden-import=gui.web.profile',
+        '--hidden-import=gui.web.request_interceptor',
         '--hidden-import=gui.widgets',
         '--hidden-import=gui.widgets.fullscreen_game_window',
         '--hidden-import=models',
@@ -51,7 +75,11 @@ def build_exe():
         '--hidden-import=models.daily_challenge',
         '--hidden-import=models.game_item',
         '--hidden-import=utils',
+        '--hidden-import=utils.cache_check_worker',
+        '--hidden-import=utils.connectivity_watcher',
         '--hidden-import=utils.daily_challenge_generator',
+        '--hidden-import=utils.screenshot_capture',
+        '--hidden-import=utils.stats_export_worker',
         '--hidden-import=utils.update_checker',
         
         # Common PyQt/PySide hidden imports (uncomment based on your GUI framework)
@@ -84,7 +112,6 @@ def build_exe():
         
         # Exclude unnecessary modules to reduce size
         '--exclude-module=matplotlib',
-        '--exclude-module=numpy',
         '--exclude-module=pandas',
         '--exclude-module=scipy',
         '--exclude-module=PIL',
@@ -0,0 +1,63 @@
+"""Shared fixtures: game files on disk, and a small game site served over local HTTP"""
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def game_files():
+    """{name: contents} of a small downloaded game"""
+    return {
+        'index.html': b'<html>' + b'<p>hello</p>' * 200 + b'</html>',
+        'css/ab/style.css': b'body { color: red }\n' * 100,
+        'images/cd/sprite.png': bytes(range(256)) * 8,
+        'js/tiny.js': b'1',
+    }
+
+
+@pytest.fixture
+def game_dir(tmp_path, game_files):
+    """A downloaded game's folder holding game_files, plus an unfinished download"""
+    directory = tmp_path / "game"
+    for name, data in game_files.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    (directory / "index.html.part").write_bytes(b'unfinished')
+    return directory
+
+
+SITE_FILES = {
+    'index.html': b'<html><head><link rel="stylesheet" href="s.css"><script src="g.js"></script></head>'
+                  b'<body><img src="p.png"><img src="p.png?v=2"></body></html>',
+    's.css': b'body{background:url(bg.png)} @font-face{src:url("f.woff")}',
+    'g.js': b'console.log("game");' * 50,
+    'p.png': b'\x89PNG one',
+    'bg.png': b'\x89PNG background',
+    'f.woff': b'wOFF font',
+}
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def game_site(tmp_path):
+    """URL of index.html on a local server that serves SITE_FILES"""
+    site = tmp_path / "site"
+    site.mkdir()
+    for name, data in SITE_FILES.items():
+        (site / name).write_bytes(data)
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_QuietHandler, directory=str(site)))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/index.html"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,43 @@
+"""Tests for hashed asset names and the asset index"""
+from core.asset_naming import AssetIndex, asset_name, normalize_url
+
+
+def test_normalize_url():
+    assert normalize_url('HTTPS://Example.COM:443/a/b.js?x=1#frag') == 'https://example.com/a/b.js?x=1'
+    assert normalize_url('http://example.com') == 'http://example.com/'
+    assert normalize_url('http://example.com:8080/') == 'http://example.com:8080/'
+
+
+def test_names_differ_only_for_different_files():
+    a = asset_name('https://cdn.example/v1/game.js', 'js')
+    assert a == asset_name('https://CDN.example:443/v1/game.js#start', 'js')
+    assert a != asset_name('https://cdn.example/v2/game.js', 'js')
+    assert a != asset_name('https://cdn.example/v1/game.js?v=2', 'js')
+
+
+def test_names_are_sharded_and_keep_the_extension():
+    name = asset_name('https://cdn.example/img/Sprite.PNG', 'images')
+    folder, shard, file_name = name.split('/')
+    assert folder == 'images'
+    assert len(shard) == 2 and file_name.endswith('.png')
+    # A missing or odd extension falls back to the folder's default
+    assert asset_name('https://cdn.example/styles?v=2', 'css').endswith('.css')
+    assert '.' not in asset_name('https://cdn.example/blob', 'images')
+
+
+def test_index_round_trip(tmp_path):
+    path = tmp_path / "cache_index.json"
+    index = AssetIndex(path)
+    index.add('game1', 'https://cdn.example/a.js', 'js/aa/1.js')
+    index.add('game1', 'https://cdn.example/b.css', 'css/bb/2.css')
+    index.add('game2', 'https://cdn.example/a.js', 'js/aa/1.js')
+    index.save()
+    
+    index = AssetIndex(path)
+    assert index.get('game1', 'HTTPS://cdn.example/a.js#x') == 'js/aa/1.js'
+    assert index.sources('game1') == {'js/aa/1.js': 'https://cdn.example/a.js',
+                                      'css/bb/2.css': 'https://cdn.example/b.css'}
+    index.discard('game1', 'https://cdn.example/a.js')
+    index.forget('game2')
+    assert index.get('game1', 'https://cdn.example/a.js') is None
+    assert index.sources('game2') == {}
@@ -0,0 +1,84 @@
+"""Tests for manifest verification and repair of downloaded games"""
+import pytest
+
+from core.cache_manifest import MANIFEST_NAME, load_manifest, verify_games
+from core.download_manager import DownloadManager
+from core.game_pack import GamePack
+
+
+@pytest.fixture(params=[False, True], ids=['directory', 'pack'])
+def downloaded(request, tmp_path, game_site):
+    """A DownloadManager with game_site downloaded, as a folder or as a pack"""
+    manager = DownloadManager(tmp_path / "cache", pack_games=request.param, blob_cache_mb=0)
+    result = manager.download_website(game_site, "Test Game")
+    assert result['success'], result.get('error')
+    yield manager
+    manager.close_pack()
+
+
+def corrupt(manager, url, name):
+    """Overwrite the start of one stored file in place"""
+    path = manager.get_game_path(url)
+    if path.is_dir():
+        (path / name).write_bytes(b'garbage')
+        return
+    with GamePack(path) as pack:
+        offset, length = pack.entries[name][:2]
+    manager.close_pack(path)
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(b'\0' * min(length, 4))
+
+
+def asset_named(manager, url, suffix):
+    manifest = load_manifest(manager.get_game_path(url))
+    return next(name for name in manifest['files'] if name.endswith(suffix))
+
+
+def test_manifest_lists_every_file(downloaded, game_site):
+    manifest = load_manifest(downloaded.get_game_path(game_site))
+    assert manifest['url'] == game_site
+    folders = sorted(name.split('/')[0] for name in manifest['files'])
+    # Both query-string variants of p.png are kept, and CSS references are followed
+    assert folders == ['css', 'fonts', 'images', 'images', 'images', 'index.html', 'js']
+    assert MANIFEST_NAME not in manifest['files']
+
+
+def test_intact_game_verifies(downloaded, game_site):
+    [report] = downloaded.verify_cache([game_site])
+    assert report['status'] == 'ok'
+    assert report['url'] == game_site
+    assert (report['missing'], report['corrupt']) == ([], [])
+
+
+def test_corrupt_file_is_found_and_repaired(downloaded, game_site):
+    name = asset_named(downloaded, game_site, '.js')
+    corrupt(downloaded, game_site, name)
+    
+    [report] = downloaded.verify_cache([game_site])
+    assert report['status'] == 'damaged'
+    assert report['corrupt'] == [name]
+    
+    report = downloaded.repair_game(game_site)
+    assert report['repaired'] == [name]
+    assert report['status'] == 'ok'
+    assert downloaded.verify_cache([game_site])[0]['status'] == 'ok'
+
+
+def test_missing_file_in_folder_is_repaired(tmp_path, game_site):
+    manager = DownloadManager(tmp_path / "cache", pack_games=False, blob_cache_mb=0)
+    assert manager.download_website(game_site, "Test Game")['success']
+    name = asset_named(manager, game_site, '.woff')
+    (manager.get_game_path(game_site) / name).unlink()
+    
+    assert manager.verify_cache([game_site])[0]['missing'] == [name]
+    assert manager.repair_game(game_site)['status'] == 'ok'
+
+
+def test_game_without_manifest_is_unverified(tmp_path):
+    game_dir = tmp_path / "old"
+    game_dir.mkdir()
+    (game_dir / "index.html").write_text("<html></html>")
+    [report] = verify_games([game_dir])
+    assert report['status'] == 'unverified'
+    assert report['missing'] == []
@@ -0,0 +1,85 @@
+"""Tests for the headless command-line interface"""
+import json
+
+import pytest
+
+from launcher.cli import EXIT_FAILED, EXIT_OK, EXIT_USAGE, Library, main
+
+
+def run(capsys, data_dir, *args):
+    """Run the CLI; returns (exit code, stdout)"""
+    code = main(['--data-dir', str(data_dir), *args])
+    return code, capsys.readouterr().out
+
+
+def run_json(capsys, data_dir, *args):
+    code, out = run(capsys, data_dir, '--json', *args)
+    return code, json.loads(out)
+
+
+def test_cache_info_on_an_empty_library(capsys, tmp_path):
+    code, info = run_json(capsys, tmp_path, 'cache-info')
+    assert code == EXIT_OK
+    assert (info['count'], info['games']) == (0, [])
+
+
+def test_unknown_game_is_a_usage_error(capsys, tmp_path):
+    code, payload = run_json(capsys, tmp_path, 'download', 'No Such Game')
+    assert code == EXIT_USAGE
+    assert payload == {'error': 'Unknown game: No Such Game'}
+    
+    code, out = run(capsys, tmp_path, 'download')
+    assert code == EXIT_USAGE
+    assert out == ''
+
+
+def test_unknown_export_format_is_a_usage_error(capsys, tmp_path):
+    code, payload = run_json(capsys, tmp_path, 'export-stats', str(tmp_path / "stats.xyz"))
+    assert code == EXIT_USAGE
+    assert 'xyz' in payload['error']
+
+
+@pytest.mark.parametrize('args', [['download', '-j', '0', 'x'], ['prefetch', '--jobs', '-1'],
+                                  ['prefetch', '-n', '-1'], ['verify', '--workers', 'many'], ['nonsense'], []])
+def test_bad_arguments_are_usage_errors(capsys, tmp_path, args):
+    assert main(['--data-dir', str(tmp_path), *args]) == EXIT_USAGE
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'error:' in captured.err
+    
+    code, payload = run_json(capsys, tmp_path, *args)
+    assert code == EXIT_USAGE
+    assert set(payload) == {'error'}
+
+
+def test_export_stats_writes_a_file(capsys, tmp_path):
+    path = tmp_path / "games.csv"
+    code, payload = run_json(capsys, tmp_path, 'export-stats', str(path), '--what', 'games')
+    assert code == EXIT_OK
+    assert payload['format'] == 'csv'
+    assert payload['rows'] == len(path.read_text(encoding='utf-8').splitlines()) - 1
+
+
+def test_verify_reports_and_repairs_damage(capsys, tmp_path, game_site):
+    library = Library(tmp_path)
+    assert library.downloads.download_website(game_site, "Test Game")['success']
+    library.downloads.close_pack()
+    
+    code, payload = run_json(capsys, tmp_path, 'verify')
+    assert code == EXIT_OK
+    assert payload['failed'] == 0
+    
+    # Damage a stored file: flip bytes in the middle of the pack
+    path = library.downloads.get_game_path(game_site)
+    data = bytearray(path.read_bytes())
+    data[100:104] = b'\0\0\0\0'
+    path.write_bytes(bytes(data))
+    
+    code, payload = run_json(capsys, tmp_path, 'verify')
+    assert code == EXIT_FAILED
+    assert payload['games'][0]['status'] == 'damaged'
+    
+    code, payload = run_json(capsys, tmp_path, 'verify', '--repair')
+    assert code == EXIT_OK
+    assert payload['games'][0]['status'] == 'ok'
+    assert payload['games'][0]['repaired']
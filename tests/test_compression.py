@@ -0,0 +1,40 @@
+"""Tests for compression codecs and the decompressed-file cache"""
+import pytest
+
+from core.compression import BlobCache, CODECS, get_codec
+from core.game_pack import GamePack, build_pack
+
+
+def test_compressed_reads_are_cached(game_dir, game_files, tmp_path):
+    pack_path = tmp_path / "game.pack"
+    build_pack(game_dir, pack_path)
+    cache = BlobCache()
+    with GamePack(pack_path, cache) as pack:
+        assert pack.read('index.html') == game_files['index.html']
+        assert pack.read('index.html') == game_files['index.html']
+        assert (cache.misses, cache.hits) == (1, 1)
+    # Closing the pack drops its files from the cache
+    assert cache.size == 0
+
+
+def test_blob_cache_evicts_least_recently_used():
+    cache = BlobCache(max_bytes=400)
+    cache.put('a', b'a' * 100)
+    cache.put('b', b'b' * 100)
+    cache.put('c', b'c' * 100)
+    cache.get('a')
+    cache.put('d', b'd' * 100)
+    cache.put('e', b'e' * 100)
+    assert cache.get('b') is None
+    assert cache.get('a') == b'a' * 100
+    assert cache.size <= 400
+    # Anything over a quarter of the budget is never cached
+    cache.put('huge', b'x' * 101)
+    assert cache.get('huge') is None
+
+
+@pytest.mark.parametrize('name', list(CODECS))
+def test_codecs_round_trip(name):
+    codec = get_codec(name)
+    data = b'papa louie ' * 1000
+    assert codec.decompress(codec.compress(data)) == data
@@ -0,0 +1,65 @@
+"""Tests for connectivity tracking"""
+import socket
+
+import pytest
+
+from core.connectivity import ConnectivityMonitor
+from core.download_manager import DownloadManager
+
+
+@pytest.fixture
+def listening_port():
+    with socket.socket() as server:
+        server.bind(('127.0.0.1', 0))
+        server.listen()
+        yield server.getsockname()[1]
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_listeners_hear_only_changes():
+    monitor = ConnectivityMonitor(probe_hosts=[])
+    changes = []
+    monitor.subscribe(changes.append)
+    monitor.report_success()
+    monitor.report_failure()
+    monitor.set_online(False)
+    monitor.report_success()
+    assert changes == [False, True]
+    
+    monitor.unsubscribe(changes.append)
+    monitor.report_failure()
+    assert changes == [False, True]
+
+
+def test_probe_finds_a_reachable_host(listening_port, closed_port):
+    monitor = ConnectivityMonitor(probe_hosts=[('127.0.0.1', closed_port), ('127.0.0.1', listening_port)])
+    monitor.set_online(False)
+    assert monitor.probe()
+    assert monitor.is_online()
+    assert not monitor.probe_due()  # the next check waits for online_interval
+
+
+def test_failed_probes_back_off(closed_port):
+    monitor = ConnectivityMonitor(probe_hosts=[('127.0.0.1', closed_port)], min_backoff=5, max_backoff=12)
+    backoffs = []
+    for _ in range(4):
+        assert not monitor.probe()
+        backoffs.append(monitor._backoff)
+    assert backoffs == [10, 12, 12, 12]
+    assert not monitor.probe_due()
+    assert not monitor.probe_if_due()  # not due, so no probe, just the known state
+
+
+def test_offline_downloads_are_skipped(tmp_path):
+    monitor = ConnectivityMonitor(probe_hosts=[])
+    monitor.set_online(False)
+    manager = DownloadManager(tmp_path / "cache", monitor)
+    result = manager.download_website('http://127.0.0.1:9/', "Game")
+    assert result == {'success': False, 'error': 'You are offline'}
+    assert manager.download_many(['http://a/', 'http://b/'])['http://b/']['error'] == 'You are offline'
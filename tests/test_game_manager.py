@@ -0,0 +1,17 @@
+"""Tests for the game catalog"""
+from core.game_manager import GameManager
+from models.game_item import GameItem
+
+
+def test_catalog_position_follows_the_catalog(tmp_path):
+    manager = GameManager(None, tmp_path / "game_data.json")
+    first, last = manager.games[0], manager.games[-1]
+    assert manager.catalog_position(first) == 0
+    assert manager.catalog_position(last) == len(manager.games) - 1
+    
+    stranger = GameItem("Not In The Catalog", "https://example.com/", "", "Misc", "", "Easy")
+    assert manager.catalog_position(stranger) == len(manager.games)
+    
+    manager.games = [last, first]
+    assert manager.catalog_position(last) == 0
+    assert manager.catalog_position(first) == 1
@@ -0,0 +1,68 @@
+"""Tests for game packs"""
+import pytest
+
+from core.download_manager import DownloadManager
+from core.game_pack import GamePack, PackInUseError, build_pack, extract_pack, read_meta
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_pack_round_trip(game_dir, game_files, tmp_path, compress):
+    pack_path = tmp_path / "game.pack"
+    assert build_pack(game_dir, pack_path, {'url': 'http://x/'}, compress=compress) == len(game_files)
+    assert read_meta(pack_path)['url'] == 'http://x/'
+    
+    with GamePack(pack_path) as pack:
+        assert sorted(pack.names()) == sorted(game_files)
+        for name, data in game_files.items():
+            content = pack.read(name)
+            assert bytes(content) == data
+            assert pack.size(name) == len(data)
+            if isinstance(content, memoryview):
+                content.release()
+        stored, original = pack.sizes()
+        assert original == sum(len(data) for data in game_files.values())
+        # Text compresses, media and tiny files are stored as they are
+        assert pack.is_compressed('index.html') == compress
+        assert not pack.is_compressed('images/cd/sprite.png')
+        assert not pack.is_compressed('js/tiny.js')
+        assert (stored < original) == compress
+    
+    out = tmp_path / "out"
+    assert sorted(extract_pack(pack_path, out, skip={'js/tiny.js'})) == sorted(set(game_files) - {'js/tiny.js'})
+    assert (out / 'css/ab/style.css').read_bytes() == game_files['css/ab/style.css']
+    assert not (out / 'js/tiny.js').exists()
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / "bad.pack"
+    path.write_bytes(b'not a pack at all, just some bytes')
+    with pytest.raises(ValueError):
+        GamePack(path)
+
+
+def test_pack_stays_open_while_views_are_alive(game_dir, tmp_path):
+    pack_path = tmp_path / "game.pack"
+    build_pack(game_dir, pack_path, compress=False)
+    pack = GamePack(pack_path)
+    view = pack.read('index.html')
+    with pytest.raises(PackInUseError):
+        pack.close()
+    assert bytes(pack.read('js/tiny.js'))  # still usable
+    view.release()
+    pack.close()
+
+
+def test_in_use_pack_is_not_replaced(game_dir, tmp_path):
+    manager = DownloadManager(tmp_path / "cache", blob_cache_mb=0)
+    pack_path = manager.get_pack_path('http://x/')
+    build_pack(game_dir, pack_path, {'url': 'http://x/'}, compress=False)
+    before = pack_path.read_bytes()
+    
+    view = manager.open_pack(pack_path).read('index.html')
+    with pytest.raises(PackInUseError):
+        manager.import_game(pack_path)
+    assert pack_path in manager.open_packs
+    assert pack_path.read_bytes() == before
+    view.release()
+    manager.close_pack()
+    assert not manager.open_packs
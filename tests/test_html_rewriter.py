@@ -0,0 +1,86 @@
+"""Tests for the streaming HTML scanner and rewriter"""
+import pytest
+
+from core.html_rewriter import HtmlRewriter, rewrite_file, scan_file
+
+
+BASE = 'http://games.example/play/'
+
+PAGE = (
+    '<!DOCTYPE html><html><head>\n'
+    '<link rel="stylesheet" href="style.css?v=1#top"><LINK REL=icon href=favicon.ico>\n'
+    '<style>body { background: url(\'bg.png\') } @import "more.css";</style>\n'
+    '<script src="game.js"></script>\n'
+    '<script>var html = "<img src=not-an-asset.png>";</script>\n'
+    '<!-- <img src="commented.png"> -->\n'
+    '</head><body>\n'
+    '<img alt="a" src="sprite.png"><img src="data:image/png;base64,AAAA">\n'
+    '<img src="sprite.png">\n'
+    '</body></html>\n'
+)
+
+LOCAL = {
+    BASE + 'style.css?v=1': 'css/style.css',
+    BASE + 'game.js': 'js/game.js',
+    BASE + 'sprite.png': 'images/sprite.png',
+    BASE + 'bg.png': 'images/bg.png',
+}
+
+
+def rewrite(text, local, chunk_size):
+    output = []
+    rewriter = HtmlRewriter(BASE, local, output.append)
+    for start in range(0, len(text), chunk_size):
+        rewriter.feed(text[start:start + chunk_size])
+    rewriter.close()
+    return ''.join(output), rewriter.refs
+
+
+def test_refs_are_the_page_assets_only():
+    _, refs = rewrite(PAGE, {}, len(PAGE))
+    assert refs == {
+        BASE + 'style.css?v=1': 'css',
+        BASE + 'bg.png': 'images',
+        BASE + 'more.css': 'css',
+        BASE + 'game.js': 'js',
+        BASE + 'sprite.png': 'images',
+    }
+
+
+def test_rewrite_points_at_local_copies():
+    output, _ = rewrite(PAGE, LOCAL, len(PAGE))
+    assert 'href="css/style.css"' in output
+    assert 'src="js/game.js"' in output
+    assert output.count('src="images/sprite.png"') == 2
+    assert 'url("images/bg.png")' in output
+    # Script text, comments and unknown references are left alone
+    assert '<img src=not-an-asset.png>' in output
+    assert '<!-- <img src="commented.png"> -->' in output
+    assert '@import "more.css"' in output
+    assert 'href=favicon.ico' in output
+
+
+def test_untouched_page_passes_through_unchanged():
+    output, _ = rewrite(PAGE, {}, len(PAGE))
+    assert output == PAGE
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1000])
+def test_output_does_not_depend_on_chunk_size(chunk_size):
+    page = PAGE * 20
+    expected = rewrite(page, LOCAL, len(page))
+    assert rewrite(page, LOCAL, chunk_size) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 4096])
+def test_files_round_trip_in_their_own_encoding(tmp_path, chunk_size):
+    # A big page, so the file is read in many chunks after the 1 KB head
+    page = '<meta charset="windows-1252"><p>café</p>' + PAGE * 50
+    source = tmp_path / "page.html"
+    source.write_bytes(page.encode('cp1252'))
+    
+    assert scan_file(source, BASE, chunk_size=chunk_size) == rewrite(page, {}, len(page))[1]
+    
+    output = tmp_path / "out.html"
+    rewrite_file(source, output, BASE, LOCAL, chunk_size=chunk_size)
+    assert output.read_bytes().decode('cp1252') == rewrite(page, LOCAL, len(page))[0]
@@ -0,0 +1,68 @@
+"""Tests for the shared HTTP client"""
+import socket
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from urllib3.util.retry import Retry
+
+from core.http_client import HttpClient, JitteredRetry, TokenBucket
+from tests.conftest import SITE_FILES
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(retries=0, http2=False)
+    yield client
+    client.close()
+
+
+def test_requests_are_counted_per_host(client, game_site):
+    host = urlsplit(game_site).netloc
+    response = client.get(game_site)
+    assert response.content == SITE_FILES['index.html']
+    assert client.get(game_site.replace('index.html', 'missing.js')).status_code == 404
+    
+    metrics = client.metrics()[host]
+    assert (metrics['requests'], metrics['errors']) == (2, 1)
+    assert metrics['bytes'] >= len(SITE_FILES['index.html'])
+
+
+def test_streamed_reads_are_counted(client, game_site):
+    url = game_site.replace('index.html', 'g.js')
+    response = client.get(url, stream=True)
+    chunks = []
+    while True:
+        chunk = client.read(response, 100)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    response.close()
+    assert b''.join(chunks) == SITE_FILES['g.js']
+    assert client.metrics()[urlsplit(url).netloc]['bytes'] == len(SITE_FILES['g.js'])
+
+
+def test_connection_errors_are_counted(client):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        url = f"http://127.0.0.1:{s.getsockname()[1]}/"
+    with pytest.raises(requests.ConnectionError):
+        client.get(url, timeout=2)
+    assert client.metrics()[urlsplit(url).netloc]['errors'] == 1
+
+
+def test_token_bucket_allows_one_second_of_burst():
+    bucket = TokenBucket(1000)
+    assert bucket.reserve(1000) == 0
+    assert bucket.reserve(500) == pytest.approx(0.5, abs=0.05)
+    bucket.set_rate(0)
+    assert bucket.reserve(10 ** 9) == 0
+
+
+def test_retry_backoff_has_jitter():
+    retry = JitteredRetry(total=5, backoff_factor=1.0)
+    for _ in range(3):
+        retry = retry.increment(method='GET', url='/')
+    base = Retry.get_backoff_time(retry)
+    assert base > 0
+    assert base <= retry.get_backoff_time() <= base * (1 + JitteredRetry.JITTER)
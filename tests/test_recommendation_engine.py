@@ -0,0 +1,60 @@
+"""Tests for the recommendation engine"""
+from datetime import datetime
+
+import pytest
+
+from core.game_manager import GameManager
+from core.recommendation_engine import RecommendationEngine
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return GameManager(None, tmp_path / "game_data.json")
+
+
+def play(game, minutes, count=1):
+    game.play_count += count
+    game.total_time += minutes * 60
+    game.last_played = datetime.now()
+
+
+def test_new_library_recommends_unplayed_games_in_catalog_order(manager):
+    engine = RecommendationEngine(manager)
+    recommendations = engine.get_recommendations(limit=3)
+    assert [game for _, game in recommendations] == manager.games[:3]
+    assert {reason for reason, _ in recommendations} == {RecommendationEngine.REASONS['unplayed']}
+
+
+def test_scores_follow_play_history(manager):
+    played, favorite = manager.games[0], manager.games[1]
+    play(played, 600, count=20)
+    played.streak = 5
+    favorite.favorite = True
+    
+    scores = RecommendationEngine(manager).scores()
+    assert scores[played.name][1] == RecommendationEngine.REASONS['time_played']
+    # New games in a favorite's category beat other new games
+    same_category = next(g for g in manager.games[2:] if g.category == favorite.category)
+    other_category = next(g for g in manager.games[2:] if g.category != favorite.category)
+    assert scores[same_category.name] == scores[favorite.name]
+    assert scores[same_category.name][0] > scores[other_category.name][0]
+    assert scores[same_category.name][1] == RecommendationEngine.REASONS['unplayed']
+
+
+def test_scores_are_cached_until_a_game_changes(manager):
+    engine = RecommendationEngine(manager)
+    first = engine.get_recommendations(limit=5)
+    assert engine.get_recommendations(limit=5) is first
+    
+    game = manager.games[-1]
+    manager.set_favorite(game, True)  # notifies the engine
+    assert engine.get_recommendations(limit=5) is not first
+    
+    play(manager.games[0], 30)
+    manager.notify(GameManager.STATS_CHANGED, manager.games[0])
+    assert engine.scores()[manager.games[0].name][1] != RecommendationEngine.REASONS['unplayed']
+
+
+def test_weights_can_be_overridden(manager):
+    engine = RecommendationEngine(manager, weights={'unplayed': 0.0})
+    assert engine.scores() == {}  # nothing else to go on yet
@@ -0,0 +1,79 @@
+"""Tests for the game search index"""
+import random
+import string
+
+from core.search_index import SearchIndex
+
+
+class Game:
+    def __init__(self, name, category='Arcade', description='', tags=None):
+        self.name = name
+        self.category = category
+        self.description = description
+        self.tags = tags or []
+
+
+def names(games):
+    return [game.name for game in games]
+
+
+def test_short_prefix_finds_every_match():
+    rng = random.Random(26)
+    
+    def word():
+        return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+    
+    games = [Game(f"{word()} {word()} {word()} {i}") for i in range(10000)]
+    index = SearchIndex(games)
+    # Far more than 64 indexed terms start with "b"
+    expected = {game.name for game in games
+                if any(term.startswith('b') for term in SearchIndex.tokenize(game.name))}
+    assert set(index.scores('b')) == expected
+
+
+def test_ranking_prefers_exact_name_matches():
+    games = [
+        Game("Papa's Pizzeria", description="Make pizza"),
+        Game("Pizza Party", category="Pizza"),
+        Game("Burger Shop", description="Pizzas are not served here"),
+    ]
+    index = SearchIndex(games)
+    assert names(index.search('pizza')) == ["Pizza Party", "Papa's Pizzeria", "Burger Shop"]
+    assert names(index.search('pizzeria')) == ["Papa's Pizzeria"]
+    assert len(index.search('piz')) == 3
+    assert len(index.search('piz', limit=1)) == 1
+
+
+def test_best_field_match_wins():
+    # "burg" is an exact hit in the description, but the name prefix match is worth more
+    games = [
+        Game("Burger Shop", description="Run a burg stand"),
+        Game("Burgers Deluxe"),
+        Game("Cafe", tags=["burg"]),
+    ]
+    index = SearchIndex(games)
+    scores = index.scores('burg')
+    assert scores["Burger Shop"] == scores["Burgers Deluxe"] == 3.0 * SearchIndex.PREFIX_SCORE
+    assert scores["Cafe"] == 2.0 * SearchIndex.EXACT_SCORE
+    assert names(index.search('burg'))[-1] == "Cafe"
+
+
+def test_every_query_term_must_match():
+    index = SearchIndex([Game("Papa's Burgeria"), Game("Papa's Pizzeria"), Game("Burger Time")])
+    assert names(index.search('papa burg')) == ["Papa's Burgeria"]
+
+
+def test_typos_are_tolerated():
+    index = SearchIndex([Game("Papa's Freezeria"), Game("Papa's Taco Mia")])
+    assert names(index.search('freezria')) == ["Papa's Freezeria"]
+    assert names(index.search('tacco')) == ["Papa's Taco Mia"]
+
+
+def test_updates_and_removals():
+    game = Game("Papa's Wingeria")
+    index = SearchIndex([game])
+    game.name = "Papa's Hot Doggeria"
+    index.remove_game(Game("Papa's Wingeria"))
+    index.add_game(game)
+    assert index.search('wing') == []
+    assert names(index.search('dog')) == ["Papa's Hot Doggeria"]
@@ -0,0 +1,73 @@
+"""Tests for the content similarity index"""
+import pytest
+
+from core.similarity_index import SimilarityIndex
+
+pytest.importorskip('numpy')
+
+
+class Game:
+    def __init__(self, name, category, description, difficulty='Easy', tags=None):
+        self.name = name
+        self.category = category
+        self.description = description
+        self.difficulty = difficulty
+        self.tags = tags or []
+
+
+GAMES = [
+    Game("Pizzeria", "Restaurant", "Bake pizza with cheese and toppings for hungry customers"),
+    Game("Pastaria", "Restaurant", "Cook pasta with sauce and cheese for hungry customers"),
+    Game("Cupcakeria", "Dessert", "Frost cupcakes with sprinkles at the bakery"),
+    Game("Donuteria", "Dessert", "Fry donuts and add sprinkles at the bakery"),
+    Game("Racer", "Arcade", "Drive fast cars around the track", 'Hard'),
+]
+
+
+def names(pairs):
+    return [game.name for game, _ in pairs]
+
+
+@pytest.fixture
+def index():
+    index = SimilarityIndex()
+    index.update_games(GAMES)
+    return index
+
+
+def test_similar_games_share_content(index):
+    assert names(index.similar_to(GAMES[0], limit=1)) == ["Pastaria"]
+    assert names(index.similar_to(GAMES[2], limit=1)) == ["Donuteria"]
+    # The game itself is never suggested, and unrelated games score nothing
+    assert "Pizzeria" not in names(index.similar_to(GAMES[0], limit=10))
+    assert "Racer" not in names(index.similar_to(GAMES[0], limit=10))
+
+
+def test_profile_of_several_games(index):
+    similar = index.similar_to_many([GAMES[0], GAMES[2]], limit=2, weights=[1, 5])
+    assert names(similar)[0] == "Donuteria"
+
+
+def test_unchanged_games_are_not_reindexed(index):
+    assert not index.update_games(GAMES)
+    GAMES[4].tags.append('cheese')
+    try:
+        assert index.update_game(GAMES[4])
+    finally:
+        GAMES[4].tags.remove('cheese')
+
+
+def test_sync_removes_games_left_out(index):
+    assert index.sync(GAMES[:3])
+    assert len(index) == 3
+    assert "Donuteria" not in names(index.similar_to(GAMES[0], limit=5))
+
+
+def test_save_and_load(index, tmp_path):
+    index.index_file = tmp_path / "similarity.npz"
+    index.save()
+    loaded = SimilarityIndex(index.index_file)
+    assert loaded.load()
+    # Only vectors are saved; the games themselves come from the catalog again, unchanged
+    assert not loaded.update_games(GAMES)
+    assert names(loaded.similar_to(GAMES[0], limit=3)) == names(index.similar_to(GAMES[0], limit=3))
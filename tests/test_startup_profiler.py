@@ -0,0 +1,81 @@
+"""Tests for the startup profiler"""
+import json
+import sys
+
+import pytest
+
+from core.startup_profiler import DEFAULT_OUTPUT, ENV_VAR, StartupProfiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = StartupProfiler()
+    yield profiler
+    profiler.finish()  # never leave the import timer installed
+
+
+def trace(path):
+    return json.loads(path.read_text(encoding='utf-8'))['traceEvents']
+
+
+def test_disabled_by_default(profiler, monkeypatch):
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    assert profiler.configure(['main.py', '--other']) == ['main.py', '--other']
+    assert not profiler.enabled
+    with profiler.span("ignored"):
+        pass
+    assert profiler.begin("ignored") is None
+    assert profiler.events == []
+
+
+@pytest.mark.parametrize('argv, env, output', [
+    (['main.py', '--profile-startup'], None, DEFAULT_OUTPUT),
+    (['main.py', '--profile-startup=out/trace.json'], None, 'out/trace.json'),
+    (['main.py'], 'env.json', 'env.json'),
+    (['main.py'], '1', DEFAULT_OUTPUT),
+])
+def test_configure(profiler, monkeypatch, tmp_path, argv, env, output):
+    if env is None:
+        monkeypatch.delenv(ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(ENV_VAR, env)
+    assert profiler.configure(argv) == ['main.py']
+    assert profiler.enabled
+    assert str(profiler.output) == str(type(profiler.output)(output))
+    profiler.output = tmp_path / "trace.json"  # keep the working directory clean
+
+
+def test_trace_waits_for_open_spans(profiler, tmp_path):
+    output = tmp_path / "trace.json"
+    profiler.enable(output, imports=False)
+    with profiler.span("window", step=1):
+        pass
+    token = profiler.begin("icons")
+    profiler.mark("first frame")
+    profiler.request_finish()
+    assert not output.exists()  # the icon span is still open
+    profiler.end(token)
+    
+    events = trace(output)
+    phases = {event['name']: event['ph'] for event in events if event['ph'] != 'M'}
+    assert phases == {'window': 'X', 'icons': 'e', 'first frame': 'i'}
+    assert next(event for event in events if event['name'] == 'window')['args'] == {'step': 1}
+
+
+def test_imports_are_timed(profiler, tmp_path, monkeypatch):
+    (tmp_path / "profiled_module.py").write_text("import json\nVALUE = 1\n", encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    output = tmp_path / "trace.json"
+    other = StartupProfiler()
+    other.enable(tmp_path / "other.json")  # a second timer must not recurse into the first
+    profiler.enable(output)
+    try:
+        import profiled_module  # noqa: F401
+    finally:
+        profiler.finish()
+        other.finish()
+    monkeypatch.delitem(sys.modules, 'profiled_module')
+    
+    assert profiler._import_timer not in sys.meta_path
+    imports = [event for event in trace(output) if event.get('cat') == 'import']
+    assert [event['name'] for event in imports] == ['profiled_module']
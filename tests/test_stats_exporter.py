@@ -0,0 +1,83 @@
+"""Tests for the statistics exporter and the session log it reads"""
+import csv
+import json
+
+import pytest
+
+from core.session_log import SessionLog
+from core.stats_exporter import StatsExporter
+
+
+class Game:
+    def __init__(self, name, category='Restaurant'):
+        self.name = name
+        self.category = category
+        self.difficulty = 'Easy'
+        self.play_count = 3
+        self.total_time = 600
+        self.rating = 4
+        self.favorite = True
+        self.streak = 2
+
+
+def make_sessions(count):
+    return [{'game': f"Game {i}", 'category': 'Restaurant', 'mode': 'offline', 'started': '2024-01-01T10:00:00',
+             'ended': '2024-01-01T10:05:00', 'duration_seconds': 300} for i in range(count)]
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    monkeypatch.setattr(StatsExporter, 'CHUNK_SIZE', 10)
+    return StatsExporter(make_sessions(25), [Game("Pizzeria")])
+
+
+def test_session_log_round_trip(tmp_path):
+    log = SessionLog(tmp_path / "sessions.jsonl")
+    log.start(Game("Pizzeria"))
+    log.start(Game("Cupcakeria", 'Dessert'), mode='offline')  # ends the first session
+    log.end()
+    with open(log.log_file, 'a', encoding='utf-8') as f:
+        f.write('{"game": "cut sho')  # a crash mid-write
+    sessions = list(log)
+    assert [(s['game'], s['mode']) for s in sessions] == [("Pizzeria", 'preview'), ("Cupcakeria", 'offline')]
+    assert set(sessions[0]) == set(StatsExporter.SESSION_FIELDS)
+
+
+def test_csv_export_streams_in_chunks(exporter, tmp_path):
+    path = tmp_path / "stats.csv"
+    counts = []
+    assert exporter.export(path, 'csv', progress=counts.append) == 25
+    assert counts == [10, 20, 25]
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 25
+    assert rows[3]['game'] == "Game 3"
+
+
+def test_jsonl_game_totals(exporter, tmp_path):
+    path = tmp_path / "games.jsonl"
+    assert exporter.export(path, 'jsonl', what='games') == 1
+    row = json.loads(path.read_text(encoding='utf-8'))
+    assert list(row) == StatsExporter.GAME_FIELDS
+    assert (row['game'], row['total_minutes'], row['favorite']) == ("Pizzeria", 10, True)
+
+
+def test_cancelled_export_leaves_no_file(exporter, tmp_path):
+    path = tmp_path / "stats.csv"
+    assert exporter.export(path, 'csv', is_cancelled=lambda: True) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_npz_export(exporter, tmp_path):
+    np = pytest.importorskip('numpy')
+    path = tmp_path / "stats.npz"
+    assert exporter.export(path, 'npz') == 25
+    with np.load(path) as data:
+        # One array per field and chunk
+        assert sorted(name for name in data.files if name.startswith('game_')) == [f"game_{i:05d}" for i in range(3)]
+        assert data['duration_seconds_00002'].tolist() == [300] * 5
+
+
+def test_unavailable_format_is_refused(exporter, tmp_path):
+    with pytest.raises(ValueError):
+        exporter.export(tmp_path / "stats.xyz", 'xyz')
@@ -0,0 +1,78 @@
+"""Tests for background jobs"""
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from core.download_manager import DownloadManager
+from core.task_runner import InlineExecutor, TaskRunner
+
+
+def count_to(n, progress=None, is_cancelled=None):
+    """A job following the runner's contract"""
+    for i in range(1, n + 1):
+        if is_cancelled():
+            return None
+        progress(i)
+    return n
+
+
+def test_inline_executor_runs_jobs_immediately():
+    runner = TaskRunner(InlineExecutor())
+    reported, done = [], []
+    task = runner.submit(count_to, 3, on_progress=reported.append, on_done=done.append)
+    assert reported == [1, 2, 3]
+    assert done == [task]
+    assert task.result() == 3
+    assert not task.running()
+
+
+def test_errors_are_raised_by_result():
+    def fail(progress=None, is_cancelled=None):
+        raise KeyError('boom')
+    
+    task = TaskRunner(InlineExecutor()).submit(fail)
+    with pytest.raises(KeyError):
+        task.result()
+
+
+def test_running_job_stops_when_cancelled():
+    runner = TaskRunner(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    
+    def wait_then_count(progress=None, is_cancelled=None):
+        started.set()
+        release.wait(5)
+        return count_to(3, progress, is_cancelled)
+    
+    reported = []
+    task = runner.submit(wait_then_count, on_progress=reported.append)
+    queued = runner.submit(count_to, 3)
+    started.wait(5)
+    task.cancel()
+    queued.cancel()
+    release.set()
+    assert task.result(5) is None
+    assert reported == []
+    with pytest.raises(CancelledError):
+        queued.result(5)  # never started
+    runner.shutdown()
+
+
+def test_done_callback_added_late_still_runs():
+    task = TaskRunner(InlineExecutor()).submit(count_to, 1)
+    done = []
+    task.add_done_callback(done.append)
+    assert done == [task]
+
+
+def test_cache_check_job_reports_and_stops(tmp_path, monkeypatch):
+    manager = DownloadManager(tmp_path / "cache")
+    monkeypatch.setattr(manager, 'repair_game', lambda url: {'url': url, 'status': 'ok'})
+    runner = TaskRunner(InlineExecutor())
+    urls = []
+    task = runner.submit(manager.check_games, ['http://a/', 'http://b/'], on_progress=urls.append)
+    assert [report['url'] for report in task.result()] == urls == ['http://a/', 'http://b/']
+    
+    assert runner.submit(manager.check_games).result() == []  # nothing downloaded to verify
+    assert manager.check_games(['http://a/'], is_cancelled=lambda: True) == []
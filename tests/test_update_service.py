@@ -0,0 +1,179 @@
+"""Tests for update checks and resumable update downloads"""
+import hashlib
+import io
+import json
+
+import pytest
+import requests
+
+from core import update_service
+from core.update_service import FileDownload, UpdateService
+
+
+NEW_RELEASE = b'new release ' * 30000
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.raw = io.BytesIO(body)
+        self.headers = headers or {}
+        self.url = 'https://example.com/launcher.zip'
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise IOError(f"HTTP {self.status_code}")
+    
+    def close(self):
+        pass
+
+
+class FakeServer:
+    """Serves one file with an ETag and honours Range only when If-Range matches"""
+    
+    def __init__(self, body=NEW_RELEASE, etag='"v2"', truncate=None):
+        self.body = body
+        self.etag = etag
+        self.truncate = truncate
+        self.requests = []
+    
+    def get(self, url, stream=False, timeout=None, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        if 'Range' in headers and headers.get('If-Range') == self.etag:
+            start = int(headers['Range'][len('bytes='):-1])
+            if start >= len(self.body):
+                return FakeResponse(416)
+            content_range = f"bytes {start}-{len(self.body) - 1}/{len(self.body)}"
+            return FakeResponse(206, self.body[start:self.truncate],
+                                {'Content-Range': content_range, 'ETag': self.etag})
+        return FakeResponse(200, self.body[:self.truncate],
+                            {'content-length': str(len(self.body)), 'ETag': self.etag})
+    
+    def read(self, response, size):
+        return response.raw.read(size)
+
+
+def make_download(tmp_path, server, version='2.0', sha256=None):
+    download = FileDownload('https://example.com/launcher.zip', tmp_path / "launcher.zip", sha256, version=version)
+    download.http = server
+    return download
+
+
+def write_partial(download, data, validator):
+    download.part_path.write_bytes(data)
+    download.state_path.write_text(json.dumps({'url': download.url, 'validator': validator, 'total': len(data)}))
+
+
+def test_fresh_download(tmp_path):
+    download = make_download(tmp_path, FakeServer(), sha256=hashlib.sha256(NEW_RELEASE).hexdigest())
+    progress = []
+    assert download.run(lambda done, total: progress.append((done, total))) == str(tmp_path / "launcher.zip")
+    assert (tmp_path / "launcher.zip").read_bytes() == NEW_RELEASE
+    assert progress[-1] == (len(NEW_RELEASE), len(NEW_RELEASE))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['launcher.zip']
+
+
+def test_resume_continues_the_same_file(tmp_path):
+    server = FakeServer()
+    download = make_download(tmp_path, server)
+    write_partial(download, NEW_RELEASE[:5000], '"v2"')
+    download.run()
+    assert server.requests == [{'Range': 'bytes=5000-', 'If-Range': '"v2"'}]
+    assert (tmp_path / "launcher.zip").read_bytes() == NEW_RELEASE
+
+
+def test_partial_file_of_a_changed_release_is_not_spliced(tmp_path):
+    download = make_download(tmp_path, FakeServer())
+    write_partial(download, b'old release ' * 1000, '"v1"')
+    download.run()
+    assert (tmp_path / "launcher.zip").read_bytes() == NEW_RELEASE
+
+
+def test_part_files_of_other_versions_are_never_used(tmp_path):
+    (tmp_path / "launcher.zip.part").write_bytes(b'old release ' * 1000)
+    (tmp_path / "launcher.zip.1.0.part").write_bytes(b'old release ' * 1000)
+    server = FakeServer()
+    make_download(tmp_path, server).run()
+    assert server.requests == [{}]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['launcher.zip']
+
+
+def test_complete_part_file_is_downloaded_again(tmp_path):
+    server = FakeServer()
+    download = make_download(tmp_path, server)
+    write_partial(download, NEW_RELEASE, '"v2"')
+    download.run()
+    # The server answered 416, which says nothing about whether the bytes are right
+    assert len(server.requests) == 2 and server.requests[1] == {}
+    assert (tmp_path / "launcher.zip").read_bytes() == NEW_RELEASE
+
+
+def test_short_download_is_kept_for_resuming(tmp_path):
+    download = make_download(tmp_path, FakeServer(truncate=10000))
+    with pytest.raises(IOError):
+        download.run()
+    assert not (tmp_path / "launcher.zip").exists()
+    assert download.part_path.stat().st_size == 10000
+    
+    download.http = FakeServer()
+    download.run()
+    assert (tmp_path / "launcher.zip").read_bytes() == NEW_RELEASE
+
+
+def test_checksum_mismatch_discards_the_data(tmp_path):
+    download = make_download(tmp_path, FakeServer(), sha256='0' * 64)
+    with pytest.raises(ValueError):
+        download.run()
+    assert sorted(path.name for path in tmp_path.iterdir()) == []
+
+
+def test_cancel_keeps_the_partial_file(tmp_path):
+    download = make_download(tmp_path, FakeServer())
+    assert download.run(is_cancelled=lambda: True) is None
+    assert download.part_path.exists()
+
+
+class FakeApi:
+    """Answers release checks with a fixed status, or raises a fixed error"""
+    
+    def __init__(self, status_code=200, error=None):
+        self.status_code = status_code
+        self.error = error
+    
+    def get(self, url, headers=None, timeout=None):
+        if self.error is not None:
+            raise self.error
+        response = FakeResponse(self.status_code, headers={'ETag': '"r1"'})
+        response.json = lambda: {'tag_name': 'v2.0'}
+        return response
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.reports = []
+    
+    def is_online(self):
+        return True
+    
+    def report_success(self):
+        self.reports.append(True)
+    
+    def report_failure(self):
+        self.reports.append(False)
+
+
+@pytest.mark.parametrize('api, reported', [(FakeApi(403), True), (FakeApi(500), True),
+                                           (FakeApi(error=requests.Timeout()), False),
+                                           (FakeApi(error=requests.ConnectionError()), False)])
+def test_failed_check_falls_back_to_the_cached_release(tmp_path, monkeypatch, api, reported):
+    monitor = FakeMonitor()
+    service = UpdateService('1.0', 'https://github.com/o/r', tmp_path / "update.json", ttl_hours=0,
+                            connectivity=monitor)
+    api_url = 'https://api.github.com/repos/o/r/releases/latest'
+    monkeypatch.setattr(update_service, 'get_http_client', lambda: FakeApi(200))
+    assert service.fetch_latest_release(api_url) == {'tag_name': 'v2.0'}
+    
+    monkeypatch.setattr(update_service, 'get_http_client', lambda: api)
+    assert service.fetch_latest_release(api_url) == {'tag_name': 'v2.0'}
+    assert monitor.reports == [True, reported]
@@ -0,0 +1,48 @@
+"""Tests for the ad and tracker URL filter"""
+import pytest
+
+from core.url_filter import UrlFilter, _PatternMatcher
+
+
+@pytest.fixture
+def url_filter(tmp_path):
+    path = tmp_path / "filters.txt"
+    path.write_text("! comment\n"
+                    "# another comment\n"
+                    "||ads.example.com^\n"
+                    "tracker.example.org\n"
+                    "/promo/\n"
+                    "@@||googletagmanager.com^\n"
+                    "@@||cdn.example.net/ads/adsprites/\n", encoding='utf-8')
+    return UrlFilter.from_file(path)
+
+
+@pytest.mark.parametrize('url, blocked', [
+    ('https://ads.example.com/x.js', True),
+    ('https://img.ads.example.com/x.png', True),  # subdomains too
+    ('https://tracker.example.org/t', True),
+    ('https://cdn.example.net/promo/banner.png', True),
+    ('https://securepubads.g.doubleclick.net/tag.js', True),  # the defaults stay
+    ('https://cdn.example.net/ads/adsprites/coin.png', False),  # allowed by path, despite the default /ads/ad pattern
+    ('https://cdn.example.net/ads/adbanner.png', True),
+    ('https://www.googletagmanager.com/gtag/js', False),  # allowed by host
+    ('https://example.com/game.js', False),
+    ('file:///games/ads/ad.js', False),  # only web requests are filtered
+])
+def test_rules(url_filter, url, blocked):
+    assert url_filter.should_block(url) == blocked
+
+
+def test_game_overrides(url_filter):
+    url_filter.set_game_overrides({'Pizzeria': ['ads.example.com'], 'Cupcakeria': ['*']})
+    assert not url_filter.should_block('https://ads.example.com/x.js', 'Pizzeria')
+    assert url_filter.should_block('https://tracker.example.org/t', 'Pizzeria')
+    assert not url_filter.should_block('https://tracker.example.org/t', 'Cupcakeria')
+    assert url_filter.should_block('https://ads.example.com/x.js')
+
+
+def test_pattern_matcher_follows_failure_links():
+    matcher = _PatternMatcher(['abcd', 'bce', 'cx'])
+    assert matcher.search('zabce')
+    assert matcher.search('abcx')
+    assert not matcher.search('abcbd')
@@ -0,0 +1,44 @@
+"""Offline cache verification for the GUI"""
+from concurrent.futures import CancelledError
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.task_runner import get_task_runner
+
+
+class CacheCheckWorker(QObject):
+    """Verifies, and optionally repairs, downloaded games in the background and reports through signals"""
+    progress = pyqtSignal(str)  # url of the game being repaired
+    finished = pyqtSignal(list)  # one report per game
+    error = pyqtSignal(str)  # error message
+    
+    def __init__(self, download_manager, repair_urls=None, runner=None):
+        super().__init__()
+        self.download_manager = download_manager
+        self.repair_urls = repair_urls  # None to only verify
+        self.runner = runner or get_task_runner()
+        self.task = None
+    
+    def start(self):
+        """Start checking"""
+        self.task = self.runner.submit(self.download_manager.check_games, self.repair_urls,
+                                       on_progress=self.progress.emit, on_done=self._on_done)
+    
+    def cancel(self):
+        """Stop repairing after the current game"""
+        if self.task is not None:
+            self.task.cancel()
+    
+    def isRunning(self):
+        return self.task is not None and self.task.running()
+    
+    def _on_done(self, task):
+        # Runs on the worker; signals reach the GUI thread queued
+        try:
+            reports = task.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        if not task.is_cancelled():
+            self.finished.emit(reports)
@@ -0,0 +1,61 @@
+"""Connectivity watcher"""
+import threading
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QNetworkInformation
+
+
+class ConnectivityWatcher(QObject):
+    """Feeds OS network events and background probes into a ConnectivityMonitor"""
+    online_changed = pyqtSignal(bool)
+    
+    CHECK_INTERVAL_MS = 5000
+    
+    def __init__(self, monitor, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self._probing = False
+        # Listeners may be called from the probe thread; the signal is delivered on the GUI thread
+        self.monitor.subscribe(self.online_changed.emit)
+        
+        self.network_information = None
+        try:
+            if QNetworkInformation.loadDefaultBackend():
+                self.network_information = QNetworkInformation.instance()
+        except Exception as e:
+            print(f"Network information unavailable: {e}")
+        if self.network_information is not None:
+            self.network_information.reachabilityChanged.connect(self.on_reachability_changed)
+            self.on_reachability_changed(self.network_information.reachability())
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(self.CHECK_INTERVAL_MS)
+        
+        # Find out the real state right away, without holding up startup
+        self.start_probe()
+    
+    def on_reachability_changed(self, reachability):
+        """Apply the operating system's view of the network"""
+        if reachability == QNetworkInformation.Reachability.Disconnected:
+            self.monitor.set_online(False)
+        elif reachability in (QNetworkInformation.Reachability.Online, QNetworkInformation.Reachability.Site):
+            # A site-only network may still reach a local mirror, so let probes decide
+            self.start_probe()
+    
+    def check(self):
+        """Probe when the monitor's backoff schedule says so"""
+        if self.monitor.probe_due():
+            self.start_probe()
+    
+    def start_probe(self):
+        """Probe on a background thread so the GUI never waits on the network"""
+        if self._probing:
+            return
+        self._probing = True
+        threading.Thread(target=self._probe, daemon=True).start()
+    
+    def _probe(self):
+        try:
+            self.monitor.probe()
+        finally:
+            self._probing = False
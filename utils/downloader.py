@@ -1,39 +1,49 @@
-"""File downloader utility"""
-import os
-import requests
-from pathlib import Path
-from PyQt6.QtCore import QThread, pyqtSignal, QObject
+"""File downloader for the GUI"""
+from concurrent.futures import CancelledError
+from PyQt6.QtCore import QObject, pyqtSignal
 
+from core.task_runner import get_task_runner
+from core.update_service import FileDownload
 
-class FileDownloader(QThread):
-    """Thread for downloading files"""
+
+class FileDownloader(QObject):
+    """Runs a FileDownload in the background and reports progress through signals"""
     progress = pyqtSignal(int, int)  # current, total
     finished = pyqtSignal(str)  # filepath
     error = pyqtSignal(str)  # error message
+    cancelled = pyqtSignal()
+    
+    checksum_for_asset = staticmethod(FileDownload.checksum_for_asset)
     
-    def __init__(self, url, destination_path):
+    def __init__(self, url, destination_path, expected_sha256=None, checksum_url=None, runner=None, version=None):
         super().__init__()
-        self.url = url
-        self.destination_path = Path(destination_path)
-        self.destination_path.parent.mkdir(parents=True, exist_ok=True)
+        self.download = FileDownload(url, destination_path, expected_sha256, checksum_url, version)
+        self.runner = runner or get_task_runner()
+        self.task = None
+    
+    def start(self):
+        """Start downloading"""
+        self.task = self.runner.submit(self.download.run, on_progress=self.progress.emit, on_done=self._on_done)
     
-    def run(self):
+    def cancel(self):
+        """Stop downloading; the partial file is kept so the download can resume"""
+        if self.task is not None:
+            self.task.cancel()
+    
+    def isRunning(self):
+        return self.task is not None and self.task.running()
+    
+    def _on_done(self, task):
+        # Runs on the worker; signals reach the GUI thread queued
         try:
-            response = requests.get(self.url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(self.destination_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            self.progress.emit(downloaded, total_size)
-            
-            self.finished.emit(str(self.destination_path))
+            path = task.result()
+        except CancelledError:
+            self.cancelled.emit()
+            return
         except Exception as e:
             self.error.emit(str(e))
-
+            return
+        if path is None:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(path)
@@ -0,0 +1,149 @@
+"""Screenshot capture with encoding off the GUI thread"""
+import re
+from datetime import datetime
+from pathlib import Path
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QImageWriter
+
+
+class _EncodeSignals(QObject):
+    """Signals for an encode task (QRunnable cannot emit signals itself)"""
+    saved = pyqtSignal(str)  # filepath
+    error = pyqtSignal(str)  # error message
+
+
+class ScreenshotEncodeTask(QRunnable):
+    """Encodes and writes one captured image on a pool thread"""
+    
+    def __init__(self, image, path, image_format, quality):
+        super().__init__()
+        self.image = image
+        self.path = path
+        self.image_format = image_format
+        self.quality = quality
+        self.signals = _EncodeSignals()
+    
+    def run(self):
+        try:
+            if self.image.save(str(self.path), self.image_format, self.quality):
+                self.signals.saved.emit(str(self.path))
+            else:
+                self.signals.error.emit(f"Could not write {self.path}")
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+class ScreenshotCapture(QObject):
+    """Grabs game views into images and encodes them in the background"""
+    saved = pyqtSignal(str)  # filepath
+    error = pyqtSignal(str)  # error message
+    burst_finished = pyqtSignal(int)  # screenshots taken
+    
+    # format name -> (Qt image format, file extension)
+    FORMATS = {
+        'png': ('PNG', 'png'),
+        'jpeg': ('JPG', 'jpg'),
+        'webp': ('WEBP', 'webp'),
+    }
+    
+    # Frames captured while this many are still encoding are dropped rather than queued
+    MAX_PENDING = 8
+    
+    def __init__(self, directory, image_format='png', quality=90, parent=None):
+        super().__init__(parent)
+        self.directory = Path(directory)
+        self.image_format = image_format
+        self.quality = quality
+        self.pending = 0
+        
+        # A small dedicated pool so bursts never compete with other background work
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        
+        self.burst_timer = QTimer(self)
+        self.burst_timer.timeout.connect(self._burst_tick)
+        self.burst_view_getter = None
+        self.burst_name = None
+        self.burst_remaining = 0
+        self.burst_taken = 0
+    
+    @classmethod
+    def supported_formats(cls):
+        """Get the format names this Qt build can write"""
+        writable = {bytes(name).decode().upper() for name in QImageWriter.supportedImageFormats()}
+        return [name for name, (qt_format, _) in cls.FORMATS.items() if qt_format in writable or
+                (qt_format == 'JPG' and 'JPEG' in writable)]
+    
+    def _filename(self, name):
+        """Build a unique, filesystem-safe path for a screenshot"""
+        image_format = self.image_format if self.image_format in self.supported_formats() else 'png'
+        safe_name = re.sub(r'[<>:"/\\|?*]+', '_', name or "screenshot").strip() or "screenshot"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return self.directory / f"{safe_name}_{timestamp}.{self.FORMATS[image_format][1]}", image_format
+    
+    def capture(self, view, name):
+        """Grab view now and encode it in the background; returns False if the frame was dropped"""
+        if self.pending >= self.MAX_PENDING:
+            return False
+        
+        # Only the grab happens on the GUI thread; QImage (unlike QPixmap) can cross threads
+        image = view.grab().toImage()
+        if image.isNull():
+            self.error.emit("Nothing to capture")
+            return False
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path, image_format = self._filename(name)
+        qt_format = self.FORMATS[image_format][0]
+        # PNG is lossless, so leave its compression level at Qt's default
+        quality = -1 if image_format == 'png' else self.quality
+        
+        task = ScreenshotEncodeTask(image, path, qt_format, quality)
+        task.signals.saved.connect(self._on_saved)
+        task.signals.error.connect(self._on_error)
+        self.pending += 1
+        self.pool.start(task)
+        return True
+    
+    def _on_saved(self, path):
+        self.pending -= 1
+        self.saved.emit(path)
+    
+    def _on_error(self, message):
+        self.pending -= 1
+        self.error.emit(message)
+    
+    def start_burst(self, view_getter, name, count=5, interval_ms=1000):
+        """Capture count screenshots interval_ms apart (count 0 keeps going until stopped)"""
+        self.stop_burst()
+        # The view is looked up on every shot so a switch to or from fullscreen is followed
+        self.burst_view_getter = view_getter
+        self.burst_name = name
+        self.burst_remaining = count
+        self.burst_taken = 0
+        self._burst_tick()
+        if self.is_bursting():
+            self.burst_timer.start(interval_ms)
+    
+    def is_bursting(self):
+        """Check whether a burst is running"""
+        return self.burst_view_getter is not None
+    
+    def stop_burst(self):
+        """Stop a running burst"""
+        self.burst_timer.stop()
+        if self.burst_view_getter is not None:
+            self.burst_view_getter = None
+            self.burst_finished.emit(self.burst_taken)
+    
+    def _burst_tick(self):
+        view = self.burst_view_getter() if self.burst_view_getter else None
+        if view is None:
+            self.stop_burst()
+            return
+        if self.capture(view, self.burst_name):
+            self.burst_taken += 1
+        if self.burst_remaining > 0:
+            self.burst_remaining -= 1
+            if self.burst_remaining == 0:
+                self.stop_burst()
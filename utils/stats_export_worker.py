@@ -0,0 +1,46 @@
+"""Statistics export for the GUI"""
+from concurrent.futures import CancelledError
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.task_runner import get_task_runner
+
+
+class StatsExportWorker(QObject):
+    """Runs a StatsExporter export in the background and reports progress through signals"""
+    progress = pyqtSignal(int)  # rows written so far
+    finished = pyqtSignal(str, int)  # filepath, rows written
+    error = pyqtSignal(str)  # error message
+    
+    def __init__(self, exporter, path, fmt, what='sessions', runner=None):
+        super().__init__()
+        self.exporter = exporter
+        self.path = path
+        self.fmt = fmt
+        self.what = what
+        self.runner = runner or get_task_runner()
+        self.task = None
+    
+    def start(self):
+        """Start exporting"""
+        self.task = self.runner.submit(self.exporter.export, self.path, self.fmt, self.what,
+                                       on_progress=self.progress.emit, on_done=self._on_done)
+    
+    def cancel(self):
+        """Stop the export after the current chunk"""
+        if self.task is not None:
+            self.task.cancel()
+    
+    def isRunning(self):
+        return self.task is not None and self.task.running()
+    
+    def _on_done(self, task):
+        # Runs on the worker; signals reach the GUI thread queued
+        try:
+            rows = task.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        if not task.is_cancelled():
+            self.finished.emit(str(self.path), rows)